@@ -2,16 +2,20 @@
 
 from app.models import Organization
 from app import db
+from app.services.metrics import timed
 
+@timed('db_operation_seconds')
 def get_all_organizations():
     return Organization.query.all()
 
+@timed('db_operation_seconds')
 def get_organization_by_id(org_id):
     organization = Organization.query.get(org_id)
     if not organization:
         raise ValueError("Organization not found")
     return organization
 
+@timed('db_operation_seconds')
 def create_new_organization(data):
     org = Organization(
         OrgName=data['OrgName']
@@ -20,6 +24,7 @@ def create_new_organization(data):
     db.session.commit()
     return org
 
+@timed('db_operation_seconds')
 def update_organization(org_id, data):
     organization = Organization.query.get(org_id)
     if not organization:
@@ -31,6 +36,7 @@ def update_organization(org_id, data):
     db.session.commit()
     return organization
 
+@timed('db_operation_seconds')
 def delete_organization(org_id):
     organization = Organization.query.get(org_id)
     if not organization:
@@ -2,8 +2,17 @@
 
 from app import db
 from app.models.project import Project
-from datetime import datetime
+from app.models.resource import Resource
+from app.models.team import Team
+from datetime import date, datetime
+from sqlalchemy import delete, select, update
+from app.services.metrics import timed
+from app.services.bench_snapshot import invalidate_bench_snapshot
+from app.services.availability import refresh_availability
+from app.services.skills import normalize_requirements
+from app.services.changes import record_deletes
 
+@timed('db_operation_seconds')
 def get_all_projects(org_id):
     if org_id:
         projects = Project.query.filter_by(OrgID=org_id).all()
@@ -11,16 +20,18 @@ def get_all_projects(org_id):
         projects = Project.query.all()
     return projects
 
+@timed('db_operation_seconds')
 def get_project_by_id(project_id, org_id):
     project = Project.query.filter_by(ProjectID=project_id, OrgID=org_id).first()
     return project
 
+@timed('db_operation_seconds')
 def create_new_project(data):
     try:
         new_project = Project(
             ProjectName=data['ProjectName'],
             OrgID=data['OrgID'],
-            RequiredResources=data['RequiredResources'],
+            RequiredResources=normalize_requirements(data['RequiredResources']),
             NumberOfDays=data['NumberOfDays'],
             ProjectStartDate=datetime.strptime(data['ProjectStartDate'], '%Y-%m-%d') if data.get('ProjectStartDate') else None,
             Technology=data['Technology'],
@@ -33,6 +44,7 @@ def create_new_project(data):
         db.session.rollback()
         raise e
 
+@timed('db_operation_seconds')
 def update_project(project_id, org_id, data):
     project = get_project_by_id(project_id, org_id)
     if not project:
@@ -41,22 +53,142 @@ def update_project(project_id, org_id, data):
         for key, value in data.items():
             if key == 'ProjectStartDate' and value:
                 setattr(project, key, datetime.strptime(value, '%Y-%m-%d'))
+            elif key == 'RequiredResources':
+                setattr(project, key, normalize_requirements(value))
             else:
                 setattr(project, key, value)
+        if project.team:
+            # The team is busy until the (possibly moved) end of the project
+            db.session.flush()
+            refresh_availability(org_id, team_id=project.team.TeamID)
         db.session.commit()
+        if project.team:
+            invalidate_bench_snapshot(org_id)
         return project
     except Exception as e:
         db.session.rollback()
         raise e
 
+@timed('db_operation_seconds')
 def delete_project(project_id, org_id):
     project = get_project_by_id(project_id, org_id)
     if not project:
         raise ValueError("Project not found")
     try:
+        members = project.team.resources if project.team else []
+        member_ids = [resource.ResourceID for resource in members]
+        for resource in members:
+            resource.OnBench = True  # Deleting the team clears their TeamID
+        if project.team:
+            record_deletes('team', org_id, [project.team.TeamID])
+        record_deletes('project', org_id, [project_id])
         db.session.delete(project)
+        if member_ids:
+            # Members of the deleted team are free again
+            db.session.flush()
+            refresh_availability(org_id, resource_ids=member_ids)
         db.session.commit()
+        if member_ids:
+            invalidate_bench_snapshot(org_id)
         return {"message": "Project deleted successfully"}
     except Exception as e:
         db.session.rollback()
         raise e
+
+# Bulk operations: one UPDATE/DELETE ... RETURNING for all the selected projects.
+# Projects are selected by ProjectIDs and/or a filter (an empty filter selects the
+# whole organization); a request with neither is rejected.
+BULK_FILTERS = ('Technology', 'Domain', 'StartsFrom', 'StartsBefore', 'HasTeam')
+BULK_UPDATABLE = ('ProjectStartDate', 'NumberOfDays', 'Technology', 'Domain', 'RequiredResources')
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a date (YYYY-MM-DD)")
+
+def _bulk_conditions(org_id, data):
+    project_ids = data.get('ProjectIDs')
+    filters = data.get('filter')
+    if project_ids is None and filters is None:
+        raise ValueError("ProjectIDs or filter is required")
+    conditions = [Project.OrgID == org_id]
+    if project_ids is not None:
+        if not isinstance(project_ids, list) or not all(isinstance(i, int) for i in project_ids):
+            raise ValueError("ProjectIDs must be a list of integers")
+        conditions.append(Project.ProjectID.in_(project_ids))
+    filters = filters or {}
+    if not isinstance(filters, dict) or set(filters) - set(BULK_FILTERS):
+        raise ValueError(f"filter takes the fields {', '.join(BULK_FILTERS)}")
+    if 'Technology' in filters:
+        conditions.append(Project.Technology.contains([filters['Technology']]))
+    if 'Domain' in filters:
+        conditions.append(Project.Domain.contains([filters['Domain']]))
+    if 'StartsFrom' in filters:
+        conditions.append(Project.ProjectStartDate >= _parse_date(filters['StartsFrom'], 'StartsFrom'))
+    if 'StartsBefore' in filters:
+        conditions.append(Project.ProjectStartDate < _parse_date(filters['StartsBefore'], 'StartsBefore'))
+    if 'HasTeam' in filters:
+        staffed = Project.team.has()
+        conditions.append(staffed if filters['HasTeam'] else ~staffed)
+    return conditions
+
+def _team_members(project_ids):
+    return select(Resource.ResourceID).join(Team, Team.TeamID == Resource.TeamID).where(Team.ProjectID.in_(project_ids))
+
+@timed('db_operation_seconds')
+def bulk_update_projects(org_id, data):
+    conditions = _bulk_conditions(org_id, data)
+    values = dict(data.get('set') or {})
+    if not values:
+        raise ValueError("Nothing to update: set is required")
+    if set(values) - set(BULK_UPDATABLE):
+        raise ValueError(f"set takes the fields {', '.join(BULK_UPDATABLE)}")
+    if 'ProjectStartDate' in values:
+        values['ProjectStartDate'] = _parse_date(values['ProjectStartDate'], 'ProjectStartDate')
+    if 'RequiredResources' in values:
+        values['RequiredResources'] = normalize_requirements(values['RequiredResources'])
+    try:
+        projects = db.session.scalars(update(Project).where(*conditions).values(**values).returning(Project)).all()
+        member_ids = []
+        if projects and {'ProjectStartDate', 'NumberOfDays'} & set(values):
+            # The teams are busy until the (possibly moved) ends of their projects
+            member_ids = db.session.scalars(_team_members([project.ProjectID for project in projects])).all()
+            if member_ids:
+                refresh_availability(org_id, resource_ids=member_ids)
+        for project in projects:
+            db.session.expunge(project)  # Serialized as returned, not reloaded row by row after commit
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    if member_ids:
+        invalidate_bench_snapshot(org_id)
+    return projects
+
+@timed('db_operation_seconds')
+def bulk_delete_projects(org_id, data):
+    conditions = _bulk_conditions(org_id, data)
+    try:
+        # Lock the projects so no team is created for them meanwhile
+        project_ids = db.session.scalars(select(Project.ProjectID).where(*conditions).with_for_update()).all()
+        if not project_ids:
+            return []
+        # Members of the deleted teams are free again
+        member_ids = db.session.scalars(
+            update(Resource).where(Resource.ResourceID.in_(_team_members(project_ids)))
+            .values(TeamID=None, OnBench=True).returning(Resource.ResourceID)
+        ).all()
+        team_ids = db.session.scalars(delete(Team).where(Team.ProjectID.in_(project_ids)).returning(Team.TeamID)).all()
+        db.session.execute(delete(Project).where(Project.ProjectID.in_(project_ids)))
+        record_deletes('team', org_id, team_ids)
+        record_deletes('project', org_id, project_ids)
+        if member_ids:
+            refresh_availability(org_id, resource_ids=member_ids)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    if member_ids:
+        invalidate_bench_snapshot(org_id)
+    return project_ids
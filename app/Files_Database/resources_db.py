@@ -1,20 +1,45 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import delete, func, select, update
+
 from app.models.resource import Resource
+from app.models.team import Team
 from app import db
+from app.services.bench_snapshot import invalidate_bench_snapshot
+from app.services.availability import refresh_availability
+from app.services.skills import normalize_resource_skills
+from app.services.changes import record_deletes
+from app.services.metrics import timed
 
 # Get all resources for a specific organization
+@timed('db_operation_seconds')
 def get_all_resources(org_id):
     return Resource.query.filter_by(OrgID=org_id).all()
 
 # Get a specific resource by ID and organization
+@timed('db_operation_seconds')
 def get_resource_by_id(resource_id, org_id):
     return Resource.query.filter_by(ResourceID=resource_id, OrgID=org_id).first()
 
+# Get the resources of an organization free over a date range (GiST index on Availability)
+@timed('db_operation_seconds')
+def get_available_resources(org_id, window):
+    return Resource.query.filter(
+        Resource.OrgID == org_id,
+        Resource.Availability.contains(window)
+    ).order_by(Resource.ResourceID).all()
+
 # Create a new resource
+@timed('db_operation_seconds')
 def create_new_resource(data):
+    skills, skill_ids, skill_levels = normalize_resource_skills(data.get('Skills'))
     new_resource = Resource(
         Name=data.get('Name'),
         Rate=data.get('Rate'),
-        Skills=data.get('Skills'),
+        Skills=skills,
+        SkillIDs=skill_ids,
+        SkillLevels=skill_levels,
         PastJobTitles=data.get('PastJobTitles'),
         Domain=data.get('Domain'),
         AvailableDate=data.get('AvailableDate'),
@@ -22,10 +47,14 @@ def create_new_resource(data):
         OnBench=data.get('OnBench', True),  # Default to True if not specified
     )
     db.session.add(new_resource)
+    db.session.flush()  # Generate ResourceID
+    refresh_availability(new_resource.OrgID, resource_ids=[new_resource.ResourceID])
     db.session.commit()
+    invalidate_bench_snapshot(new_resource.OrgID)
     return new_resource
 
 # Update an existing resource
+@timed('db_operation_seconds')
 def update_resource(resource_id, org_id, data):
     resource = Resource.query.filter_by(ResourceID=resource_id, OrgID=org_id).first()
     if not resource:
@@ -33,21 +62,131 @@ def update_resource(resource_id, org_id, data):
 
     resource.Name = data.get('Name', resource.Name)
     resource.Rate = data.get('Rate', resource.Rate)
-    resource.Skills = data.get('Skills', resource.Skills)
+    if 'Skills' in data:
+        resource.Skills, resource.SkillIDs, resource.SkillLevels = normalize_resource_skills(data['Skills'])
     resource.PastJobTitles = data.get('PastJobTitles', resource.PastJobTitles)
     resource.Domain = data.get('Domain', resource.Domain)
     resource.AvailableDate = data.get('AvailableDate', resource.AvailableDate)
     resource.OnBench = data.get('OnBench', resource.OnBench)
 
+    db.session.flush()
+    refresh_availability(org_id, resource_ids=[resource_id])
     db.session.commit()
+    invalidate_bench_snapshot(org_id)
     return resource
 
 # Delete a resource
+@timed('db_operation_seconds')
 def delete_resource(resource_id, org_id):
     resource = Resource.query.filter_by(ResourceID=resource_id, OrgID=org_id).first()
     if not resource:
         raise ValueError("Resource not found")
 
     db.session.delete(resource)
+    record_deletes('resource', org_id, [resource_id])
     db.session.commit()
+    invalidate_bench_snapshot(org_id)
     return {"message": "Resource deleted successfully"}
+
+# Bulk operations: one UPDATE/DELETE ... RETURNING for all the selected resources.
+# Resources are selected by ResourceIDs and/or a filter (an empty filter selects the
+# whole organization); a request with neither is rejected.
+BULK_FILTERS = ('OnBench', 'TeamID', 'Domain')
+BULK_UPDATABLE = ('Rate', 'AvailableDate', 'OnBench', 'Domain')
+
+def _bulk_conditions(org_id, data):
+    resource_ids = data.get('ResourceIDs')
+    filters = data.get('filter')
+    if resource_ids is None and filters is None:
+        raise ValueError("ResourceIDs or filter is required")
+    conditions = [Resource.OrgID == org_id]
+    if resource_ids is not None:
+        if not isinstance(resource_ids, list) or not all(isinstance(i, int) for i in resource_ids):
+            raise ValueError("ResourceIDs must be a list of integers")
+        conditions.append(Resource.ResourceID.in_(resource_ids))
+    filters = filters or {}
+    if not isinstance(filters, dict) or set(filters) - set(BULK_FILTERS):
+        raise ValueError(f"filter takes the fields {', '.join(BULK_FILTERS)}")
+    if 'OnBench' in filters:
+        conditions.append(Resource.OnBench == bool(filters['OnBench']))
+    if 'TeamID' in filters:
+        conditions.append(Resource.TeamID == filters['TeamID'])  # null: resources without a team
+    if 'Domain' in filters:
+        conditions.append(Resource.Domain.contains([filters['Domain']]))
+    return conditions
+
+def _bulk_values(data):
+    values = dict(data.get('set') or {})
+    scale = data.get('scale') or {}
+    if set(values) - set(BULK_UPDATABLE):
+        raise ValueError(f"set takes the fields {', '.join(BULK_UPDATABLE)}")
+    if set(scale) - {'Rate'}:
+        raise ValueError("scale only takes Rate")
+    if 'Rate' in values and 'Rate' in scale:
+        raise ValueError("Rate can be set or scaled, not both")
+    if not values and not scale:
+        raise ValueError("Nothing to update: set or scale is required")
+    try:
+        if 'Rate' in values:
+            values['Rate'] = Decimal(str(values['Rate']))
+        if 'Rate' in scale:
+            values['Rate'] = func.round(Resource.Rate * Decimal(str(scale['Rate'])), 2)
+        if values.get('AvailableDate'):
+            values['AvailableDate'] = date.fromisoformat(values['AvailableDate'])
+        if 'OnBench' in values:
+            values['OnBench'] = bool(values['OnBench'])
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError("Rate must be a number and AvailableDate a date (YYYY-MM-DD)")
+    return values
+
+def _recount_teams(team_ids):
+    if team_ids:
+        members = select(func.count()).where(Resource.TeamID == Team.TeamID).scalar_subquery()
+        db.session.execute(update(Team).where(Team.TeamID.in_(team_ids)).values(TotalResources=members))
+
+# Update the selected resources in one statement; resources put back on the bench
+# leave their team, which is recounted
+@timed('db_operation_seconds')
+def bulk_update_resources(org_id, data):
+    conditions = _bulk_conditions(org_id, data)
+    values = _bulk_values(data)
+    try:
+        team_ids = set()
+        if values.get('OnBench'):
+            values['TeamID'] = None
+            team_ids = {team_id for team_id in db.session.scalars(
+                select(Resource.TeamID).where(*conditions).with_for_update()
+            ) if team_id is not None}
+        resources = db.session.scalars(
+            update(Resource).where(*conditions).values(**values).returning(Resource)
+        ).all()
+        _recount_teams(team_ids)
+        if resources and {'AvailableDate', 'OnBench'} & set(values):
+            refresh_availability(org_id, resource_ids=[resource.ResourceID for resource in resources])
+        for resource in resources:
+            db.session.expunge(resource)  # Serialized as returned, not reloaded row by row after commit
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    if resources:
+        invalidate_bench_snapshot(org_id)  # Rates and availability are part of the snapshot
+    return resources
+
+# Delete the selected resources in one statement and recount their teams
+@timed('db_operation_seconds')
+def bulk_delete_resources(org_id, data):
+    conditions = _bulk_conditions(org_id, data)
+    try:
+        deleted = db.session.execute(
+            delete(Resource).where(*conditions).returning(Resource.ResourceID, Resource.TeamID)
+        ).all()
+        record_deletes('resource', org_id, [resource_id for resource_id, _team_id in deleted])
+        _recount_teams({team_id for _resource_id, team_id in deleted if team_id is not None})
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    if deleted:
+        invalidate_bench_snapshot(org_id)
+    return [resource_id for resource_id, _team_id in deleted]
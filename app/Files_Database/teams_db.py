@@ -1,17 +1,47 @@
 # app/db/teams_db.py
 
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
 from app.models import Team
 from app import db
+from app.services.metrics import timed
+from app.services.bench_snapshot import invalidate_bench_snapshot
+from app.services.availability import refresh_availability
+from app.services.changes import record_deletes
 
+@timed('db_operation_seconds')
 def get_all_teams():
     return Team.query.all()
 
+@timed('db_operation_seconds')
 def get_team_by_id(team_id):
     team = Team.query.get(team_id)
     if not team:
         raise ValueError("Team not found")
     return team
 
+# Project and organization are joined to the team rows; members come in one more
+# SELECT ... WHERE "TeamID" IN (...), so two statements however large the teams
+def _full_team_query():
+    return select(Team).options(
+        joinedload(Team.project),
+        joinedload(Team.organization),
+        selectinload(Team.resources),
+    )
+
+@timed('db_operation_seconds')
+def get_team_full(team_id):
+    team = db.session.scalars(_full_team_query().where(Team.TeamID == team_id)).first()
+    if not team:
+        raise ValueError("Team not found")
+    return team
+
+@timed('db_operation_seconds')
+def get_org_teams_full(org_id):
+    return db.session.scalars(_full_team_query().where(Team.OrgID == org_id).order_by(Team.TeamID)).all()
+
+@timed('db_operation_seconds')
 def create_new_team(data):
     new_team = Team(
         ProjectID=data['ProjectID'],
@@ -22,6 +52,7 @@ def create_new_team(data):
     db.session.commit()
     return new_team
 
+@timed('db_operation_seconds')
 def update_team(team_id, data):
     team = Team.query.get(team_id)
     if not team:
@@ -30,14 +61,26 @@ def update_team(team_id, data):
     team.ProjectID = data.get('ProjectID', team.ProjectID)
     team.TotalResources = data.get('TotalResources', team.TotalResources)
     team.OrgID = data.get('OrgID', team.OrgID)
+    db.session.flush()
+    refresh_availability(team.OrgID, team_id=team.TeamID)
     db.session.commit()
+    invalidate_bench_snapshot(team.OrgID)
     return team
 
+@timed('db_operation_seconds')
 def delete_team(team_id):
     team = Team.query.get(team_id)
     if not team:
         raise ValueError("Team not found")
     
+    org_id = team.OrgID
+    member_ids = [resource.ResourceID for resource in team.resources]
+    for resource in team.resources:
+        resource.OnBench = True  # Deleting the team clears their TeamID
     db.session.delete(team)
+    record_deletes('team', org_id, [team_id])
+    db.session.flush()
+    refresh_availability(org_id, resource_ids=member_ids)
     db.session.commit()
+    invalidate_bench_snapshot(org_id)
     return {"message": "Team deleted successfully"}
@@ -0,0 +1,56 @@
+# app/db/weight_profiles_db.py
+
+from app.models import WeightProfile
+from app import db
+from app.services.metrics import timed
+
+WEIGHT_FIELDS = ('RateWeight', 'ExperienceWeight', 'SkillLevelWeight', 'AffinityWeight')
+
+@timed('db_operation_seconds')
+def get_all_weight_profiles():
+    return WeightProfile.query.all()
+
+@timed('db_operation_seconds')
+def get_weight_profile_by_org(org_id):
+    profile = WeightProfile.query.filter_by(OrgID=org_id).first()
+    if not profile:
+        raise ValueError("Weight profile not found")
+    return profile
+
+@timed('db_operation_seconds')
+def create_new_weight_profile(data):
+    new_profile = WeightProfile(
+        OrgID=data['OrgID'],
+        RateWeight=data.get('RateWeight', '0.5'),
+        ExperienceWeight=data.get('ExperienceWeight', '1.0'),
+        SkillLevelWeight=data.get('SkillLevelWeight', '1.0'),
+        AffinityWeight=data.get('AffinityWeight', '1.0'),
+        Version=1
+    )
+    db.session.add(new_profile)
+    db.session.commit()
+    return new_profile
+
+@timed('db_operation_seconds')
+def update_weight_profile(org_id, data):
+    profile = WeightProfile.query.filter_by(OrgID=org_id).first()
+    if not profile:
+        raise ValueError("Weight profile not found")
+
+    for field in WEIGHT_FIELDS:
+        if field in data:
+            setattr(profile, field, data[field])
+    # A new version invalidates the compiled scoring kernels of the old one
+    profile.Version = WeightProfile.Version + 1
+    db.session.commit()
+    return profile
+
+@timed('db_operation_seconds')
+def delete_weight_profile(org_id):
+    profile = WeightProfile.query.filter_by(OrgID=org_id).first()
+    if not profile:
+        raise ValueError("Weight profile not found")
+
+    db.session.delete(profile)
+    db.session.commit()
+    return {"message": "Weight profile deleted successfully"}
@@ -0,0 +1,187 @@
+# app/Test/bench_concurrency.py
+#
+# Compares the throughput of one gunicorn worker under concurrent load for I/O-bound
+# endpoints, with the default sync worker and with a threaded (gthread) worker:
+#   python app/Test/bench_concurrency.py --org <OrgID> --concurrency 32 --requests 2000
+#
+# A local database answers in well under a millisecond; --db-latency-ms puts a TCP
+# proxy between the workers and Postgres that delays every packet, like a database
+# in another availability zone:
+#   python app/Test/bench_concurrency.py --org <OrgID> --db-latency-ms 5 --modes sync,sync-threads
+#
+# Needs DATABASE_URL (and the Python environment of the app) like the server itself.
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import threading
+import subprocess
+import statistics
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.engine import make_url
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+MODES = {
+    # name: (extra environment, gunicorn worker options)
+    'sync': ({}, ['-k', 'sync']),
+    'sync-threads': ({}, ['-k', 'gthread', '--threads', '{threads}']),
+}
+
+
+class LatencyProxy:
+    """
+    TCP proxy to Postgres delaying every chunk by a fixed one-way latency.
+    """
+
+    def __init__(self, upstream, latency_ms):
+        self.upstream = upstream  # ('unix', path) or ('tcp', host, port)
+        self.latency = latency_ms / 1000.0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, client_reader, client_writer):
+        if self.upstream[0] == 'unix':
+            server_reader, server_writer = await asyncio.open_unix_connection(self.upstream[1])
+        else:
+            server_reader, server_writer = await asyncio.open_connection(*self.upstream[1:])
+        await asyncio.gather(
+            self._pump(client_reader, server_writer),
+            self._pump(server_reader, client_writer),
+            return_exceptions=True
+        )
+
+    async def _pump(self, reader, writer):
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                await asyncio.sleep(self.latency)
+                writer.write(chunk)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def proxied_database_url(database_url, latency_ms):
+    """
+    Starts a LatencyProxy to the database and returns the URL going through it.
+    """
+    url = make_url(database_url)
+    port = url.port or 5432
+    socket_dir = url.query.get('host')
+    if socket_dir or not url.host:
+        upstream = ('unix', os.path.join(socket_dir or '/var/run/postgresql', f'.s.PGSQL.{port}'))
+    else:
+        upstream = ('tcp', url.host, port)
+    proxy = LatencyProxy(upstream, latency_ms).start()
+    return url.difference_update_query(['host']).set(host='127.0.0.1', port=proxy.port).render_as_string(hide_password=False)
+
+
+def start_server(mode, port, threads, database_url):
+    extra_env, worker_options = MODES[mode]
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.update(extra_env)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    command = [sys.executable, '-m', 'gunicorn', '-w', '1', '-b', f'127.0.0.1:{port}', '--log-level', 'warning']
+    command += [option.format(threads=threads) for option in worker_options] + ['main:app']
+    return subprocess.Popen(command, cwd=ROOT, env=env, start_new_session=True)
+
+
+def fetch(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if fetch(url)[1]:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not answer {url} within {timeout}s")
+
+
+def run_load(url, concurrency, total):
+    """
+    Sends `total` GETs to url from `concurrency` client threads.
+
+    Returns:
+        dict: Throughput, latency percentiles (queueing included) and errors.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, [url] * total))
+    wall = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ok in results)
+    return {
+        'rps': total / wall,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': sum(not ok for _latency, ok in results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark concurrent requests per worker, sync vs threaded worker.")
+    parser.add_argument('--org', required=True, help="OrgID the endpoints are queried for")
+    parser.add_argument('--endpoint', action='append',
+                        help="Path to load, '{org}' is replaced (default: resources, projects and teams listings)")
+    parser.add_argument('--modes', default='sync,sync-threads', help=f"Comma-separated modes among {', '.join(MODES)}")
+    parser.add_argument('--concurrency', type=int, default=32, help="Client threads")
+    parser.add_argument('--threads', type=int, default=32, help="Worker threads of the threaded modes")
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per endpoint and mode")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="One-way latency added to database traffic")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    database_url = os.environ['DATABASE_URL']
+    if args.db_latency_ms:
+        database_url = proxied_database_url(database_url, args.db_latency_ms)
+    endpoints = args.endpoint or ['/resources/all?orgID={org}', '/projects/all?orgID={org}', '/teams/']
+
+    print(f"{'mode':<14}{'endpoint':<40}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for mode in args.modes.split(','):
+        server = start_server(mode, args.port, args.threads, database_url)
+        try:
+            base = f'http://127.0.0.1:{args.port}'
+            for endpoint in endpoints:
+                url = base + endpoint.format(org=args.org)
+                wait_until_up(url)
+                run_load(url, args.concurrency, min(args.requests, 50))  # Warm up connections and caches
+                stats = run_load(url, args.concurrency, args.requests)
+                print(f"{mode:<14}{endpoint:<40}{stats['rps']:>9.1f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+                      f"{stats['errors']:>8}")
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# app/Test/benchmark_solvers.py
+#
+# Compares assignment solver backends on the same synthetic workloads:
+#   python app/Test/benchmark_solvers.py --workload 10x200 --workload 60x2000 --seed 1
+#
+# Check that fixed-point scoring ranks and assigns exactly like the original Decimal scoring:
+#   python app/Test/benchmark_solvers.py --compare-decimal
+#
+# Regression run of both auctions on fixed-point costs: each must finish within a deadline
+# and land within its precision of the optimum (the parallel auction bids in 2 processes):
+#   python app/Test/benchmark_solvers.py --check-auctions --workload 10x100 --workload 30x500 --workload 60x2000
+#
+# Large solves against the parallel auction (use the full matrix so the solvers see every column):
+#   python app/Test/benchmark_solvers.py --workload 100x5000 --workload 100x20000 --full-matrix \
+#       --solvers lap,auction,parallel_auction --workers 8
+
+import os
+import signal
+import sys
+import time
+import argparse
+import logging
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add the project root directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.Test.generate_data import iter_resources, iter_projects
+from app.services.cost_matrix import select_candidate_columns
+from app.services.solvers import SOLVERS, solve_assignment
+from app.services.team_formation import expand_roles, is_level_sufficient, INFEASIBLE_COST
+from app.services.scoring import default_scoring_kernel, compile_scoring_kernel
+from app.services.skills import local_resolver, normalize_resource_skills, normalize_requirements
+from app.services.utils import get_resource_skills_with_levels, SCORE_UNIT
+from app.Test import utils as decimal_utils
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+def build_workload(num_roles, num_resources, seed, full_matrix, decimal=False, kernel=None):
+    """
+    Builds the cost matrix team formation would hand to a solver for a synthetic
+    bench, scored with the given kernel (default weights if unset). Unless
+    full_matrix is set, columns are pruned as in production.
+    With decimal set, the (unpruned) matrix is scored with the original Decimal
+    implementation kept in app/Test/utils.py instead.
+    """
+    resources = [SimpleNamespace(**record) for record in iter_resources(num_resources, seed)]
+    resolve = local_resolver()
+    if not decimal:
+        # Skills as the db layer writes them: canonical names plus skill IDs
+        for resource in resources:
+            resource.Skills, resource.SkillIDs, resource.SkillLevels = normalize_resource_skills(resource.Skills, resolve)
+    role_list = []
+    for record in iter_projects(num_roles, seed):
+        if not decimal:
+            record['RequiredResources'] = normalize_requirements(record['RequiredResources'], resolve)
+        role_list.extend(expand_roles([SimpleNamespace(**record)]))
+        if len(role_list) >= num_roles:
+            break
+    role_list = role_list[:num_roles]
+
+    if decimal:
+        for resource in resources:
+            resource.Rate = Decimal(str(resource.Rate))  # As loaded from the Numeric(10, 2) column
+        skills = [get_resource_skills_with_levels(resource) for resource in resources]
+        return [
+            [decimal_role_cost(project, req, resource, resource_skills)
+             for resource, resource_skills in zip(resources, skills)]
+            for project, req in role_list
+        ]
+    kernel = kernel or default_scoring_kernel()
+    if not full_matrix:
+        # The CompactCostMatrix team formation hands to the solver
+        _columns, cost_matrix, _k = select_candidate_columns(
+            role_list, resources, kernel.prepare, kernel.row_costs,
+            INFEASIBLE_COST, memory_budget=1 << 40, block_size=1024
+        )
+        return cost_matrix
+    prepared = kernel.prepare(resources)
+    return [kernel.row_costs(project, req, prepared) for project, req in role_list]
+
+def decimal_role_cost(project, req, resource, resource_skills):
+    """
+    Cost of a (role, resource) pair as it was computed with Decimal arithmetic (None if infeasible).
+    """
+    qualified = resource.OnBench and all(
+        is_level_sufficient(resource_skills.get(skill.lower(), 'beginner'), details['level'].lower())
+        for skill, details in req['Skills'].items()
+    )
+    return -decimal_utils.calculate_weight(resource, req, project) if qualified else None
+
+def compare_decimal(workloads, seed):
+    """
+    Compares fixed-point and Decimal scoring on the full matrix of each workload:
+    every role must rank the qualified resources in the same order, and the
+    optimal assignments must be the same.
+
+    Returns:
+        list: One result dict per workload.
+    """
+    # The Decimal scoring predates the domain/technology affinity term
+    kernel = compile_scoring_kernel(('decimal',), rate=50, experience=100, skill_level=100, affinity=0)
+    results = []
+    for num_roles, num_resources in workloads:
+        fixed = build_workload(num_roles, num_resources, seed, full_matrix=True, kernel=kernel)
+        reference = build_workload(num_roles, num_resources, seed, full_matrix=True, decimal=True)
+        ranking_mismatches = 0
+        for fixed_row, decimal_row in zip(fixed, reference):
+            feasible = [column for column, cost in enumerate(decimal_row) if cost is not None]
+            if [column for column, cost in enumerate(fixed_row) if cost < INFEASIBLE_COST] != feasible:
+                ranking_mismatches += 1
+            elif sorted(feasible, key=lambda column: (fixed_row[column], column)) != \
+                    sorted(feasible, key=lambda column: (decimal_row[column], column)):
+                ranking_mismatches += 1
+        decimal_sentinel = 1000000
+        decimal_matrix = [[decimal_sentinel if cost is None else cost for cost in row] for row in reference]
+        same_assignment = solve_assignment(fixed, 'lap') == solve_assignment(decimal_matrix, 'lap')
+        results.append({
+            'workload': f"{num_roles}x{num_resources}",
+            'rows': len(fixed),
+            'ranking_mismatches': ranking_mismatches,
+            'same_assignment': same_assignment,
+        })
+    return results
+
+class CheckTimeout(Exception):
+    pass
+
+def _on_alarm(signum, frame):
+    raise CheckTimeout()
+
+def check_auctions(workloads, seed, timeout_s, precision=1e-3):
+    """
+    Solves each workload (pruned as in production) with lap and both auctions. An auction passes if it
+    finishes within timeout_s and its total cost is within precision (a score,
+    as the auctions take it) of lap's. Runs in the main thread (SIGALRM).
+
+    Returns:
+        list: One result dict per (workload, auction).
+    """
+    auctions = {
+        'auction': {'precision': precision},
+        'parallel_auction': {'precision': precision, 'workers': 2, 'parallel_threshold': 0},
+    }
+    results = []
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    try:
+        for num_roles, num_resources in workloads:
+            cost_matrix = build_workload(num_roles, num_resources, seed, full_matrix=False)
+            optimum = sum(cost_matrix[row][column] for row, column in solve_assignment(cost_matrix, 'lap'))
+            for name, options in auctions.items():
+                started = time.perf_counter()
+                signal.setitimer(signal.ITIMER_REAL, timeout_s)
+                try:
+                    pairs = solve_assignment(cost_matrix, name, **options)
+                    gap = (sum(cost_matrix[row][column] for row, column in pairs) - optimum) / SCORE_UNIT
+                except CheckTimeout:
+                    gap = None
+                finally:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                results.append({
+                    'workload': f"{num_roles}x{num_resources}",
+                    'solver': name,
+                    'seconds': time.perf_counter() - started,
+                    'gap': gap,
+                    'passed': gap is not None and gap <= precision,
+                })
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+    return results
+
+def evaluate(cost_matrix, pairs):
+    """
+    Returns (total cost of the filled roles, number of filled roles); infeasible
+    pairs are left out so their sentinel cost does not drown the comparison.
+    """
+    costs = [cost_matrix[row][column] for row, column in pairs if cost_matrix[row][column] < INFEASIBLE_COST]
+    return sum(costs) / SCORE_UNIT, len(costs)
+
+def run(workloads, solvers, reference, seed, repeat, full_matrix, options=None):
+    """
+    Times every solver on every workload and reports the objective gap to the
+    reference solver (compare 'filled' first: a solver filling fewer roles can
+    show a smaller cost).
+
+    Returns:
+        list: One result dict per (workload, solver).
+    """
+    results = []
+    for num_roles, num_resources in workloads:
+        cost_matrix = build_workload(num_roles, num_resources, seed, full_matrix)
+        columns = len(cost_matrix[0]) if cost_matrix else 0
+        reference_objective = None
+        for name in [reference] + [solver for solver in solvers if solver != reference]:
+            best_time = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                pairs = solve_assignment(cost_matrix, name, **(options or {}).get(name, {}))
+                elapsed = time.perf_counter() - started
+                best_time = elapsed if best_time is None else min(best_time, elapsed)
+            objective, filled = evaluate(cost_matrix, pairs)
+            if reference_objective is None:
+                reference_objective = objective
+            gap = float(objective - reference_objective) / max(abs(float(reference_objective)), 1e-9)
+            results.append({
+                'workload': f"{num_roles}x{num_resources}",
+                'columns': columns,
+                'solver': name,
+                'seconds': best_time,
+                'objective': float(objective),
+                'filled': filled,
+                'gap': gap,
+            })
+    return results
+
+def parse_workload(value):
+    roles, resources = value.lower().split('x')
+    return int(roles), int(resources)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark assignment solver backends.")
+    parser.add_argument('--workload', action='append', type=parse_workload,
+                        help="ROLESxRESOURCES, may be repeated (default: 10x100, 30x500, 60x2000)")
+    parser.add_argument('--solvers', default=','.join(sorted(SOLVERS)), help="Comma-separated solver names")
+    parser.add_argument('--reference', default='lap', help="Exact solver the objective gap is measured against")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per solver; the fastest is reported")
+    parser.add_argument('--full-matrix', action='store_true',
+                        help="Hand solvers every resource instead of the pruned candidate columns")
+    parser.add_argument('--time-budget-ms', type=float, default=1000, help="Deadline for the anytime solver")
+    parser.add_argument('--compare-decimal', action='store_true',
+                        help="Check fixed-point scoring against the original Decimal scoring instead of timing solvers")
+    parser.add_argument('--check-auctions', action='store_true',
+                        help="Check both auctions against lap instead of timing solvers; exits 1 on a failure")
+    parser.add_argument('--timeout', type=float, default=30, help="Seconds an auction gets per workload with --check-auctions")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Bidding processes for parallel_auction (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    workloads = args.workload or [(10, 100), (30, 500), (60, 2000)]
+    if args.compare_decimal:
+        print(f"{'workload':>12} {'rows':>6} {'ranking mismatches':>19} {'same assignment':>16}")
+        for result in compare_decimal(workloads, args.seed):
+            print(
+                f"{result['workload']:>12} {result['rows']:>6} {result['ranking_mismatches']:>19} "
+                f"{str(result['same_assignment']):>16}"
+            )
+        return
+    if args.check_auctions:
+        results = check_auctions(workloads, args.seed, args.timeout)
+        print(f"{'workload':>12} {'solver':>18} {'seconds':>10} {'gap':>12} {'result':>7}")
+        for result in results:
+            gap = 'timeout' if result['gap'] is None else f"{result['gap']:.6f}"
+            print(
+                f"{result['workload']:>12} {result['solver']:>18} {result['seconds']:>10.4f} {gap:>12} "
+                f"{'ok' if result['passed'] else 'FAILED':>7}"
+            )
+        if not all(result['passed'] for result in results):
+            sys.exit(1)
+        return
+    solvers = [name.strip() for name in args.solvers.split(',') if name.strip()]
+    options = {
+        'anytime': {'time_budget_ms': args.time_budget_ms},
+        'parallel_auction': {'workers': args.workers},
+    }
+    results = run(workloads, solvers, args.reference, args.seed, args.repeat, args.full_matrix, options)
+
+    print(f"{'workload':>12} {'columns':>8} {'solver':>18} {'seconds':>10} {'objective':>16} {'filled':>7} {'gap':>9}")
+    for result in results:
+        print(
+            f"{result['workload']:>12} {result['columns']:>8} {result['solver']:>18} "
+            f"{result['seconds']:>10.4f} {result['objective']:>16.4f} {result['filled']:>7} {result['gap']:>9.4%}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import os
 import sys
 import json
 import logging
+import argparse
 from datetime import datetime
 from decimal import Decimal
 
@@ -16,7 +17,11 @@ from app.models.organization import Organization
 from app.models.resource import Resource
 from app.models.project import Project
 from app.models.team import Team
+from app.models.skill import Skill
 from app.services.utils import get_resource_skills_with_levels
+from app.services.availability import refresh_availability
+from app.services.skills import local_resolver, normalize_resource_skills, normalize_requirements
+from sqlalchemy import insert, text
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,7 +51,93 @@ def is_level_sufficient(resource_level, required_level):
     except ValueError:
         return False
 
-def populate_initial_data():
+def iter_records(path):
+    """
+    Yields records from an NDJSON file line by line, or from a JSON array file.
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.ndjson'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+# Skill vocabulary built while loading, inserted into the skills table afterwards
+resolve_skill = local_resolver()
+
+def resource_row(user):
+    skills, skill_ids, skill_levels = normalize_resource_skills(user.get('Skills', {}), resolve_skill)
+    return {
+        'ResourceID': user['ResourceID'],
+        'Name': user['Name'],
+        'Rate': Decimal(str(user.get('Rate', '0'))),
+        'Skills': skills,
+        'SkillIDs': skill_ids,
+        'SkillLevels': skill_levels,
+        'PastJobTitles': user.get('PastJobTitles', {}),
+        'Domain': user.get('Domain', []),
+        'AvailableDate': datetime.strptime(user['AvailableDate'], '%Y-%m-%d').date() if user.get('AvailableDate') else None,
+        'OrgID': user.get('OrgID'),  # OrgID is now a string
+        'TeamID': user.get('TeamID'),  # Initially None
+        'OnBench': user.get('OnBench', True)  # Default to True if not specified
+    }
+
+def project_row(project_data):
+    return {
+        'ProjectID': project_data['ProjectID'],
+        'ProjectName': project_data['ProjectName'],
+        'NumberOfDays': project_data.get('NumberOfDays', 0),
+        'ProjectStartDate': datetime.strptime(project_data['ProjectStartDate'], '%Y-%m-%d').date(),
+        'Technology': project_data['Technology'],
+        'Domain': project_data['Domain'],
+        'RequiredResources': normalize_requirements(project_data['RequiredResources'], resolve_skill),
+        'OrgID': project_data['OrgID']  # OrgID is now a string
+    }
+
+def bulk_load(model, records, to_row, chunk_size):
+    """
+    Inserts records in chunks of multi-row INSERTs, committing after each chunk.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    total = 0
+    chunk = []
+    for record in records:
+        chunk.append(to_row(record))
+        if len(chunk) >= chunk_size:
+            db.session.execute(insert(model), chunk)
+            db.session.commit()
+            total += len(chunk)
+            chunk = []
+            logger.info(f"Loaded {total} {model.__tablename__}...")
+    if chunk:
+        db.session.execute(insert(model), chunk)
+        db.session.commit()
+        total += len(chunk)
+    return total
+
+def reset_sequence(model, column):
+    """
+    Moves a serial column's sequence past the explicitly loaded IDs.
+    """
+    table = model.__tablename__
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+        f"COALESCE((SELECT MAX(\"{column}\") FROM {table}), 0) + 1, false)"
+    ))
+    db.session.commit()
+
+def find_data_file(data_dir, name):
+    # Prefer the streaming NDJSON output of generate_data.py when present
+    for extension in ('ndjson', 'json'):
+        path = os.path.join(data_dir, f'{name}.{extension}')
+        if os.path.exists(path):
+            return path
+    return None
+
+def populate_initial_data(data_dir=None, chunk_size=5000, assign_teams=True):
     app = create_app()
     with app.app_context():
         drop_all_tables()
@@ -61,57 +152,41 @@ def populate_initial_data():
         db.session.commit()
         
         # 2. Populate Resources
-        data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
-        resources_file = os.path.join(data_dir, 'sample_resources.json')
-        if os.path.exists(resources_file):
-            with open(resources_file, 'r') as f:
-                resources = json.load(f)
-                for user in resources:
-                    resource = Resource(
-                        ResourceID=user['ResourceID'],
-                        Name=user['Name'],
-                        Rate=Decimal(str(user.get('Rate', '0'))),
-                        Skills=user.get('Skills', {}),
-                        PastJobTitles=user.get('PastJobTitles', {}),
-                        Domain=user.get('Domain', []),
-                        AvailableDate=datetime.strptime(user['AvailableDate'], '%Y-%m-%d') if user.get('AvailableDate') else None,
-                        OrgID=user.get('OrgID'),  # OrgID is now a string
-                        TeamID=user.get('TeamID'),  # Initially None
-                        OnBench=user.get('OnBench', True)  # Default to True if not specified
-                    )
-                    db.session.merge(resource)
-                    logger.info(f"Added/Updated resource: {resource.Name}")
+        data_dir = data_dir or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+        resources_file = find_data_file(data_dir, 'sample_resources')
+        if resources_file:
+            count = bulk_load(Resource, iter_records(resources_file), resource_row, chunk_size)
+            reset_sequence(Resource, 'ResourceID')
+            logger.info(f"Loaded {count} resources from {resources_file}")
         else:
-            logger.error(f"Resources file not found at {resources_file}")
+            logger.error(f"Resources file not found in {data_dir}")
         logger.info("Resources populated.")
         
-        db.session.commit()
-        
         # 3. Populate Projects
-        projects_file = os.path.join(data_dir, 'sample_projects.json')
-        if os.path.exists(projects_file):
-            with open(projects_file, 'r') as f:
-                projects = json.load(f)
-                for project_data in projects:
-                    project = Project(
-                        ProjectID=project_data['ProjectID'],
-                        ProjectName=project_data['ProjectName'],
-                        NumberOfDays=project_data.get('NumberOfDays', 0),
-                        ProjectStartDate=datetime.strptime(project_data['ProjectStartDate'], '%Y-%m-%d'),
-                        Technology=project_data['Technology'],
-                        Domain=project_data['Domain'],
-                        RequiredResources=project_data['RequiredResources'],
-                        OrgID=project_data['OrgID']  # OrgID is now a string
-                    )
-                    db.session.merge(project)
-                    logger.info(f"Added/Updated project: {project.ProjectName}")
+        projects_file = find_data_file(data_dir, 'sample_projects')
+        if projects_file:
+            count = bulk_load(Project, iter_records(projects_file), project_row, chunk_size)
+            reset_sequence(Project, 'ProjectID')
+            logger.info(f"Loaded {count} projects from {projects_file}")
         else:
-            logger.error(f"Projects file not found at {projects_file}")
+            logger.error(f"Projects file not found in {data_dir}")
         logger.info("Projects populated.")
+
+        # 4. Skill vocabulary referenced by the loaded resources and projects
+        if resolve_skill.vocabulary:
+            db.session.execute(insert(Skill), [
+                {'SkillID': skill_id, 'Name': name, 'NormalizedName': normalized}
+                for normalized, (skill_id, name) in resolve_skill.vocabulary.items()
+            ])
+            db.session.commit()
+            reset_sequence(Skill, 'SkillID')
+        logger.info(f"Registered {len(resolve_skill.vocabulary)} skills.")
+
+        if not assign_teams:
+            refresh_all_availability()
+            return
         
-        db.session.commit()
-        
-        # 4. Populate Teams and Assign Resources
+        # 5. Populate Teams and Assign Resources
         for project in Project.query.all():
             # Create a Team for each Project
             team = Team(
@@ -162,8 +237,21 @@ def populate_initial_data():
             db.session.commit()
             logger.info(f"Resources assigned to team for project: {project.ProjectName}")
 
-def main():
-    populate_initial_data()
+        refresh_all_availability()
+
+def refresh_all_availability():
+    for org_data in ORGANIZATIONS:
+        refresh_availability(org_data["OrgID"])
+    db.session.commit()
+    logger.info("Resource availability ranges computed.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recreate the database and load sample data.")
+    parser.add_argument('--data-dir', default=None, help="Directory holding sample_resources/sample_projects (.ndjson or .json)")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per INSERT batch")
+    parser.add_argument('--skip-teams', action='store_true', help="Do not create teams (recommended for large load-test data)")
+    args = parser.parse_args(argv)
+    populate_initial_data(args.data_dir, args.chunk_size, assign_teams=not args.skip_teams)
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,10 @@
 import os
 import json
+import heapq
 import random
+import argparse
 from faker import Faker
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 fake = Faker()
 
@@ -160,127 +162,158 @@ ORGANIZATIONS = [
     {"OrgID": "org_2mZShDPkUeuXKV0MQSJoabl8S7P", "OrgName": "Apt 273"}
 ]
 
+# Distributions used for realistic data: lists above are ordered roughly by
+# popularity, so earlier entries are drawn more often (Zipf-like weights).
+SKILL_WEIGHTS = [1.0 / (rank + 1) ** 0.8 for rank in range(len(SKILLS))]
+DOMAIN_WEIGHTS = [1.0 / (rank + 1) ** 0.5 for rank in range(len(DOMAINS))]
+TECHNOLOGY_WEIGHTS = [1.0 / (rank + 1) ** 0.8 for rank in range(len(TECHNOLOGIES))]
+RESOURCE_LEVEL_WEIGHTS = [0.45, 0.38, 0.17]  # beginner, intermediate, expert
+REQUIRED_LEVEL_WEIGHTS = [0.30, 0.45, 0.25]
+
+def weighted_sample(rng, population, weights, k):
+    """
+    Draws k distinct items, favouring items with larger weights.
+    """
+    # Efraimidis-Spirakis: keep the k largest u ** (1 / w) keys
+    keyed = [(rng.random() ** (1.0 / weight), item) for item, weight in zip(population, weights)]
+    return [item for _key, item in heapq.nlargest(k, keyed)]
+
+def generate_resource(rng, resource_id, start_date):
+    name = fake.name()
+
+    # Assign 3-5 skills with levels skewed towards beginner/intermediate
+    num_skills = rng.randint(3, 5)
+    skills = {}
+    for skill in weighted_sample(rng, SKILLS, SKILL_WEIGHTS, num_skills):
+        skills[skill] = {"level": rng.choices(SKILL_LEVELS, RESOURCE_LEVEL_WEIGHTS)[0]}
+
+    # Assign 2-4 past job titles, years drawn from a log-normal distribution
+    num_jobs = rng.randint(2, 4)
+    past_jobs = {}
+    for job in rng.sample(JOB_TITLES, num_jobs):
+        years = min(max(rng.lognormvariate(0.8, 0.6), 0.5), 15.0)
+        past_jobs[job] = {"years": round(years, 1)}
+
+    # Rate grows with experience and skill level, with some noise
+    experience = sum(job["years"] for job in past_jobs.values())
+    seniority = sum(SKILL_LEVELS.index(details["level"]) for details in skills.values()) / num_skills
+    rate = 40.0 + 1.2 * experience + 12.0 * seniority + rng.gauss(0, 6)
+    rate = round(min(max(rate, 30.0), 150.0), 2)
+
+    # Assign 1-3 domains
+    domains = weighted_sample(rng, DOMAINS, DOMAIN_WEIGHTS, rng.randint(1, 3))
+
+    # Available date within the next 90 days
+    available_date = (start_date + timedelta(days=rng.randint(0, 90))).strftime('%Y-%m-%d')
+
+    return {
+        "ResourceID": resource_id,
+        "Name": name,
+        "Rate": rate,
+        "Skills": skills,
+        "PastJobTitles": past_jobs,
+        "Domain": domains,
+        "AvailableDate": available_date,
+        "OrgID": rng.choice(ORGANIZATIONS)["OrgID"],  # OrgID is a string
+        "TeamID": None,  # Initially not assigned to any team
+        "OnBench": True
+    }
+
+def generate_project(rng, project_id, start_date):
+    # Keep the curated names first, then derive unique names
+    base_name = PROJECT_NAMES[(project_id - 1) % len(PROJECT_NAMES)]
+    project_name = base_name if project_id <= len(PROJECT_NAMES) else f"{base_name} {project_id}"
+
+    # Assign 2-4 required roles, each needing 2-4 skills and 1-3 people
+    required_resources = []
+    for role in rng.sample(ROLES, rng.randint(2, 4)):
+        role_skills = {}
+        for skill in weighted_sample(rng, SKILLS, SKILL_WEIGHTS, rng.randint(2, 4)):
+            role_skills[skill] = {"level": rng.choices(SKILL_LEVELS, REQUIRED_LEVEL_WEIGHTS)[0]}
+        required_resources.append({
+            "Role": role,
+            "Skills": role_skills,
+            "Quantity": rng.randint(1, 3)
+        })
+
+    return {
+        "ProjectID": project_id,
+        "ProjectName": project_name,
+        "OrgID": rng.choice(ORGANIZATIONS)["OrgID"],  # OrgID is a string
+        "RequiredResources": required_resources,
+        "NumberOfDays": rng.randint(60, 180),
+        # Start date within the next 30 days
+        "ProjectStartDate": (start_date + timedelta(days=rng.randint(0, 30))).strftime('%Y-%m-%d'),
+        "Technology": weighted_sample(rng, TECHNOLOGIES, TECHNOLOGY_WEIGHTS, rng.randint(1, 3)),
+        "Domain": weighted_sample(rng, DOMAINS, DOMAIN_WEIGHTS, rng.randint(1, 3))
+    }
+
+def iter_resources(count, seed=None, start_date=None):
+    """
+    Yields resource records one at a time; the same seed yields the same records.
+    """
+    rng = random.Random(seed)
+    fake.seed_instance(seed)
+    start_date = start_date or date.today()
+    for resource_id in range(1, count + 1):
+        yield generate_resource(rng, resource_id, start_date)
+
+def iter_projects(count, seed=None, start_date=None):
+    """
+    Yields project records one at a time; the same seed yields the same records.
+    """
+    rng = random.Random(None if seed is None else seed + 1)
+    start_date = start_date or date.today()
+    for project_id in range(1, count + 1):
+        yield generate_project(rng, project_id, start_date)
+
 def generate_resources(num_resources):
-    resources = []
-    for i in range(1, num_resources + 1):
-        name = fake.name()
-        rate = round(random.uniform(40.0, 100.0), 2)
-        
-        # Assign 3-5 skills with random levels
-        num_skills = random.randint(3, 5)
-        skills = {}
-        selected_skills = random.sample(SKILLS, num_skills)
-        for skill in selected_skills:
-            level = random.choice(SKILL_LEVELS)
-            skills[skill] = {"level": level}
-        
-        # Assign 2-4 past job titles with random years
-        num_jobs = random.randint(2, 4)
-        past_jobs = {}
-        selected_jobs = random.sample(JOB_TITLES, num_jobs)
-        for job in selected_jobs:
-            years = round(random.uniform(1.0, 10.0), 1)
-            past_jobs[job] = {"years": years}
-        
-        # Assign 1-3 domains
-        num_domains = random.randint(1, 3)
-        domains = random.sample(DOMAINS, num_domains)
-        
-        # Available date within the next 90 days
-        available_date = fake.date_between(start_date='today', end_date='+90d').strftime('%Y-%m-%d')
-        
-        # Random OrgID as string
-        org = random.choice(ORGANIZATIONS)
-        org_id = org["OrgID"]
-        
-        # OnBench is default True, but we can randomize it if needed
-        OnBench = True  # You can set to random.choice([True, False]) if desired
-        
-        resource = {
-            "ResourceID": i,
-            "Name": name,
-            "Rate": rate,
-            "Skills": skills,
-            "PastJobTitles": past_jobs,
-            "Domain": domains,
-            "AvailableDate": available_date,
-            "OrgID": org_id,  # OrgID is now a string
-            "TeamID": None,  # Initially not assigned to any team
-            "OnBench": OnBench
-        }
-        resources.append(resource)
-    return resources
+    return list(iter_resources(num_resources))
 
 def generate_projects(num_projects):
-    projects = []
-    for i in range(1, num_projects + 1):
-        project_name = PROJECT_NAMES[i - 1]  # Ensure unique names
-        org = random.choice(ORGANIZATIONS)
-        org_id = org["OrgID"]  # OrgID is now a string
-        
-        # Assign 2-4 required resources
-        num_required = random.randint(2, 4)
-        required_resources = []
-        selected_roles = random.sample(ROLES, num_required)
-        for role in selected_roles:
-            # Assign 2-4 skills per role
-            num_skills = random.randint(2, 4)
-            role_skills = {}
-            selected_role_skills = random.sample(SKILLS, num_skills)
-            for skill in selected_role_skills:
-                level = random.choice(SKILL_LEVELS)
-                role_skills[skill] = {"level": level}
-            # Assign quantity 1-3
-            quantity = random.randint(1, 3)
-            required_resources.append({
-                "Role": role,
-                "Skills": role_skills,
-                "Quantity": quantity
-            })
-        
-        number_of_days = random.randint(60, 180)
-        
-        # Start date within the next 30 days
-        project_start_date = fake.date_between(start_date='today', end_date='+30d').strftime('%Y-%m-%d')
-        
-        # Assign 1-3 technologies
-        num_technologies = random.randint(1, 3)
-        technologies = random.sample(TECHNOLOGIES, num_technologies)
-        
-        # Assign 1-3 domains
-        num_domains = random.randint(1, 3)
-        domains = random.sample(DOMAINS, num_domains)
-        
-        project = {
-            "ProjectID": i,
-            "ProjectName": project_name,
-            "OrgID": org_id,  # OrgID is now a string
-            "RequiredResources": required_resources,
-            "NumberOfDays": number_of_days,
-            "ProjectStartDate": project_start_date,
-            "Technology": technologies,
-            "Domain": domains
-        }
-        projects.append(project)
-    return projects
-
-def main():
-    resources = generate_resources(NUM_RESOURCES)
-    projects = generate_projects(NUM_PROJECTS)
-    
+    return list(iter_projects(num_projects))
+
+def write_records(path, records, fmt):
+    """
+    Streams records to disk in constant memory, as NDJSON or as a JSON array.
+    """
+    count = 0
+    with open(path, 'w') as f:
+        if fmt == 'json':
+            f.write('[\n')
+        for record in records:
+            if fmt == 'json':
+                if count:
+                    f.write(',\n')
+                f.write(json.dumps(record, indent=4))
+            else:
+                f.write(json.dumps(record, separators=(',', ':')))
+                f.write('\n')
+            count += 1
+        if fmt == 'json':
+            f.write('\n]\n')
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic resources and projects.")
+    parser.add_argument('--resources', type=int, default=NUM_RESOURCES)
+    parser.add_argument('--projects', type=int, default=NUM_PROJECTS)
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible data")
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json')
+    parser.add_argument('--start-date', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+                        default=None, help="Base date for availability and start dates (default: today)")
+    parser.add_argument('--out-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+    args = parser.parse_args(argv)
+
     # Ensure data directory exists
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-    
-    # Save to JSON files
-    with open(os.path.join(data_dir, 'sample_resources.json'), 'w') as f:
-        json.dump(resources, f, indent=4)
-    
-    with open(os.path.join(data_dir, 'sample_projects.json'), 'w') as f:
-        json.dump(projects, f, indent=4)
-    
-    print(f"Generated {NUM_RESOURCES} resources and {NUM_PROJECTS} projects successfully.")
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    resources_path = os.path.join(args.out_dir, f'sample_resources.{args.format}')
+    projects_path = os.path.join(args.out_dir, f'sample_projects.{args.format}')
+    num_resources = write_records(resources_path, iter_resources(args.resources, args.seed, args.start_date), args.format)
+    num_projects = write_records(projects_path, iter_projects(args.projects, args.seed, args.start_date), args.format)
+
+    print(f"Generated {num_resources} resources and {num_projects} projects successfully.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,185 @@
+# app/Test/load_test.py
+#
+# Load test of the serving profiles: closed-loop clients send a mix of CRUD reads,
+# resource updates and team formation (GET /teams/plan) to gunicorn, and the p50/p99
+# latency of each kind of request is reported per profile:
+#   python app/Test/load_test.py --org <OrgID> --clients 16 --duration 30
+#
+# Profiles: 'default' is gunicorn's own defaults (one sync worker), 'profile' is
+# `gunicorn -c gunicorn.conf.py main:app`; variants of the profile set its environment:
+#   python app/Test/load_test.py --org <OrgID> --variant sync:GUNICORN_WORKER_CLASS=sync,GUNICORN_THREADS=1 \
+#       --variant threads-16:GUNICORN_THREADS=16 --mix read=70,write=20,formation=10
+#
+# Updates write a resource's own Rate back, so the data is unchanged (the availability
+# refresh and snapshot invalidation still happen). Needs DATABASE_URL like the server.
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import threading
+import subprocess
+import statistics
+import urllib.request
+import urllib.error
+from datetime import date
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT)
+
+from app.Test.bench_concurrency import proxied_database_url, wait_until_up
+
+
+def start_server(port, config_file, extra_env, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, PORT=str(port))
+    env.update(extra_env)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    # gunicorn reads ./gunicorn.conf.py unless given another file
+    command = [sys.executable, '-m', 'gunicorn', '-c', config_file or os.devnull]
+    command += ['-b', f'127.0.0.1:{port}', '--log-level', 'warning', 'main:app']
+    return subprocess.Popen(command, cwd=ROOT, env=env, start_new_session=True)
+
+
+def send(method, url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def traffic(base, org_id):
+    """
+    The request kinds of the mix, each a function sending one request.
+    """
+    with urllib.request.urlopen(f'{base}/resources/all?orgID={org_id}', timeout=60) as response:
+        rates = {resource['ResourceID']: resource['Rate'] for resource in json.load(response)}
+    with urllib.request.urlopen(f'{base}/projects/all?orgID={org_id}', timeout=60) as response:
+        projects = json.load(response)
+    project_ids = [project['ProjectID'] for project in projects]
+    if not rates or not project_ids:
+        raise RuntimeError(f"Org '{org_id}' needs resources and projects to be load tested")
+    resource_ids = sorted(rates)
+    # Plan over all of the org's projects, however far in the past or future they start
+    starts = sorted(date.fromisoformat(project['ProjectStartDate']) for project in projects)
+    plan_url = f'{base}/teams/plan?orgID={org_id}&from={starts[0]}&days={(starts[-1] - starts[0]).days + 1}'
+
+    def read():
+        if random.random() < 0.5:
+            resource_id = random.choice(resource_ids)
+            return send('GET', f'{base}/resources/by-id?orgID={org_id}&resourceID={resource_id}')
+        return send('GET', f'{base}/projects/by-id?orgID={org_id}&projectID={random.choice(project_ids)}')
+
+    def write():
+        resource_id = random.choice(resource_ids)
+        return send('PUT', f'{base}/resources/?orgID={org_id}&resourceID={resource_id}', {'Rate': rates[resource_id]})
+
+    def formation():
+        return send('GET', plan_url)
+
+    return {'read': read, 'write': write, 'formation': formation}
+
+
+def run_mix(kinds, mix, clients, duration):
+    """
+    Runs `clients` closed-loop clients for `duration` seconds, each picking the
+    kind of its next request by the weights of the mix.
+
+    Returns:
+        dict: Latencies and errors per kind, and the overall throughput.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results = {name: [] for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            outcome = kinds[name]()
+            with lock:
+                results[name].append(outcome)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        'rps': sum(len(outcomes) for outcomes in results.values()) / wall,
+        'kinds': {name: summarize(outcomes) for name, outcomes in results.items()},
+    }
+
+
+def summarize(outcomes):
+    latencies = sorted(latency for latency, _ok in outcomes)
+    if not latencies:
+        return {'count': 0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'errors': 0}
+    return {
+        'count': len(latencies),
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+        'errors': sum(not ok for _latency, ok in outcomes),
+    }
+
+
+def parse_variant(spec):
+    name, _sep, assignments = spec.partition(':')
+    env = dict(item.split('=', 1) for item in assignments.split(',') if item)
+    return name, 'gunicorn.conf.py', env
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the gunicorn serving profiles with mixed traffic.")
+    parser.add_argument('--org', required=True, help="OrgID the requests are sent for")
+    parser.add_argument('--mix', default='read=70,write=20,formation=10',
+                        help="Weights of the request kinds (read, write, formation)")
+    parser.add_argument('--clients', type=int, default=16, help="Concurrent closed-loop clients")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of load per profile")
+    parser.add_argument('--warmup', type=float, default=3, help="Seconds of load before measuring")
+    parser.add_argument('--profiles', default='default,profile', help="Comma-separated among default, profile")
+    parser.add_argument('--variant', action='append', default=[],
+                        help="NAME:VAR=VALUE,... gunicorn.conf.py with these environment overrides (repeatable)")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="One-way latency added to database traffic")
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    mix = {name: float(weight) for name, weight in (item.split('=') for item in args.mix.split(','))}
+    database_url = os.environ['DATABASE_URL']
+    if args.db_latency_ms:
+        database_url = proxied_database_url(database_url, args.db_latency_ms)
+
+    builtin = {'default': ('default', None, {}), 'profile': ('profile', 'gunicorn.conf.py', {})}
+    profiles = [builtin[name] for name in args.profiles.split(',') if name]
+    profiles += [parse_variant(spec) for spec in args.variant]
+
+    print(f"{'profile':<16}{'kind':<11}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'req/s':>9}")
+    for name, config_file, extra_env in profiles:
+        server = start_server(args.port, config_file, extra_env, database_url)
+        try:
+            base = f'http://127.0.0.1:{args.port}'
+            wait_until_up(f'{base}/teams/', timeout=60)
+            kinds = traffic(base, args.org)
+            run_mix(kinds, mix, args.clients, args.warmup)
+            stats = run_mix(kinds, mix, args.clients, args.duration)
+            for kind, summary in stats['kinds'].items():
+                print(f"{name:<16}{kind:<11}{summary['count']:>7}{summary['p50_ms']:>10.1f}{summary['p99_ms']:>10.1f}"
+                      f"{summary['errors']:>8}{stats['rps']:>9.1f}")
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
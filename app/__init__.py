@@ -12,6 +12,10 @@ def create_app():
 
     db.init_app(app)  # Initialize the database
     migrate = Migrate(app, db)  # Initialize migrations
+
+    # Per-request SQL statement counts, DB time and slow-query logging
+    from app.services.query_stats import init_query_stats
+    init_query_stats(app, db)
     
     with app.app_context():
         from app import models
@@ -21,11 +25,24 @@ def create_app():
     from app.api.projects import projects_bp
     from app.api.teams import teams_bp
     from app.api.organizations import organizations_bp
-    
+    from app.api.metrics import metrics_bp
+    from app.api.weight_profiles import weight_profiles_bp
+    from app.api.scenarios import scenarios_bp
+    from app.api.batch import batch_bp
+    from app.api.changes import changes_bp
 
     app.register_blueprint(organizations_bp, url_prefix='/organizations') 
     app.register_blueprint(projects_bp, url_prefix='/projects')
     app.register_blueprint(resources_bp, url_prefix='/resources')
     app.register_blueprint(teams_bp, url_prefix='/teams') # This must match
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
+    app.register_blueprint(weight_profiles_bp, url_prefix='/weight-profiles')
+    app.register_blueprint(scenarios_bp, url_prefix='/scenarios')
+    app.register_blueprint(batch_bp, url_prefix='/batch')
+    app.register_blueprint(changes_bp, url_prefix='/changes')
+
+    # flask staff-all
+    from app.cli import init_cli
+    init_cli(app)
 
     return app
\ No newline at end of file
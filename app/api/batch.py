@@ -0,0 +1,32 @@
+# app/api/batch.py
+
+from flask import Blueprint, request, jsonify, current_app
+from app.services.batch import run_batch, validate_batch
+from app.services.profiling import profiled
+import logging
+
+batch_bp = Blueprint('batch', __name__)
+logger = logging.getLogger(__name__)
+
+@batch_bp.route('/', methods=['POST'])
+@profiled
+def batch():
+    """
+    Runs several GET requests in one call, on one database snapshot:
+    POST /batch with {"requests": [{"path": "/projects/all?orgID=<org>", "headers": {...}}, ...], "parallel": false}
+    Returns {"responses": [{"status": <HTTP status>, "body": <body>}, ...]} in the order of the requests.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object with a list of requests is required."}), 400
+        try:
+            sub_requests = validate_batch(data.get('requests'), current_app.config['BATCH_MAX_REQUESTS'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        responses = run_batch(sub_requests, parallel=bool(data.get('parallel')))
+        return jsonify({"responses": responses}), 200
+    except Exception as e:
+        logger.error(f"Error in batch: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,43 @@
+# app/api/changes.py
+
+from flask import Blueprint, request, jsonify, current_app
+from app.services.changes import ChangeFeedBusy, changes_since
+from app.services.profiling import profiled
+import logging
+
+changes_bp = Blueprint('changes', __name__)
+logger = logging.getLogger(__name__)
+
+@changes_bp.route('/', methods=['GET'])
+@profiled
+def get_changes():
+    """
+    The resources, projects and teams of an organization written or deleted since a cursor:
+    GET /changes?orgID=<org>&since=<cursor>&limit=<n>
+    Returns {"changes": [{"ChangeSeq", "EntityType", "EntityID", "Operation": "upsert" | "delete", "Data"}, ...],
+    "cursor": <since for the next call>, "has_more": <another page is ready>}. Start from since=0.
+    """
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required."}), 400
+        since = request.args.get('since', '0')
+        if not since.isdigit():
+            return jsonify({"error": "since must be a cursor returned by /changes."}), 400
+        max_limit = current_app.config['CHANGES_MAX_LIMIT']
+        limit = request.args.get('limit', current_app.config['CHANGES_DEFAULT_LIMIT'], type=int)
+        if not 0 < limit <= max_limit:
+            return jsonify({"error": f"limit must be between 1 and {max_limit}."}), 400
+
+        try:
+            changes, cursor, has_more = changes_since(
+                org_id, int(since), limit, current_app.config['CHANGES_LOCK_WAIT_MS']
+            )
+        except ChangeFeedBusy as e:
+            response = jsonify({"error": str(e)})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 503
+        return jsonify({"changes": changes, "cursor": str(cursor), "has_more": has_more}), 200
+    except Exception as e:
+        logger.error(f"Error in get_changes: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,12 @@
+# app/api/metrics.py
+
+from flask import Blueprint, Response
+from app.services.metrics import render_prometheus
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    # Prometheus text exposition format, merged across workers when
+    # PROMETHEUS_MULTIPROC_DIR is set
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
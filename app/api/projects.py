@@ -6,7 +6,9 @@ from app.Files_Database.projects_db import (
     get_project_by_id,
     create_new_project,
     update_project,
-    delete_project
+    delete_project,
+    bulk_update_projects,
+    bulk_delete_projects
 )
 from sqlalchemy.exc import IntegrityError
 import logging
@@ -126,3 +128,45 @@ def delete_project_route():
     except Exception as e:
         logging.error(f"Error deleting project with ID {project_id}: {e}")
         return jsonify({"error": str(e)}), 500
+
+# PATCH projects in bulk: {"ProjectIDs": [...], "filter": {...}, "set": {...}}
+@projects_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_projects_route():
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required"}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object is required"}), 400
+
+        projects = bulk_update_projects(org_id, data)
+        logging.info(f"Bulk updated {len(projects)} project(s).")
+        return jsonify({"count": len(projects), "projects": [project.serialize() for project in projects]}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except IntegrityError as ie:
+        return jsonify({"error": "Database integrity error: " + str(ie.orig)}), 400
+    except Exception as e:
+        logging.error(f"Error bulk updating projects: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# DELETE projects in bulk (with their teams): {"ProjectIDs": [...], "filter": {...}}
+@projects_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_projects_route():
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required"}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object is required"}), 400
+
+        project_ids = bulk_delete_projects(org_id, data)
+        logging.info(f"Bulk deleted {len(project_ids)} project(s).")
+        return jsonify({"count": len(project_ids), "ProjectIDs": project_ids}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        logging.error(f"Error bulk deleting projects: {e}")
+        return jsonify({"error": str(e)}), 500
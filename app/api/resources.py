@@ -1,12 +1,17 @@
 # app/api/resources.py
 
+from datetime import date, timedelta
 from flask import Blueprint, request, jsonify
+from sqlalchemy.dialects.postgresql import Range
 from app.Files_Database.resources_db import (
     get_all_resources,
     get_resource_by_id,
+    get_available_resources,
     create_new_resource,
     update_resource,
-    delete_resource
+    delete_resource,
+    bulk_update_resources,
+    bulk_delete_resources
 )
 
 resources_bp = Blueprint('resources', __name__)
@@ -43,6 +48,27 @@ def get_resource_by_id_route():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# GET resources free over a date range (both dates included) for a given organization
+@resources_bp.route('/available', methods=['GET'])
+def get_available_resources_route():
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id or not request.args.get('from'):
+            return jsonify({"error": "orgID and from are required"}), 400
+        try:
+            start_date = date.fromisoformat(request.args['from'])
+            end_date = date.fromisoformat(request.args['to']) if request.args.get('to') else start_date
+        except ValueError:
+            return jsonify({"error": "from and to must be dates (YYYY-MM-DD)"}), 400
+        if end_date < start_date:
+            return jsonify({"error": "to must not be before from"}), 400
+
+        resources = get_available_resources(org_id, Range(start_date, end_date + timedelta(days=1), bounds='[)'))
+        serialized_resources = [resource.serialize() for resource in resources]
+        return jsonify(serialized_resources), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # POST (Create) new resource
 @resources_bp.route('/', methods=['POST'])
 def create_resource():
@@ -88,3 +114,39 @@ def delete_resource_route():
         return jsonify(result), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+# PATCH resources in bulk: {"ResourceIDs": [...], "filter": {...}, "set": {...}, "scale": {"Rate": 1.05}}
+@resources_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_resources_route():
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required"}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object is required"}), 400
+
+        resources = bulk_update_resources(org_id, data)
+        return jsonify({"count": len(resources), "resources": [resource.serialize() for resource in resources]}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# DELETE resources in bulk: {"ResourceIDs": [...], "filter": {...}}
+@resources_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_resources_route():
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required"}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object is required"}), 400
+
+        resource_ids = bulk_delete_resources(org_id, data)
+        return jsonify({"count": len(resource_ids), "ResourceIDs": resource_ids}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
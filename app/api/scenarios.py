@@ -0,0 +1,46 @@
+# app/api/scenarios.py
+
+from datetime import date
+from flask import Blueprint, request, jsonify, current_app
+from app.services.scenarios import run_scenarios
+from app.services.profiling import profiled
+from app.services.solvers import SOLVERS
+import logging
+
+scenarios_bp = Blueprint('scenarios', __name__)
+logger = logging.getLogger(__name__)
+
+@scenarios_bp.route('/', methods=['POST'])
+@profiled
+def simulate():
+    """
+    Runs what-if scenarios on top of the organization's current state, without saving anything:
+    POST /scenarios?orgID=<org> with {"scenarios": [...], "from": "YYYY-MM-DD", "days": <horizon>, "solver": <backend>}
+    See app.services.scenarios.prepare_scenario for the shape of a scenario.
+    """
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required."}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object with a list of scenarios is required."}), 400
+        try:
+            start_date = date.fromisoformat(data['from']) if data.get('from') else date.today()
+        except (TypeError, ValueError):
+            return jsonify({"error": "from must be a date (YYYY-MM-DD)."}), 400
+        horizon_days = data.get('days', current_app.config['PLANNING_HORIZON_DAYS'])
+        if not isinstance(horizon_days, int) or horizon_days <= 0:
+            return jsonify({"error": "days must be a positive integer."}), 400
+        solver = data.get('solver')
+        if solver and solver not in SOLVERS:
+            return jsonify({"error": f"Unknown solver '{solver}'. Available solvers: {', '.join(sorted(SOLVERS))}"}), 400
+
+        try:
+            result = run_scenarios(org_id, data.get('scenarios'), start_date, horizon_days, solver=solver)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"Error in simulate: {e}")
+        return jsonify({"error": str(e)}), 500
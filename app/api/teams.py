@@ -1,13 +1,22 @@
 # app/api/teams.py
 
-from flask import Blueprint, request, jsonify
-from app.services.team_formation import match_resources_to_projects
+from datetime import date
+from flask import Blueprint, request, jsonify, current_app
+from app.services.team_formation import expand_roles, match_resources_to_projects
+from app.services.admission import AdmissionRejected, SolveTimeout, admitted, estimate_cost
+from app.services.scheduling import plan_portfolio
+from app.services.rebalancing import rebalance_teams
+from app.services.availability import bench_candidates
 from app.models.project import Project
-from app.models.resource import Resource
+from app.services import metrics
+from app.services.profiling import profiled
+from app.services.solvers import BUDGETED_SOLVERS, SOLVERS
 import logging
 from app.Files_Database.teams_db import (
     get_all_teams,
     get_team_by_id,
+    get_team_full,
+    get_org_teams_full,
     create_new_team,
     update_team,
     delete_team
@@ -25,6 +34,62 @@ def get_teams():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@teams_bp.route('/plan', methods=['GET'])
+@profiled
+def plan_teams():
+    """
+    Plans teams for an organization's upcoming projects without saving them:
+    GET /teams/plan?orgID=<org>&from=YYYY-MM-DD&days=<horizon>&solver=<backend>
+    """
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required."}), 400
+        try:
+            start_date = date.fromisoformat(request.args['from']) if request.args.get('from') else date.today()
+        except ValueError:
+            return jsonify({"error": "from must be a date (YYYY-MM-DD)."}), 400
+        horizon_days = request.args.get('days', current_app.config['PLANNING_HORIZON_DAYS'], type=int)
+        if horizon_days <= 0:
+            return jsonify({"error": "days must be a positive integer."}), 400
+        solver = request.args.get('solver')
+        if solver and solver not in SOLVERS:
+            return jsonify({"error": f"Unknown solver '{solver}'. Available solvers: {', '.join(sorted(SOLVERS))}"}), 400
+
+        plan = plan_portfolio(org_id, start_date, horizon_days, solver=solver)
+        return jsonify(plan), 200
+    except Exception as e:
+        logger.error(f"Error in plan_teams: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@teams_bp.route('/rebalance', methods=['POST'])
+@profiled
+def rebalance():
+    """
+    Moves people between an organization's teams and the bench to raise the total score:
+    POST /teams/rebalance?orgID=<org>&from=YYYY-MM-DD&time_budget_ms=<ms>&max_moves=<n>&apply=true
+    Only the resources whose team changes are returned; nothing is saved unless apply is set.
+    """
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required."}), 400
+        try:
+            start_date = date.fromisoformat(request.args['from']) if request.args.get('from') else date.today()
+        except ValueError:
+            return jsonify({"error": "from must be a date (YYYY-MM-DD)."}), 400
+        time_budget_ms = request.args.get('time_budget_ms', current_app.config['REBALANCE_TIME_BUDGET_MS'], type=float)
+        max_moves = request.args.get('max_moves', current_app.config['REBALANCE_MAX_MOVES'], type=int)
+        if time_budget_ms <= 0 or max_moves <= 0:
+            return jsonify({"error": "time_budget_ms and max_moves must be positive numbers."}), 400
+        apply = request.args.get('apply', 'false').lower() == 'true'
+
+        result = rebalance_teams(org_id, start_date, time_budget_ms, max_moves, apply=apply)
+        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"Error in rebalance: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @teams_bp.route('/<int:id>', methods=['GET'])
 def get_team(id):
     try:
@@ -33,6 +98,37 @@ def get_team(id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@teams_bp.route('/<int:id>/full', methods=['GET'])
+def get_team_full_route(id):
+    """
+    A team with its project, organization and member resources, in two queries:
+    GET /teams/<id>/full
+    """
+    try:
+        team = get_team_full(id)
+        return jsonify(team.serialize_full()), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        logger.error(f"Error in get_team_full: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@teams_bp.route('/full', methods=['GET'])
+def get_org_teams_full_route():
+    """
+    Every team of an organization as in GET /teams/<id>/full, in two queries:
+    GET /teams/full?orgID=<org>
+    """
+    try:
+        org_id = request.args.get('orgID')
+        if not org_id:
+            return jsonify({"error": "orgID is required."}), 400
+        teams = get_org_teams_full(org_id)
+        return jsonify([team.serialize_full() for team in teams]), 200
+    except Exception as e:
+        logger.error(f"Error in get_org_teams_full: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # @teams_bp.route('/', methods=['POST'])
 # def create_team():
 #     try:
@@ -43,6 +139,7 @@ def get_team(id):
 #         return jsonify({"error": str(e)}), 500
 
 @teams_bp.route('/<int:project_id>', methods=['POST'])
+@profiled
 def create_team(project_id):
     try:
         # Fetch the specific project
@@ -51,12 +148,24 @@ def create_team(project_id):
             return jsonify({"error": f"Project with ID {project_id} not found."}), 404
         logger.info(f"Processing project '{project.ProjectName}' (ID: {project.ProjectID})")
 
-        # Fetch resources available after the project's start date and not already assigned
-        resources = Resource.query.filter(
-            (Resource.AvailableDate == None) | 
-            (Resource.AvailableDate > project.ProjectStartDate),
-            Resource.OnBench == True  # Only resources that are on the bench
-        ).all()
+        # Optional per-request solver backend, otherwise the organization's default
+        solver = request.args.get('solver')
+        if solver and solver not in SOLVERS:
+            return jsonify({"error": f"Unknown solver '{solver}'. Available solvers: {', '.join(sorted(SOLVERS))}"}), 400
+
+        # Optional solve deadline; the best assignment found in time is returned with its optimality gap
+        time_budget_ms = request.args.get('time_budget_ms', type=float)
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            return jsonify({"error": "time_budget_ms must be a positive number."}), 400
+        if time_budget_ms is not None and solver and solver not in BUDGETED_SOLVERS:
+            # It would run to completion whatever the budget
+            return jsonify({"error": f"Solver '{solver}' does not take a time_budget_ms. "
+                                     f"Budgeted solvers: {', '.join(sorted(BUDGETED_SOLVERS))}"}), 400
+
+        # Fetch bench resources free for the whole project: candidates come from the
+        # in-memory availability index and are re-checked against the GiST-indexed column
+        with metrics.timer('team_formation_phase_seconds', phase='resource_query'):
+            resources = bench_candidates(project)
 
         logger.info(f"Found {len(resources)} available resources for project '{project.ProjectName}'.")
 
@@ -64,13 +173,26 @@ def create_team(project_id):
             logger.warning(f"No available resources for project '{project.ProjectName}'.")
             return jsonify({"error": 'No available resources for this project.'}), 400
 
-        # Call the team formation algorithm with the filtered resources
-        team_data, unfilled_roles = match_resources_to_projects(project_id, resources)
+        # Call the team formation algorithm with the filtered resources; large solves run
+        # in the solver pool, or are turned away while it is saturated
+        cost = estimate_cost(len(expand_roles([project])), len(resources))
+        try:
+            with admitted(cost) as solve:
+                team_data, unfilled_roles = match_resources_to_projects(
+                    project_id, resources, solver=solver, time_budget_ms=time_budget_ms, solve=solve
+                )
+        except AdmissionRejected as e:
+            response = jsonify({"error": str(e)})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 429
+        except SolveTimeout as e:
+            return jsonify({"error": f"{e}; retry with a time_budget_ms."}), 504
 
-        # Return only the TeamID
-        return jsonify({
-            "TeamID": team_data['TeamID']
-        }), 201
+        # Return only the TeamID, plus the solution quality for time-budgeted solves
+        response = {"TeamID": team_data['TeamID']}
+        if time_budget_ms is not None:
+            response["Solver"] = team_data['solver']
+        return jsonify(response), 201
     except Exception as e:
         logger.error(f"Error in create_team: {e}")
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,82 @@
+# api/weight_profiles.py
+
+from decimal import Decimal, InvalidOperation
+from flask import Blueprint, request, jsonify
+from app.Files_Database.weight_profiles_db import (
+    WEIGHT_FIELDS,
+    get_all_weight_profiles,
+    get_weight_profile_by_org,
+    create_new_weight_profile,
+    update_weight_profile,
+    delete_weight_profile
+)
+
+weight_profiles_bp = Blueprint('weight_profiles', __name__)
+
+MAX_WEIGHT = Decimal('1000')
+
+def invalid_weights(data):
+    """
+    Returns an error message if a weight in the payload is not a number between
+    0 and MAX_WEIGHT with at most two decimals, else None.
+    """
+    for field in WEIGHT_FIELDS:
+        if field not in data:
+            continue
+        try:
+            value = Decimal(str(data[field]))
+        except InvalidOperation:
+            return f"{field} must be a number."
+        if not value.is_finite() or value < 0 or value > MAX_WEIGHT or value != value.quantize(Decimal('0.01')):
+            return f"{field} must be between 0 and {MAX_WEIGHT} with at most two decimals."
+    return None
+
+@weight_profiles_bp.route('/', methods=['GET'])
+def get_weight_profiles():
+    try:
+        profiles = get_all_weight_profiles()
+        return jsonify([profile.serialize() for profile in profiles]), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@weight_profiles_bp.route('/<string:org_id>', methods=['GET'])
+def get_weight_profile(org_id):
+    try:
+        profile = get_weight_profile_by_org(org_id)
+        return jsonify(profile.serialize()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@weight_profiles_bp.route('/', methods=['POST'])
+def create_weight_profile():
+    try:
+        data = request.get_json()
+        if not data or 'OrgID' not in data:
+            return jsonify({"error": "OrgID is required."}), 400
+        error = invalid_weights(data)
+        if error:
+            return jsonify({"error": error}), 400
+        new_profile = create_new_weight_profile(data)
+        return jsonify(new_profile.serialize()), 201
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@weight_profiles_bp.route('/<string:org_id>', methods=['PUT'])
+def update_weight_profile_route(org_id):
+    try:
+        data = request.get_json() or {}
+        error = invalid_weights(data)
+        if error:
+            return jsonify({"error": error}), 400
+        updated_profile = update_weight_profile(org_id, data)
+        return jsonify(updated_profile.serialize()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@weight_profiles_bp.route('/<string:org_id>', methods=['DELETE'])
+def delete_weight_profile_route(org_id):
+    try:
+        result = delete_weight_profile(org_id)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,41 @@
+# app/cli.py
+
+import click
+
+from app.models import Organization
+from app.services.bulk_staffing import staff_all
+from app.services.solvers import SOLVERS
+
+
+def init_cli(app):
+    """
+    Registers the app's `flask` commands.
+    """
+
+    @app.cli.command('staff-all')
+    @click.option('--org', 'org_ids', multiple=True, help='Organization to staff (repeatable); all by default.')
+    @click.option('--chunk-size', type=click.IntRange(min=1), default=None,
+                  help='Projects per checkpoint (default STAFF_ALL_CHUNK_SIZE).')
+    @click.option('--solver', type=click.Choice(sorted(SOLVERS)), default=None,
+                  help="Assignment solver (default: the organization's).")
+    @click.option('--restart', is_flag=True, help='Abandon a run in progress instead of resuming it.')
+    def staff_all_command(org_ids, chunk_size, solver, restart):
+        """Staff every project without a team, resuming an interrupted run."""
+        chunk_size = chunk_size or app.config['STAFF_ALL_CHUNK_SIZE']
+        if not org_ids:
+            org_ids = [org_id for (org_id,) in Organization.query.with_entities(Organization.OrgID).order_by(Organization.OrgID)]
+
+        def progress(run):
+            click.echo(f"  {run.OrgID}: {run.ProjectsProcessed} project(s) processed, {run.TeamsCreated} team(s) created")
+
+        for org_id in org_ids:
+            click.echo(f"Staffing org {org_id}...")
+            summary = staff_all(org_id, chunk_size, solver=solver, restart=restart, progress=progress)
+            click.echo(
+                f"Run {summary['RunID']} ({summary['OrgID']}): {summary['ProjectsProcessed']} project(s), "
+                f"{summary['TeamsCreated']} team(s) created, {summary['ProjectsSkipped']} without available "
+                f"resources, {summary['ProjectsFailed']} failed; {summary['FilledRoles']} role(s) filled "
+                f"in {summary['elapsed_ms'] / 1000:.1f}s."
+            )
+            for role, count in sorted(summary['UnfilledRoles'].items()):
+                click.echo(f"  unfilled {role}: {count}")
@@ -1,12 +1,79 @@
 #config file for app folder
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()  # This loads environment variables from .env file into the environment
 
+# Prefer tmpfs so bench snapshots live in shared memory rather than on disk
+_DEFAULT_SNAPSHOT_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
 class Config:
     """Configuration class to encapsulate all configuration variables."""
     DATABASE_URL = os.getenv('DATABASE_URL')
     SECRET_KEY = os.getenv('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = DATABASE_URL  # SQLAlchemy configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # This should be set to False to disable signal handling
+
+    # Shared bench snapshot (one copy per host, mapped read-only by every worker)
+    BENCH_SNAPSHOT_DIR = os.getenv('BENCH_SNAPSHOT_DIR', os.path.join(_DEFAULT_SNAPSHOT_ROOT, 'team_matching'))
+    BENCH_SNAPSHOT_TTL = int(os.getenv('BENCH_SNAPSHOT_TTL', '300'))  # Seconds before a snapshot is rebuilt
+
+    # Statements slower than this are logged with their parameters and endpoint
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+
+    # Request profiling: on demand with ?profile=1 and the X-Profile-Secret header, or sampled
+    PROFILE_SECRET = os.getenv('PROFILE_SECRET')  # On-demand profiling is disabled when unset
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))  # Fraction of requests profiled to disk
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'team_matching_profiles'))
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', '30'))
+
+    # Cost matrix construction: columns are scored in blocks and the solver's matrix
+    # is kept within the memory budget by pruning candidates per role
+    COST_MATRIX_MEMORY_BUDGET_MB = int(os.getenv('COST_MATRIX_MEMORY_BUDGET_MB', '256'))
+    COST_MATRIX_BLOCK_SIZE = int(os.getenv('COST_MATRIX_BLOCK_SIZE', '1024'))
+    COST_MATRIX_TRACE_MEMORY = os.getenv('COST_MATRIX_TRACE_MEMORY', 'false').lower() == 'true'  # Report peak memory via tracemalloc
+
+    # Assignment solver backend (munkres, lap, greedy, auction, anytime, parallel_auction); ORG_SOLVERS is a JSON
+    # object mapping OrgID to a backend, e.g. '{"org_123": "lap"}'
+    DEFAULT_SOLVER = os.getenv('DEFAULT_SOLVER', 'munkres')
+    ORG_SOLVERS = os.getenv('ORG_SOLVERS', '{}')
+    AUCTION_WORKERS = int(os.getenv('AUCTION_WORKERS', '0'))  # Bidding processes for parallel_auction; 0 = CPU count
+
+    # Portfolio planning: days ahead GET /teams/plan looks for upcoming projects by default
+    PLANNING_HORIZON_DAYS = int(os.getenv('PLANNING_HORIZON_DAYS', '90'))
+
+    # Rebalancing of existing teams (POST /teams/rebalance): default search budget and move cap
+    REBALANCE_TIME_BUDGET_MS = float(os.getenv('REBALANCE_TIME_BUDGET_MS', '2000'))
+    REBALANCE_MAX_MOVES = int(os.getenv('REBALANCE_MAX_MOVES', '50'))
+
+    # What-if scenarios (POST /scenarios): simulation processes (0 = CPU count) and scenarios per request
+    SCENARIO_WORKERS = int(os.getenv('SCENARIO_WORKERS', '0'))
+    MAX_SCENARIOS = int(os.getenv('MAX_SCENARIOS', '50'))
+
+    # Bulk staffing (flask staff-all): projects staffed between two checkpoints
+    STAFF_ALL_CHUNK_SIZE = int(os.getenv('STAFF_ALL_CHUNK_SIZE', '50'))
+
+    # gunicorn workers (gunicorn.conf.py): organizations whose snapshot, availability index
+    # and scoring kernel are loaded before a new worker takes requests (0 = none)
+    WARMUP_ORGS = int(os.getenv('WARMUP_ORGS', '20'))
+
+    # POST /batch: sub-requests per batch, and threads running the sub-requests of parallel
+    # batches (each holds a pooled connection while it runs)
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '50'))
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '4'))
+
+    # Admission control for POST /teams: solves costing at least ADMISSION_INLINE_COST (roles x
+    # candidates) run in a pool of SOLVER_PROCESSES processes per web worker, with
+    # ADMISSION_QUEUE_DEPTH more waiting; beyond that the request gets a 429. Pooled solves
+    # are cancelled after SOLVE_TIMEOUT_S, queueing included.
+    ADMISSION_INLINE_COST = int(os.getenv('ADMISSION_INLINE_COST', '2000'))
+    SOLVER_PROCESSES = int(os.getenv('SOLVER_PROCESSES', '1'))
+    ADMISSION_QUEUE_DEPTH = int(os.getenv('ADMISSION_QUEUE_DEPTH', '2'))
+    SOLVE_TIMEOUT_S = float(os.getenv('SOLVE_TIMEOUT_S', '60'))
+
+    # GET /changes: page sizes, and how long a request tries for the feed lock before serving
+    # up to the last safe position this worker saw (see app.services.changes)
+    CHANGES_DEFAULT_LIMIT = int(os.getenv('CHANGES_DEFAULT_LIMIT', '500'))
+    CHANGES_MAX_LIMIT = int(os.getenv('CHANGES_MAX_LIMIT', '5000'))
+    CHANGES_LOCK_WAIT_MS = float(os.getenv('CHANGES_LOCK_WAIT_MS', '200'))
@@ -8,3 +8,7 @@ from app.models.organization import Organization
 from app.models.team import Team
 from app.models.resource import Resource
 from app.models.project import Project
+from app.models.weight_profile import WeightProfile
+from app.models.skill import Skill
+from app.models.staffing_run import StaffingRun
+from app.models.change import Tombstone
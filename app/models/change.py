@@ -0,0 +1,62 @@
+# app/models/change.py
+#
+# Change feed (GET /changes). Every insert or update of a resource, project or team
+# stamps the row's ChangeSeq from one shared sequence, through next_change_seq(), and
+# every delete leaves a Tombstone stamped the same way.
+#
+# next_change_seq() also takes CHANGE_FEED_LOCK_KEY as a shared transaction-level
+# advisory lock, held until the writer commits or rolls back. A reader holding it
+# exclusively knows every number drawn so far is committed or abandoned, so no
+# change below the sequence's last value can still appear (see app.services.changes).
+
+from app import db
+from sqlalchemy import BigInteger, Integer, String, DateTime, ForeignKey, DDL, Sequence, event, func, text
+
+CHANGE_FEED_LOCK_KEY = 7265840121
+
+change_seq = Sequence('change_seq', metadata=db.metadata)
+
+# plpgsql: the body is only resolved when called, after create_all has made the sequence
+_CREATE_NEXT_CHANGE_SEQ = DDL(f"""
+    CREATE OR REPLACE FUNCTION next_change_seq() RETURNS bigint LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock_shared({CHANGE_FEED_LOCK_KEY});
+        RETURN nextval('change_seq');
+    END
+    $$
+""")
+
+# The column defaults below call the function, so it must exist before the tables
+event.listen(db.metadata, 'before_create', _CREATE_NEXT_CHANGE_SEQ)
+event.listen(db.metadata, 'after_drop', DDL('DROP FUNCTION IF EXISTS next_change_seq()'))
+
+
+def change_seq_column():
+    """
+    A ChangeSeq column: stamped on insert and on every UPDATE of the row, ORM or Core.
+    """
+    return db.Column(BigInteger, nullable=False, server_default=text('next_change_seq()'),
+                     onupdate=func.next_change_seq())
+
+
+class Tombstone(db.Model):
+    __tablename__ = 'tombstones'
+
+    ChangeSeq = db.Column(BigInteger, primary_key=True, server_default=text('next_change_seq()'))
+    EntityType = db.Column(String(20), nullable=False)  # resource, project or team
+    EntityID = db.Column(Integer, nullable=False)
+    OrgID = db.Column(String, ForeignKey('organizations.OrgID', ondelete='CASCADE'), nullable=False)
+    DeletedAt = db.Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        db.Index('ix_tombstones_org_change_seq', 'OrgID', 'ChangeSeq'),
+    )
+
+    def serialize(self):
+        return {
+            'ChangeSeq': self.ChangeSeq,
+            'EntityType': self.EntityType,
+            'EntityID': self.EntityID,
+            'OrgID': self.OrgID,
+            'DeletedAt': self.DeletedAt.isoformat() if self.DeletedAt else None,
+        }
@@ -12,6 +12,7 @@ class Organization(db.Model):
     resources = db.relationship('Resource', back_populates='organization', cascade='all, delete-orphan')
     projects = db.relationship('Project', back_populates='organization', cascade='all, delete-orphan')
     teams = db.relationship('Team', back_populates='organization', cascade='all, delete-orphan')
+    weight_profile = db.relationship('WeightProfile', back_populates='organization', uselist=False, cascade='all, delete-orphan')
 
     def serialize(self):
         return {
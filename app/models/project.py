@@ -2,6 +2,7 @@ from app import db
 from sqlalchemy import Integer, String, Date, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from app.models.change import change_seq_column
 
 class Project(db.Model):
     __tablename__ = 'projects'
@@ -14,6 +15,11 @@ class Project(db.Model):
     ProjectStartDate = db.Column(Date, nullable=False)
     Technology = db.Column(ARRAY(String), nullable=False)  # Storing technologies as an array of strings
     Domain = db.Column(ARRAY(String), nullable=False)  # Storing domains as an array of strings
+    ChangeSeq = change_seq_column()  # Position in the change feed (see app.models.change)
+
+    __table_args__ = (
+        db.Index('ix_projects_org_change_seq', 'OrgID', 'ChangeSeq'),
+    )
     
     # Relationships
     organization = relationship('Organization', back_populates='projects')
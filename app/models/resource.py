@@ -1,7 +1,8 @@
 from app import db
-from sqlalchemy import Integer, String, Date, Numeric, ForeignKey, Boolean 
+from sqlalchemy import Integer, SmallInteger, String, Date, Numeric, ForeignKey, Boolean 
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, DATERANGE
+from app.models.change import change_seq_column
 
 class Resource(db.Model):
     __tablename__ = 'resources'
@@ -16,6 +17,19 @@ class Resource(db.Model):
     OrgID = db.Column(String, ForeignKey('organizations.OrgID'), nullable=False)
     TeamID = db.Column(Integer, ForeignKey('teams.TeamID'), nullable=True)  # Nullable if not assigned to a team
     OnBench = db.Column(Boolean, default=True)
+    # Days the resource is free to start new work: from AvailableDate and the end of
+    # its team's project onwards (see app.services.availability)
+    Availability = db.Column(DATERANGE, nullable=True)
+    # Skills as parallel arrays of skill IDs (ascending) and numeric levels, written
+    # with Skills (see app.services.skills)
+    SkillIDs = db.Column(ARRAY(Integer), nullable=True)
+    SkillLevels = db.Column(ARRAY(SmallInteger), nullable=True)
+    ChangeSeq = change_seq_column()  # Position in the change feed (see app.models.change)
+
+    __table_args__ = (
+        db.Index('ix_resources_availability', 'Availability', postgresql_using='gist'),
+        db.Index('ix_resources_org_change_seq', 'OrgID', 'ChangeSeq'),
+    )
     
     # Relationships
     organization = relationship('Organization', back_populates='resources')
@@ -0,0 +1,15 @@
+from app import db
+from sqlalchemy import Integer, String
+
+class Skill(db.Model):
+    __tablename__ = 'skills'
+
+    SkillID = db.Column(Integer, primary_key=True, autoincrement=True)
+    Name = db.Column(String(100), nullable=False)  # Canonical spelling, as first written
+    NormalizedName = db.Column(String(100), nullable=False, unique=True)  # Lowercased, whitespace collapsed
+
+    def serialize(self):
+        return {
+            'SkillID': self.SkillID,
+            'Name': self.Name,
+        }
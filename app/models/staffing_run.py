@@ -0,0 +1,46 @@
+from app import db
+from sqlalchemy import Integer, String, Date, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+class StaffingRun(db.Model):
+    __tablename__ = 'staffing_runs'
+
+    RunID = db.Column(Integer, primary_key=True, autoincrement=True)
+    OrgID = db.Column(String, ForeignKey('organizations.OrgID', ondelete='CASCADE'), nullable=False)
+    Status = db.Column(String(20), nullable=False, default='running')  # running, completed or abandoned
+    Solver = db.Column(String(50), nullable=True)  # None: the organization's configured solver
+    # Checkpoint: projects are staffed in (ProjectStartDate, ProjectID) order and a
+    # resumed run starts after the last one of the last committed chunk
+    LastProjectStartDate = db.Column(Date, nullable=True)
+    LastProjectID = db.Column(Integer, nullable=True)
+    ProjectsProcessed = db.Column(Integer, nullable=False, default=0)
+    TeamsCreated = db.Column(Integer, nullable=False, default=0)
+    ProjectsSkipped = db.Column(Integer, nullable=False, default=0)  # No available resources
+    ProjectsFailed = db.Column(Integer, nullable=False, default=0)
+    FilledRoles = db.Column(Integer, nullable=False, default=0)
+    UnfilledRoles = db.Column(JSONB, nullable=False, default=dict)  # Role -> positions left open
+    StartedAt = db.Column(DateTime, nullable=False, server_default=func.now())
+    UpdatedAt = db.Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    FinishedAt = db.Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # A single run in progress per organization
+        db.Index('ix_staffing_runs_running', 'OrgID', unique=True, postgresql_where=db.text("\"Status\" = 'running'")),
+    )
+
+    def serialize(self):
+        return {
+            'RunID': self.RunID,
+            'OrgID': self.OrgID,
+            'Status': self.Status,
+            'Solver': self.Solver,
+            'LastProjectID': self.LastProjectID,
+            'ProjectsProcessed': self.ProjectsProcessed,
+            'TeamsCreated': self.TeamsCreated,
+            'ProjectsSkipped': self.ProjectsSkipped,
+            'ProjectsFailed': self.ProjectsFailed,
+            'FilledRoles': self.FilledRoles,
+            'UnfilledRoles': self.UnfilledRoles,
+            'StartedAt': self.StartedAt.isoformat() if self.StartedAt else None,
+            'FinishedAt': self.FinishedAt.isoformat() if self.FinishedAt else None,
+        }
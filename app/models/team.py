@@ -1,6 +1,7 @@
 from app import db
 from sqlalchemy import Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
+from app.models.change import change_seq_column
 
 class Team(db.Model):
     __tablename__ = 'teams'
@@ -9,6 +10,11 @@ class Team(db.Model):
     ProjectID = db.Column(Integer, ForeignKey('projects.ProjectID'), nullable=False, unique=True)
     TotalResources = db.Column(Integer, nullable=False)
     OrgID = db.Column(String, ForeignKey('organizations.OrgID'), nullable=False)
+    ChangeSeq = change_seq_column()  # Position in the change feed (see app.models.change)
+
+    __table_args__ = (
+        db.Index('ix_teams_org_change_seq', 'OrgID', 'ChangeSeq'),
+    )
     
     # Relationships
     project = relationship('Project', back_populates='team')
@@ -22,3 +28,13 @@ class Team(db.Model):
             'TotalResources': self.TotalResources,
             'OrgID': self.OrgID,
         }
+
+    # The team with its project, organization and members, for the full team views;
+    # load them eagerly (see teams_db.get_team_full) or each one costs a query
+    def serialize_full(self):
+        return {
+            **self.serialize(),
+            'Project': self.project.serialize() if self.project else None,
+            'Organization': self.organization.serialize() if self.organization else None,
+            'Resources': [resource.serialize() for resource in sorted(self.resources, key=lambda r: r.ResourceID)],
+        }
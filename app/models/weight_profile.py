@@ -0,0 +1,30 @@
+from app import db
+from sqlalchemy import Integer, String, Numeric, DateTime, ForeignKey, func
+from sqlalchemy.orm import relationship
+
+class WeightProfile(db.Model):
+    __tablename__ = 'weight_profiles'
+
+    ProfileID = db.Column(Integer, primary_key=True, autoincrement=True)
+    OrgID = db.Column(String, ForeignKey('organizations.OrgID', ondelete='CASCADE'), nullable=False, unique=True)
+    RateWeight = db.Column(Numeric(6, 2), nullable=False, default=0.5)
+    ExperienceWeight = db.Column(Numeric(6, 2), nullable=False, default=1.0)
+    SkillLevelWeight = db.Column(Numeric(6, 2), nullable=False, default=1.0)
+    AffinityWeight = db.Column(Numeric(6, 2), nullable=False, default=1.0)  # Domain/technology overlap with the project
+    Version = db.Column(Integer, nullable=False, default=1)  # Bumped on every change; compiled scoring kernels are cached per version
+    UpdatedAt = db.Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    organization = relationship('Organization', back_populates='weight_profile')
+
+    def serialize(self):
+        return {
+            'ProfileID': self.ProfileID,
+            'OrgID': self.OrgID,
+            'RateWeight': str(self.RateWeight),
+            'ExperienceWeight': str(self.ExperienceWeight),
+            'SkillLevelWeight': str(self.SkillLevelWeight),
+            'AffinityWeight': str(self.AffinityWeight),
+            'Version': self.Version,
+            'UpdatedAt': self.UpdatedAt.isoformat() if self.UpdatedAt else None,
+        }
@@ -0,0 +1,211 @@
+# app/services/admission.py
+#
+# Admission control for team formation (POST /teams/<project_id>). A solve is priced
+# before its cost matrix is built, as roles x candidates. Cheap solves run in the
+# request thread; the others run in this worker's solver pool, a bounded set of
+# processes, so a few large solves cannot hold the GIL that CRUD requests need. Once
+# the pool's processes and queue places are taken, further solves are rejected with a
+# Retry-After instead of piling up on request threads.
+
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+
+from flask import current_app
+
+from app.services import metrics
+from app.services.solvers import solve_assignment
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_GRACE_S = 2  # Past its deadline, a solve that ignored the alarm gets this long before the pool is recycled
+
+_state = {'pid': None, 'pool': None, 'pending': 0, 'solve_seconds': None}
+_lock = threading.Lock()
+_pool_pids = {}  # pool -> queue its processes report their pid on (see _report_pid)
+
+
+class AdmissionRejected(Exception):
+    """
+    The solver pool is saturated; retry after retry_after seconds.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SolveTimeout(Exception):
+    """
+    A solve did not finish within SOLVE_TIMEOUT_S and was cancelled.
+    """
+
+
+def estimate_cost(roles, candidates):
+    """
+    The admission price of a solve: the size of its cost matrix before pruning.
+    """
+    return roles * candidates
+
+
+def _check_pid():
+    # A forked web worker starts with no pool and nothing pending (under _lock)
+    if _state['pid'] != os.getpid():
+        _state.update(pid=os.getpid(), pool=None, pending=0, solve_seconds=None)
+        _pool_pids.clear()
+
+
+def _report_pid(pids):
+    # Pool initializer: lets _recycle reach the process without the executor's internals
+    pids.put(os.getpid())
+
+
+def _get_pool(processes):
+    with _lock:
+        _check_pid()
+        if _state['pool'] is None:
+            # forkserver: solver processes never inherit the web worker's threads, locks or DB connections
+            context = multiprocessing.get_context('forkserver')
+            pids = context.SimpleQueue()
+            _state['pool'] = ProcessPoolExecutor(
+                max_workers=processes, mp_context=context, initializer=_report_pid, initargs=(pids,)
+            )
+            _pool_pids[_state['pool']] = pids
+        return _state['pool']
+
+
+def _recycle(pool, reason):
+    """
+    Replaces the pool and kills its processes: the only way to stop a solve stuck
+    in native code. Solves still queued on it fail and are told to retry.
+    """
+    with _lock:
+        if _state['pool'] is pool:
+            _state['pool'] = None
+        pids = _pool_pids.pop(pool, None)
+    # ProcessPoolExecutor cannot stop a running call; terminate its processes directly.
+    # They live until the pool is shut down, so their pids have not been reused
+    while pids is not None and not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning(f"Recycled the solver pool: {reason}.")
+
+
+@atexit.register
+def _shutdown_pool():
+    if _state['pool'] is not None and _state['pid'] == os.getpid():
+        _state['pool'].shutdown(wait=False, cancel_futures=True)
+
+
+def _retry_after(processes):
+    # Time for the pool to work through what is pending, from recent solve times (under _lock)
+    solve_seconds = _state['solve_seconds'] or 1.0
+    return max(1, math.ceil(solve_seconds * _state['pending'] / processes))
+
+
+def _on_alarm(signum, frame):
+    raise SolveTimeout("Solve exceeded its deadline")
+
+
+def _solve_in_child(cost_matrix, solver, deadline, options):
+    """
+    Runs in a solver process: solves with an alarm set for the deadline, which
+    interrupts the (pure Python) solvers between bytecodes.
+    """
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise SolveTimeout("Solve waited in the queue past its deadline")
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        report = {}
+        indexes = solve_assignment(cost_matrix, solver, report=report, **options)
+        return indexes, report
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def solve_isolated(cost_matrix, solver, processes, timeout_s, report=None, **options):
+    """
+    solve_assignment in the solver pool, within timeout_s of being submitted
+    (queueing included). A solve past its deadline is cancelled by an alarm in
+    its process or, failing that, by recycling the pool.
+
+    Solver processes have no app context, so parallel_auction would otherwise
+    start a bidding pool of one process per CPU inside each of them, outside the
+    pool's bound and out of reach of _recycle: it bids in the solver process.
+
+    Raises:
+        SolveTimeout: If the solve did not finish in time.
+        AdmissionRejected: If the pool was recycled under a queued solve.
+    """
+    if not cost_matrix or not cost_matrix[0]:
+        return []
+    options = dict(options, workers=1)
+    pool = _get_pool(processes)
+    started = time.perf_counter()
+    try:
+        future = pool.submit(_solve_in_child, cost_matrix, solver, time.time() + timeout_s, options)
+        indexes, child_report = future.result(timeout=timeout_s + TIMEOUT_GRACE_S)
+    except FutureTimeout:
+        _recycle(pool, "a solve overran its deadline")
+        raise SolveTimeout(f"Solve exceeded {timeout_s}s and was cancelled")
+    except BrokenProcessPool:
+        _recycle(pool, "a solver process died")
+        raise AdmissionRejected("The solver pool was restarted; retry the request", retry_after=1)
+    elapsed = time.perf_counter() - started
+    with _lock:
+        previous = _state['solve_seconds']
+        _state['solve_seconds'] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+    if report is not None:
+        report.update(child_report)
+    return indexes
+
+
+@contextmanager
+def admitted(cost):
+    """
+    Admits a solve of the given cost (see estimate_cost) and yields the function
+    to solve it with, called like solve_assignment: solve_assignment itself below
+    ADMISSION_INLINE_COST, else solve_isolated in the solver pool, holding one of
+    its SOLVER_PROCESSES + ADMISSION_QUEUE_DEPTH places until the block exits.
+
+    Raises:
+        AdmissionRejected: If every place is taken.
+    """
+    config = current_app.config
+    if cost < config['ADMISSION_INLINE_COST']:
+        metrics.observe('team_formation_admission_cost', cost, decision='inline')
+        yield solve_assignment
+        return
+
+    processes = config['SOLVER_PROCESSES']
+    with _lock:
+        _check_pid()
+        if _state['pending'] >= processes + config['ADMISSION_QUEUE_DEPTH']:
+            retry_after = _retry_after(processes)
+            logger.warning(f"Rejected a solve of cost {cost}: {_state['pending']} solve(s) pending.")
+            metrics.observe('team_formation_admission_cost', cost, decision='rejected')
+            raise AdmissionRejected("Too many team formations in progress; retry later", retry_after=retry_after)
+        _state['pending'] += 1
+        pid = _state['pid']
+    metrics.observe('team_formation_admission_cost', cost, decision='pool')
+    try:
+        yield partial(solve_isolated, processes=processes, timeout_s=config['SOLVE_TIMEOUT_S'])
+    finally:
+        with _lock:
+            if _state['pid'] == pid:
+                _state['pending'] -= 1
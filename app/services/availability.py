@@ -0,0 +1,124 @@
+# app/services/availability.py
+
+from datetime import timedelta
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import Range
+
+from app.models import db
+from app.models import Resource
+from app.services.bench_snapshot import get_bench_snapshot
+from app.services.intervals import AvailabilityIndex, FAR_PAST, FAR_FUTURE
+
+logger = logging.getLogger(__name__)
+
+# Free from the later of AvailableDate and the end of the team's project, with no end.
+# A resource off the bench with neither a team nor an AvailableDate is never free.
+_REFRESH_SQL = """
+    UPDATE resources AS r SET "Availability" = CASE
+        WHEN r."TeamID" IS NULL AND r."AvailableDate" IS NULL AND r."OnBench" IS NOT TRUE
+            THEN 'empty'::daterange
+        ELSE daterange(GREATEST(r."AvailableDate", (
+            SELECT p."ProjectStartDate" + p."NumberOfDays"
+            FROM teams AS t JOIN projects AS p ON p."ProjectID" = t."ProjectID"
+            WHERE t."TeamID" = r."TeamID"
+        )), NULL)
+    END
+    WHERE r."OrgID" = :org_id
+"""
+
+# Mirrors of the Availability column by this worker, keyed by org id, with the
+# bench snapshot generation they were built for
+_indexes = {}
+
+
+def refresh_availability(org_id, resource_ids=None, team_id=None):
+    """
+    Recomputes the Availability range of an organization's resources in one
+    UPDATE, optionally only for the given resources or the members of a team.
+    Runs in the caller's transaction; commit and invalidate the bench snapshot
+    afterwards so other workers rebuild their mirror.
+    """
+    statement = _REFRESH_SQL
+    params = {'org_id': org_id}
+    if resource_ids is not None:
+        statement += ' AND r."ResourceID" = ANY(:resource_ids)'
+        params['resource_ids'] = list(resource_ids)
+    if team_id is not None:
+        statement += ' AND r."TeamID" = :team_id'
+        params['team_id'] = team_id
+    db.session.execute(text(statement), params)
+
+
+def availability_window(start_date, days):
+    """
+    The days a project starting on start_date occupies its team, as a date range.
+    """
+    return Range(start_date, start_date + timedelta(days=max(days or 0, 1)), bounds='[)')
+
+
+def build_availability_index(org_id):
+    """
+    Loads the Availability ranges of an organization into an AvailabilityIndex.
+    """
+    index = AvailabilityIndex()
+    rows = db.session.query(Resource.ResourceID, Resource.Availability).filter(
+        Resource.OrgID == org_id, Resource.Availability != None
+    ).all()
+    entries = []
+    for resource_id, availability in rows:
+        if availability.isempty:
+            continue
+        # Ranges are stored canonical [lower, upper); None is unbounded
+        lower = availability.lower.toordinal() if availability.lower else FAR_PAST
+        upper = availability.upper.toordinal() if availability.upper else FAR_FUTURE
+        entries.append((lower, upper, resource_id))
+    for lower, upper, resource_id in sorted(entries):  # Appends in order
+        index.add(resource_id, lower, upper)
+    return index
+
+
+def get_availability_index(org_id):
+    """
+    Returns this worker's in-memory mirror of an organization's availability.
+
+    The mirror follows the bench snapshot: writes that change availability
+    invalidate the snapshot, and the mirror is rebuilt when a new snapshot
+    generation is published.
+    """
+    snapshot = get_bench_snapshot(org_id)
+    key = (snapshot.generation, snapshot.created_at)
+    cached = _indexes.get(org_id)
+    if cached is None or cached[0] != key:
+        cached = (key, build_availability_index(org_id))
+        _indexes[org_id] = cached
+        logger.info(f"Built availability index for org '{org_id}' ({len(cached[1])} resources).")
+    return cached[1]
+
+
+def available_resource_ids(org_id, start_date, end_date):
+    """
+    Ids of the organization's resources free over [start_date, end_date), from the mirror.
+    """
+    return get_availability_index(org_id).covering(start_date.toordinal(), end_date.toordinal())
+
+
+def bench_candidates(project, index=None):
+    """
+    Bench resources free for the whole project. Candidates come from the in-memory
+    availability index (this worker's mirror unless one is given) and are
+    re-checked against the GiST-indexed column, so a stale index only costs a
+    longer ID list.
+    """
+    window = availability_window(project.ProjectStartDate, project.NumberOfDays)
+    if index is None:
+        index = get_availability_index(project.OrgID)
+    candidate_ids = index.covering(window.lower.toordinal(), window.upper.toordinal())
+    if not candidate_ids:
+        return []
+    return Resource.query.filter(
+        Resource.ResourceID.in_(candidate_ids),
+        Resource.Availability.contains(window),
+        Resource.OnBench == True  # Only resources that are on the bench
+    ).all()
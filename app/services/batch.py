@@ -0,0 +1,145 @@
+# app/services/batch.py
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g
+from sqlalchemy import text
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app import db
+from app.services.changes import pin_high_water
+
+logger = logging.getLogger(__name__)
+
+_executor = {'pid': None, 'pool': None}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    # One pool per process (a forked worker must not use its parent's threads)
+    with _executor_lock:
+        if _executor['pid'] != os.getpid():
+            _executor['pool'] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch')
+            _executor['pid'] = os.getpid()
+        return _executor['pool']
+
+
+def validate_batch(sub_requests, max_requests):
+    """
+    Checks the sub-requests of a batch and returns them as (path, headers) pairs.
+
+    Raises:
+        ValueError: If the batch is empty, too large, or a sub-request is not a GET
+            of an absolute path.
+    """
+    if not isinstance(sub_requests, list) or not sub_requests:
+        raise ValueError("requests must be a non-empty list.")
+    if len(sub_requests) > max_requests:
+        raise ValueError(f"A batch takes at most {max_requests} requests.")
+    validated = []
+    for position, sub_request in enumerate(sub_requests):
+        if not isinstance(sub_request, dict) or not isinstance(sub_request.get('path'), str) \
+                or not sub_request['path'].startswith('/'):
+            raise ValueError(f"Request {position} needs a path starting with '/'.")
+        if sub_request.get('method', 'GET').upper() != 'GET':
+            # Write handlers commit their own transactions, which would end the batch's snapshot
+            raise ValueError(f"Request {position}: only GET requests can be batched.")
+        headers = sub_request.get('headers') or {}
+        if not isinstance(headers, dict):
+            raise ValueError(f"Request {position}: headers must be an object.")
+        validated.append((sub_request['path'], headers))
+    return validated
+
+
+def _dispatch(app, path, headers):
+    """
+    Runs one sub-request through the app's routing and view, in the current app
+    context (so on its database session), and returns its status and body.
+    """
+    builder = EnvironBuilder(path=path, method='GET', headers=headers)
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    with app.request_context(environ):
+        try:
+            response = app.make_response(app.dispatch_request())
+        except HTTPException as e:
+            return {'status': e.code, 'body': {'error': e.description}}
+        except Exception as e:
+            logger.error(f"Error in batched request {path}: {e}")
+            return {'status': 500, 'body': {'error': str(e)}}
+    body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+    return {'status': response.status_code, 'body': body}
+
+
+def _begin_snapshot():
+    db.session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+
+
+def _run_group(app, snapshot_id, change_feed_high_water, items):
+    """
+    Runs sub-requests on a worker thread, in a transaction importing the batch's snapshot.
+
+    Returns:
+        tuple: ([(position, response), ...], statement count, DB time).
+    """
+    with app.app_context():
+        if change_feed_high_water is not None:
+            g.change_feed_high_water = change_feed_high_water
+        try:
+            _begin_snapshot()
+            db.session.execute(text('SET TRANSACTION SNAPSHOT :snapshot'), {'snapshot': snapshot_id})
+            responses = [(position, _dispatch(app, path, headers)) for position, (path, headers) in items]
+            return responses, g.get('db_queries', 0), g.get('db_time', 0.0)
+        finally:
+            db.session.remove()
+
+
+def run_batch(sub_requests, parallel=False):
+    """
+    Runs GET sub-requests against the app's blueprints and returns their responses, in order.
+
+    All of them read the same database snapshot: they share one REPEATABLE READ
+    transaction on the request's session, or, with parallel, are spread over
+    BATCH_WORKERS threads whose transactions import that transaction's snapshot
+    (pg_export_snapshot).
+
+    Args:
+        sub_requests (list): Validated (path, headers) pairs (see validate_batch).
+        parallel (bool): Run the sub-requests concurrently.
+
+    Returns:
+        list: {"status": <HTTP status>, "body": <JSON body or text>} per sub-request.
+    """
+    app = current_app._get_current_object()
+    workers = min(app.config['BATCH_WORKERS'], len(sub_requests))
+    if any(path.startswith('/changes') for path, _headers in sub_requests):
+        # Read the change feed up to a position taken before the snapshot, which sees all of it
+        pin_high_water(app.config['CHANGES_LOCK_WAIT_MS'])
+    try:
+        _begin_snapshot()
+        if not parallel or workers <= 1:
+            return [_dispatch(app, path, headers) for path, headers in sub_requests]
+
+        snapshot_id = db.session.execute(text('SELECT pg_export_snapshot()')).scalar()
+        items = list(enumerate(sub_requests))
+        groups = [items[start::workers] for start in range(workers)]
+        high_water = g.get('change_feed_high_water')
+        futures = [_get_executor(app.config['BATCH_WORKERS']).submit(_run_group, app, snapshot_id, high_water, group)
+                   for group in groups]
+        responses = [None] * len(sub_requests)
+        for future in futures:
+            group_responses, queries, db_time = future.result()
+            for position, response in group_responses:
+                responses[position] = response
+            # Report the workers' statements in this request's X-DB-* headers
+            g.db_queries = g.get('db_queries', 0) + queries
+            g.db_time = g.get('db_time', 0.0) + db_time
+        return responses
+    finally:
+        db.session.rollback()  # Read-only: end the snapshot's transaction
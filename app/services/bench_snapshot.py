@@ -0,0 +1,303 @@
+# app/services/bench_snapshot.py
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import current_app
+
+from app.models import Resource
+from app.services.utils import ScoreFeatures, affinity_mask, resource_score_features
+
+logger = logging.getLogger(__name__)
+
+# File layout: fixed header, JSON metadata, then 8-byte aligned typed arrays.
+MAGIC = b'BENCHSN1'
+_HEADER = struct.Struct('<8sQ')  # magic, length of the JSON metadata block
+_ALIGN = 8
+
+# (name, array typecode) of every feature array stored in a snapshot.
+# Rows are sorted by ResourceID so lookups can bisect the mapped ids directly.
+SECTIONS = (
+    ('resource_ids', 'q'),
+    ('rate_cents', 'q'),             # Resource.Rate * 100
+    ('experience_milliyears', 'q'),  # Sum of PastJobTitles years * 1000
+    ('available_ordinals', 'q'),     # AvailableDate.toordinal(), 0 when unset
+    ('skill_offsets', 'q'),          # CSR row offsets into skill_codes/skill_levels (n + 1)
+    ('skill_codes', 'q'),            # Index into the metadata 'skills' vocabulary
+    ('skill_levels', 'b'),           # 1 beginner, 2 intermediate, 3 expert
+)
+
+# Snapshots mapped by this worker, keyed by org id
+_mapped = {}
+
+
+def _snapshot_dir():
+    directory = current_app.config['BENCH_SNAPSHOT_DIR']
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _snapshot_paths(org_id):
+    """
+    Returns the (snapshot, stale marker, lock) file paths for an organization.
+    """
+    safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(org_id))
+    base = os.path.join(_snapshot_dir(), f"bench-{safe_id}")
+    return f"{base}.snap", f"{base}.stale", f"{base}.lock"
+
+
+@contextmanager
+def _refresh_lock(lock_path, blocking):
+    """
+    Host-wide advisory lock so a single process rebuilds a snapshot at a time.
+    Yields True if the lock was acquired.
+    """
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _is_stale(snapshot_path, marker_path):
+    try:
+        age = time.time() - os.stat(snapshot_path).st_mtime
+    except FileNotFoundError:
+        return True
+    return os.path.exists(marker_path) or age > current_app.config['BENCH_SNAPSHOT_TTL']
+
+
+def _resource_features(resource, skill_codes):
+    """
+    Extracts the fixed-point numeric features of a resource.
+    """
+    features = resource_score_features(resource)
+    available = resource.AvailableDate.toordinal() if resource.AvailableDate else 0
+    skills = [
+        (skill_codes.setdefault(name, len(skill_codes)), level)
+        for name, level in sorted(features.skill_levels.items())
+    ]
+    return features.rate_cents, features.experience, available, skills
+
+
+def write_bench_snapshot(path, org_id, resources, generation):
+    """
+    Serializes the features of the given resources into a snapshot file.
+
+    The file is written next to its final location and moved into place with
+    os.replace, so readers always see either the previous or the new generation.
+
+    Args:
+        path (str): Destination snapshot path.
+        org_id (str): Organization the bench belongs to.
+        resources (list): Resource objects on the bench.
+        generation (int): Generation number recorded in the metadata.
+    """
+    skill_codes = {}
+    arrays = {name: array(typecode) for name, typecode in SECTIONS}
+    arrays['skill_offsets'].append(0)
+    for resource in sorted(resources, key=lambda r: r.ResourceID):
+        rate_cents, experience, available, skills = _resource_features(resource, skill_codes)
+        arrays['resource_ids'].append(resource.ResourceID)
+        arrays['rate_cents'].append(rate_cents)
+        arrays['experience_milliyears'].append(experience)
+        arrays['available_ordinals'].append(available)
+        for code, level in skills:
+            arrays['skill_codes'].append(code)
+            arrays['skill_levels'].append(level)
+        arrays['skill_offsets'].append(len(arrays['skill_codes']))
+
+    vocabulary = sorted(skill_codes, key=skill_codes.get)
+    metadata = {
+        'org_id': org_id,
+        'generation': generation,
+        'created_at': time.time(),
+        'count': len(arrays['resource_ids']),
+        'skills': vocabulary,
+        'sections': {},
+    }
+
+    # Offsets depend on the metadata length, which depends on the offsets; the
+    # width of the numbers settles after a couple of passes.
+    encoded = b''
+    for _ in range(3):
+        offset = _HEADER.size + len(encoded)
+        for name, _typecode in SECTIONS:
+            offset += -offset % _ALIGN
+            metadata['sections'][name] = [offset, len(arrays[name])]
+            offset += len(arrays[name]) * arrays[name].itemsize
+        encoded = json.dumps(metadata, separators=(',', ':')).encode()
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for name, _typecode in SECTIONS:
+            offset = metadata['sections'][name][0]
+            f.write(b'\0' * (offset - f.tell()))
+            arrays[name].tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BenchSnapshot:
+    """
+    Read-only, zero-copy view of a published bench snapshot.
+
+    Every feature array is a memoryview over a shared mapping of the snapshot
+    file, so the pages are shared by all workers on the host.
+    """
+
+    def __init__(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            self.inode = os.fstat(fd).st_ino
+            self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        magic, metadata_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a bench snapshot")
+        metadata = json.loads(self._mmap[_HEADER.size:_HEADER.size + metadata_length])
+        self.org_id = metadata['org_id']
+        self.generation = metadata['generation']
+        self.created_at = metadata['created_at']
+        self.skills = metadata['skills']
+
+        view = memoryview(self._mmap)
+        for name, typecode in SECTIONS:
+            offset, length = metadata['sections'][name]
+            itemsize = array(typecode).itemsize
+            setattr(self, name, view[offset:offset + length * itemsize].cast(typecode))
+
+    def __len__(self):
+        return len(self.resource_ids)
+
+    def index_of(self, resource_id):
+        """
+        Returns the row of a resource in the snapshot, or None if it is not on the bench.
+        """
+        index = bisect_left(self.resource_ids, resource_id)
+        if index < len(self.resource_ids) and self.resource_ids[index] == resource_id:
+            return index
+        return None
+
+    def skills_for(self, index):
+        """
+        Returns the skills of the resource at the given row as {skill name: numeric level}.
+        """
+        start, end = self.skill_offsets[index], self.skill_offsets[index + 1]
+        return {
+            self.skills[self.skill_codes[i]]: self.skill_levels[i]
+            for i in range(start, end)
+        }
+
+    def score_features(self, resource):
+        """
+        The ScoreFeatures of a resource (see utils.resource_score_features) with the
+        rate, experience and skill levels published in the snapshot, or None if the
+        resource is not in it. The affinity mask is built from the resource itself:
+        its bits are numbered per process.
+        """
+        index = self.index_of(resource.ResourceID)
+        if index is None:
+            return None
+        skills = list(resource.Skills) if isinstance(resource.Skills, dict) else []
+        return ScoreFeatures(
+            self.rate_cents[index], self.experience_milliyears[index], skills,
+            self.skills_for(index), affinity_mask(resource.Domain, skills)
+        )
+
+
+def refresh_bench_snapshot(org_id, force=False, blocking=False):
+    """
+    Rebuilds the bench snapshot of an organization.
+
+    Only one process per host rebuilds at a time; the others keep using the
+    previous generation (or wait for the rebuild when blocking is set).
+
+    Returns:
+        bool: True if this call published a new generation.
+    """
+    snapshot_path, marker_path, lock_path = _snapshot_paths(org_id)
+    with _refresh_lock(lock_path, blocking) as acquired:
+        if not acquired:
+            return False
+        # Another process may have refreshed while we were waiting for the lock
+        if not force and not _is_stale(snapshot_path, marker_path):
+            return False
+
+        generation = 1
+        if os.path.exists(snapshot_path):
+            try:
+                generation = BenchSnapshot(snapshot_path).generation + 1
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Replacing unreadable bench snapshot {snapshot_path}: {e}")
+
+        # Clear the marker before reading so writes made during the rebuild re-mark it
+        try:
+            os.unlink(marker_path)
+        except FileNotFoundError:
+            pass
+
+        started = time.perf_counter()
+        resources = Resource.query.filter_by(OrgID=org_id, OnBench=True).all()
+        write_bench_snapshot(snapshot_path, org_id, resources, generation)
+        logger.info(
+            f"Published bench snapshot generation {generation} for org '{org_id}' "
+            f"({len(resources)} resources) in {time.perf_counter() - started:.3f}s."
+        )
+        return True
+
+
+def invalidate_bench_snapshot(org_id):
+    """
+    Marks the snapshot of an organization as stale so the next reader rebuilds it.
+    """
+    _snapshot_path, marker_path, _lock_path = _snapshot_paths(org_id)
+    with open(marker_path, 'a'):
+        pass
+
+
+def get_bench_snapshot(org_id):
+    """
+    Returns the current bench snapshot of an organization, mapping it on first use.
+
+    Args:
+        org_id (str): The organization ID.
+
+    Returns:
+        BenchSnapshot: The mapped snapshot for the current generation.
+    """
+    snapshot_path, marker_path, _lock_path = _snapshot_paths(org_id)
+    if _is_stale(snapshot_path, marker_path):
+        refresh_bench_snapshot(org_id)
+    if not os.path.exists(snapshot_path):
+        # First publication is running in another process: wait for it
+        refresh_bench_snapshot(org_id, blocking=True)
+
+    inode = os.stat(snapshot_path).st_ino
+    snapshot = _mapped.get(org_id)
+    if snapshot is None or snapshot.inode != inode:
+        snapshot = BenchSnapshot(snapshot_path)
+        _mapped[org_id] = snapshot
+    return snapshot
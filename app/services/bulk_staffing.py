@@ -0,0 +1,140 @@
+# app/services/bulk_staffing.py
+
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from app.models import db
+from app.models import Project, Team, StaffingRun
+from app.services.bench_snapshot import get_bench_snapshot
+from app.services.availability import bench_candidates, get_availability_index
+from app.services.team_formation import match_resources_to_projects
+
+logger = logging.getLogger(__name__)
+
+
+def _pending_projects(org_id, after, limit):
+    """
+    The next projects without a team of an organization, in (ProjectStartDate,
+    ProjectID) order, after the given (start date, ID) cursor.
+    """
+    query = Project.query.outerjoin(Team, Team.ProjectID == Project.ProjectID).filter(
+        Project.OrgID == org_id,
+        Team.TeamID == None
+    )
+    if after is not None:
+        query = query.filter(tuple_(Project.ProjectStartDate, Project.ProjectID) > tuple_(*after))
+    return query.order_by(Project.ProjectStartDate, Project.ProjectID).limit(limit).all()
+
+
+def start_or_resume_run(org_id, solver=None, restart=False):
+    """
+    Returns the organization's run in progress, or a new one. With restart set,
+    a run in progress is abandoned and a new one starts from the first project.
+    """
+    run = StaffingRun.query.filter_by(OrgID=org_id, Status='running').first()
+    if run is not None and restart:
+        run.Status = 'abandoned'
+        run.FinishedAt = datetime.utcnow()
+        db.session.flush()
+        logger.info(f"Abandoned staffing run {run.RunID} of org {org_id}.")
+        run = None
+    if run is None:
+        run = StaffingRun(OrgID=org_id, Status='running', Solver=solver, ProjectsProcessed=0, TeamsCreated=0,
+                          ProjectsSkipped=0, ProjectsFailed=0, FilledRoles=0, UnfilledRoles={})
+        db.session.add(run)
+        logger.info(f"Starting a staffing run for org {org_id}.")
+    else:
+        logger.info(f"Resuming staffing run {run.RunID} of org {org_id} after project {run.LastProjectID}.")
+    db.session.commit()
+    return run
+
+
+def staff_all(org_id, chunk_size, solver=None, restart=False, progress=None):
+    """
+    Staffs every project of an organization that has no team, like POST
+    /teams/<project_id> for each of them, in one pass.
+
+    Projects are taken in start date order, chunk_size at a time. After each
+    chunk the run's counters and checkpoint are committed to staffing_runs, so
+    a run that crashes resumes after the last committed chunk (projects of an
+    interrupted chunk that were staffed have a team and are not picked again).
+    Candidates come from one availability index for the whole run rather than
+    one per team; each team's commit still re-checks them in the database. They
+    are scored from one bench snapshot too: the features it publishes do not
+    change with staffing, and bench_candidates leaves out whoever the run staffed.
+
+    Args:
+        org_id (str): Organization to staff.
+        chunk_size (int): Projects per checkpoint.
+        solver (str, optional): Assignment solver backend (see app.services.solvers).
+        restart (bool): Abandon a run in progress instead of resuming it.
+        progress (callable, optional): Called with the run after each chunk.
+
+    Returns:
+        dict: The run's summary (see StaffingRun.serialize), with elapsed_ms.
+    """
+    started = time.perf_counter()
+    run = start_or_resume_run(org_id, solver, restart)
+    solver = run.Solver
+    index = get_availability_index(org_id)
+    snapshot = get_bench_snapshot(org_id)
+    after = (run.LastProjectStartDate, run.LastProjectID) if run.LastProjectID is not None else None
+
+    while True:
+        # Plain values: match_resources_to_projects commits (and rolls back on failure)
+        projects = [(project.ProjectID, project.ProjectName) for project in _pending_projects(org_id, after, chunk_size)]
+        if not projects:
+            break
+        processed = teams = skipped = failed = filled = 0
+        unfilled = {}
+        for project_id, project_name in projects:
+            processed += 1
+            project = Project.query.get(project_id)
+            after = (project.ProjectStartDate, project_id)
+            try:
+                resources = bench_candidates(project, index)
+                if not resources:
+                    skipped += 1
+                    for req in project.RequiredResources:
+                        unfilled[req['Role']] = unfilled.get(req['Role'], 0) + req['Quantity']
+                    logger.warning(f"No available resources for project '{project_name}'.")
+                    continue
+                team_data, unfilled_roles = match_resources_to_projects(project_id, resources, solver=solver, snapshot=snapshot)
+                teams += 1
+                filled += team_data['TotalResources']
+                for role, count in unfilled_roles.items():
+                    unfilled[role] = unfilled.get(role, 0) + count
+            except Exception as e:
+                db.session.rollback()
+                failed += 1
+                logger.error(f"Staffing project '{project_name}' failed: {e}")
+
+        # Checkpoint the chunk
+        run = db.session.get(StaffingRun, run.RunID)
+        run.LastProjectStartDate, run.LastProjectID = after
+        run.ProjectsProcessed += processed
+        run.TeamsCreated += teams
+        run.ProjectsSkipped += skipped
+        run.ProjectsFailed += failed
+        run.FilledRoles += filled
+        totals = dict(run.UnfilledRoles or {})
+        for role, count in unfilled.items():
+            totals[role] = totals.get(role, 0) + count
+        run.UnfilledRoles = totals
+        db.session.commit()
+        logger.info(f"Staffing run {run.RunID}: checkpoint after project {run.LastProjectID} "
+                    f"({run.ProjectsProcessed} processed).")
+        if progress is not None:
+            progress(run)
+
+    run.Status = 'completed'
+    run.FinishedAt = datetime.utcnow()
+    db.session.commit()
+    summary = run.serialize()
+    summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Staffing run {run.RunID} of org {org_id} completed: {run.TeamsCreated} team(s), "
+                f"{run.FilledRoles} role(s) filled.")
+    return summary
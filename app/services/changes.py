@@ -0,0 +1,163 @@
+# app/services/changes.py
+#
+# The change feed behind GET /changes: the resources, projects and teams of an
+# organization written, and those deleted, since a cursor. Rows carry the
+# ChangeSeq of their last write and deletes leave a Tombstone (see
+# app.models.change), so a page is a few index range scans whatever the size of
+# the tables.
+
+import logging
+import time
+
+from flask import g
+from sqlalchemy import insert, select, text
+
+from app import db
+from app.models import Project, Resource, Team, Tombstone
+from app.models.change import CHANGE_FEED_LOCK_KEY
+
+logger = logging.getLogger(__name__)
+
+_ENTITIES = (('resource', Resource, 'ResourceID'), ('project', Project, 'ProjectID'), ('team', Team, 'TeamID'))
+
+_LOCK_RETRY_S = 0.01
+
+# Highest safe position seen by this worker: still safe when the lock is busy
+_high_water = {'value': None}
+
+
+class ChangeFeedBusy(Exception):
+    """
+    Writers kept the feed lock and no safe position is known yet; retry after retry_after seconds.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def tombstone_statement(entity_type, org_id, entity_ids):
+    """
+    The INSERT recording deletes of entity_type rows (see record_deletes), or None for no rows.
+    """
+    rows = [{'EntityType': entity_type, 'EntityID': entity_id, 'OrgID': org_id} for entity_id in entity_ids]
+    return insert(Tombstone).values(rows) if rows else None
+
+
+def record_deletes(entity_type, org_id, entity_ids):
+    """
+    Leaves a tombstone in the change feed for each deleted resource, project or
+    team (entity_type 'resource', 'project' or 'team'). Runs in the caller's
+    transaction, which must be the one deleting the rows.
+    """
+    statement = tombstone_statement(entity_type, org_id, entity_ids)
+    if statement is not None:
+        db.session.execute(statement)
+
+
+def safe_high_water(lock_wait_ms):
+    """
+    The highest ChangeSeq below which no change can still appear: the sequence's
+    last value, read while holding the feed lock exclusively, i.e. with no
+    writer transaction open. The lock is only tried, never queued for, so
+    writers are not held up behind a reader; after lock_wait_ms of trying, the
+    last position this worker obtained is used instead.
+
+    The lock is taken on a connection of its own, leaving the session's
+    transaction alone. A position read now may be ahead of a snapshot the
+    session already holds, though, so a request reading the feed in an earlier
+    snapshot (POST /batch) pins one first (see pin_high_water).
+
+    Raises:
+        ChangeFeedBusy: If the lock stayed busy and no earlier position is known.
+    """
+    if 'change_feed_high_water' in g:
+        return g.change_feed_high_water
+    deadline = time.perf_counter() + lock_wait_ms / 1000
+    with db.engine.connect() as connection:  # Closing it ends the transaction and releases the lock
+        while True:
+            if connection.execute(text('SELECT pg_try_advisory_xact_lock(:key)'), {'key': CHANGE_FEED_LOCK_KEY}).scalar():
+                last_value, is_called = connection.execute(text('SELECT last_value, is_called FROM change_seq')).one()
+                high_water = last_value if is_called else 0
+                _high_water['value'] = max(high_water, _high_water['value'] or 0)
+                return high_water
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(_LOCK_RETRY_S)
+    if _high_water['value'] is None:
+        raise ChangeFeedBusy("Writes in progress; retry shortly", retry_after=1)
+    logger.info(f"Change feed lock busy for {lock_wait_ms} ms; serving up to {_high_water['value']}.")
+    return _high_water['value']
+
+
+def pin_high_water(lock_wait_ms):
+    """
+    Fixes the position the feed reads up to for the rest of the request (and
+    returns it): call before the request's snapshot is taken, so every change
+    up to it is visible in the snapshot. With the lock busy and no earlier
+    position known, pins 0: the feed then returns no changes rather than
+    failing the request.
+    """
+    try:
+        g.change_feed_high_water = safe_high_water(lock_wait_ms)
+    except ChangeFeedBusy:
+        g.change_feed_high_water = 0
+    return g.change_feed_high_water
+
+
+def changes_since(org_id, since, limit, lock_wait_ms):
+    """
+    A page of an organization's change feed, in ChangeSeq order.
+
+    Each resource, project or team written after the cursor appears once, as an
+    upsert with its current data and the position of its last write; each one
+    deleted after it appears as a delete. Pass the returned cursor as since to
+    get the next page; once has_more is false it is where the next poll starts.
+
+    Args:
+        org_id (str): The organization.
+        since (int): The cursor of the previous page; 0 for everything.
+        limit (int): Changes per page.
+        lock_wait_ms (float): See safe_high_water.
+
+    Returns:
+        tuple: (changes, cursor, has_more).
+    """
+    high_water = safe_high_water(lock_wait_ms)
+    if since >= high_water:
+        return [], since, False
+
+    changes = []
+    for entity_type, model, id_column in _ENTITIES:
+        rows = db.session.scalars(
+            select(model)
+            .where(model.OrgID == org_id, model.ChangeSeq > since, model.ChangeSeq <= high_water)
+            .order_by(model.ChangeSeq).limit(limit + 1)
+        ).all()
+        changes.extend({
+            'ChangeSeq': row.ChangeSeq,
+            'EntityType': entity_type,
+            'EntityID': getattr(row, id_column),
+            'Operation': 'upsert',
+            'Data': row.serialize(),
+        } for row in rows)
+    tombstones = db.session.scalars(
+        select(Tombstone)
+        .where(Tombstone.OrgID == org_id, Tombstone.ChangeSeq > since, Tombstone.ChangeSeq <= high_water)
+        .order_by(Tombstone.ChangeSeq).limit(limit + 1)
+    ).all()
+    changes.extend({
+        'ChangeSeq': tombstone.ChangeSeq,
+        'EntityType': tombstone.EntityType,
+        'EntityID': tombstone.EntityID,
+        'Operation': 'delete',
+        'Data': None,
+    } for tombstone in tombstones)
+
+    # Every source read limit + 1 rows, so any change beyond the page sorts after it
+    changes.sort(key=lambda change: change['ChangeSeq'])
+    has_more = len(changes) > limit
+    if has_more:
+        changes = changes[:limit]
+        return changes, changes[-1]['ChangeSeq'], True
+    return changes, high_water, False
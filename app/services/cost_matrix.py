@@ -0,0 +1,184 @@
+# app/services/cost_matrix.py
+
+import heapq
+import logging
+from array import array
+from math import isqrt
+from operator import itemgetter
+
+logger = logging.getLogger(__name__)
+
+INT64_BYTES = 8
+HEAP_ENTRY_BYTES = 80     # (cost, column) tuple plus its list slot
+DEFAULT_CELL_BYTES = 32   # A solver's working copy of a cell: a float and its list slot
+
+
+class CompactCostMatrix:
+    """
+    Roles x resources fixed-point costs stored row-major in a flat int64 array
+    (8 bytes per cell instead of a Python list slot plus an int object).
+
+    Reads as the rectangular list of rows the solvers take: matrix[row] is a
+    read-only view of the row (no copy) and matrix[row][column] a cost.
+    """
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.costs = array('q', bytes(INT64_BYTES * rows * columns))
+        self._view = memoryview(self.costs).toreadonly()
+
+    @property
+    def nbytes(self):
+        return self.costs.itemsize * len(self.costs)
+
+    def set_block(self, row, start, values):
+        offset = row * self.columns + start
+        self.costs[offset:offset + len(values)] = array('q', values)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return self._view[row * self.columns:(row + 1) * self.columns]
+
+    def __iter__(self):
+        return (self[row] for row in range(self.rows))
+
+    def select_columns(self, columns):
+        """
+        A new matrix with only the given columns, in that order.
+        """
+        selected = CompactCostMatrix(self.rows, len(columns))
+        if columns:
+            pick = itemgetter(*columns)
+            for row in range(self.rows):
+                values = pick(self[row])
+                selected.set_block(row, 0, values if len(columns) > 1 else (values,))
+        return selected
+
+    # Views are not picklable: ship the array (solves in the solver pool, see app.services.admission)
+    def __getstate__(self):
+        return self.rows, self.columns, self.costs
+
+    def __setstate__(self, state):
+        self.rows, self.columns, self.costs = state
+        self._view = memoryview(self.costs).toreadonly()
+
+
+def candidates_per_role(rows, memory_budget, cell_bytes=DEFAULT_CELL_BYTES, pads_square=False):
+    """
+    The most candidates per role (k, at most rows) for which the solver's matrix
+    fits in the memory budget: rows x (rows * k) cells at worst, padded to a
+    square for solvers that do, at cell_bytes of working copy per cell next to
+    the compact matrix it is given.
+    """
+    per_cell = INT64_BYTES + cell_bytes
+    if pads_square:
+        k = isqrt(memory_budget // per_cell) // rows
+    else:
+        k = memory_budget // (per_cell * rows * rows)
+    return min(rows, max(1, k))
+
+
+def _keep_smallest(heap, costs, start, k, limit):
+    """
+    Folds a block of costs into a bounded max-heap holding the k cheapest feasible columns.
+    Ties keep the lower column index.
+    """
+    for offset, cost in enumerate(costs):
+        if cost >= limit:
+            continue
+        entry = (-cost, -(start + offset))
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+
+def select_candidate_columns(role_list, resources, prepare_fn, row_costs_fn, limit,
+                             memory_budget, block_size, cell_bytes=DEFAULT_CELL_BYTES, pads_square=False):
+    """
+    Chooses the resource columns worth handing to the solver, and returns the
+    solver's matrix: the costs of every role for those columns.
+
+    Costs are computed in column blocks so per-resource preparation (e.g. parsed
+    skills) is only held for one block at a time, one role row of the block per call. When the full matrix fits in
+    the memory budget it is kept as a CompactCostMatrix and the solver's matrix is
+    cut from it; otherwise only a bounded heap of the cheapest columns per role is
+    kept, and the selected columns are scored again.
+
+    Keeping the k = len(role_list) cheapest feasible columns of every role is
+    exact: an optimal assignment never needs a column outside its role's top k,
+    since at most k - 1 of them are taken by other roles. When the solver's
+    matrix would not fit in the budget (see candidates_per_role), k is lowered
+    and the result may be slightly suboptimal.
+
+    Args:
+        role_list (list): (project, requirement) pairs, one per row.
+        resources (list): Candidate resources, one per column.
+        prepare_fn (callable): prepare_fn(resources) -> prepared data for a block of resources.
+        row_costs_fn (callable): row_costs_fn(project, req, prepared) -> integer costs of one role for the block.
+        limit: Costs at or above this value are infeasible.
+        memory_budget (int): Memory budget in bytes.
+        block_size (int): Number of columns computed per block.
+        cell_bytes (int): Bytes per cell of the solver's working copy of its matrix.
+        pads_square (bool): The solver pads its matrix to a square.
+
+    Returns:
+        tuple: (sorted list of column indexes, CompactCostMatrix of the roles x
+        those columns, k used).
+    """
+    rows, columns = len(role_list), len(resources)
+    if rows == 0 or columns == 0:
+        return [], CompactCostMatrix(rows, 0), 0
+
+    k = candidates_per_role(rows, memory_budget, cell_bytes, pads_square)
+    if k < rows:
+        logger.warning(
+            f"Cost matrix of {rows} roles exceeds the solver memory budget; "
+            f"keeping the {k} best candidates per role (result may be approximate)."
+        )
+
+    matrix = None
+    if INT64_BYTES * rows * columns <= memory_budget:
+        matrix = CompactCostMatrix(rows, columns)
+    else:
+        heap_bytes = HEAP_ENTRY_BYTES * rows * k
+        logger.info(
+            f"Full {rows}x{columns} cost matrix exceeds the memory budget; "
+            f"streaming candidates per role (~{heap_bytes} bytes)."
+        )
+    heaps = [[] for _ in range(rows)]
+
+    for start in range(0, columns, block_size):
+        block = resources[start:start + block_size]
+        prepared = prepare_fn(block)
+        for row, (project, req) in enumerate(role_list):
+            costs = row_costs_fn(project, req, prepared)
+            if matrix is not None:
+                matrix.set_block(row, start, costs)
+            else:
+                _keep_smallest(heaps[row], costs, start, k, limit)
+
+    selected = set()
+    for row in range(rows):
+        if matrix is not None:
+            costs = matrix[row]
+            feasible = (j for j in range(columns) if costs[j] < limit)
+            selected.update(heapq.nsmallest(k, feasible, key=costs.__getitem__))
+        else:
+            selected.update(-neg_column for _cost, neg_column in heaps[row])
+    selected = sorted(selected)
+
+    if matrix is not None:
+        return selected, matrix.select_columns(selected), k
+    # Only the heaps were kept: score the selected columns (at most rows x k) again
+    solver_matrix = CompactCostMatrix(rows, len(selected))
+    for start in range(0, len(selected), block_size):
+        prepared = prepare_fn([resources[column] for column in selected[start:start + block_size]])
+        for row, (project, req) in enumerate(role_list):
+            solver_matrix.set_block(row, start, row_costs_fn(project, req, prepared))
+    return selected, solver_matrix, k
@@ -0,0 +1,96 @@
+# app/services/intervals.py
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+FAR_PAST = date.min.toordinal()
+FAR_FUTURE = date.max.toordinal()
+
+
+class CommitmentIndex:
+    """
+    Commitments of each resource as sorted, disjoint half-open day ranges
+    [start, end), in date ordinals.
+
+    Starts and ends are kept in two parallel sorted lists per resource, so an
+    overlap check only bisects for the first range ending after the requested
+    start: O(log k) for a resource with k commitments.
+    """
+
+    def __init__(self):
+        self._starts = {}
+        self._ends = {}
+
+    def add(self, resource_id, start, end):
+        """
+        Records a commitment; overlapping or adjacent ranges are merged.
+        """
+        if end <= start:
+            return
+        starts = self._starts.setdefault(resource_id, [])
+        ends = self._ends.setdefault(resource_id, [])
+        first = bisect_left(ends, start)    # First range ending at or after start
+        last = bisect_right(starts, end)    # Ranges starting at or before end
+        if first < last:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+
+    def is_free(self, resource_id, start, end):
+        """
+        True if the resource has no commitment overlapping [start, end).
+        """
+        starts = self._starts.get(resource_id)
+        if not starts:
+            return True
+        index = bisect_right(self._ends[resource_id], start)  # First range ending after start
+        return index == len(starts) or starts[index] >= end
+
+    def free_from(self, resource_id, start):
+        """
+        First day on or after start when the resource is not committed.
+        """
+        starts = self._starts.get(resource_id)
+        if not starts:
+            return start
+        index = bisect_right(self._ends[resource_id], start)
+        if index < len(starts) and starts[index] <= start:
+            return self._ends[resource_id][index]
+        return start
+
+    def commitments(self, resource_id):
+        return list(zip(self._starts.get(resource_id, []), self._ends.get(resource_id, [])))
+
+
+class AvailabilityIndex:
+    """
+    One availability range [lower, upper) per resource, in date ordinals, sorted
+    by lower bound.
+
+    covering() bisects for the ranges starting on or before the requested start
+    and keeps those lasting until its end. Availability ranges are open-ended
+    (see app.services.availability), so the bisect alone decides the answer.
+    """
+
+    def __init__(self):
+        self._lowers = []
+        self._uppers = []
+        self._ids = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, resource_id, lower, upper):
+        position = bisect_right(self._lowers, lower)
+        self._lowers.insert(position, lower)
+        self._uppers.insert(position, upper)
+        self._ids.insert(position, resource_id)
+
+    def covering(self, start, end):
+        """
+        Ids of the resources whose range contains [start, end).
+        """
+        count = bisect_right(self._lowers, start)
+        uppers, ids = self._uppers, self._ids
+        return [ids[i] for i in range(count) if uppers[i] >= end]
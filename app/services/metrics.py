@@ -0,0 +1,283 @@
+# app/services/metrics.py
+
+import atexit
+import functools
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+MEMORY_BUCKETS = tuple(float(2 ** power) for power in range(16, 36, 2)) + (math.inf,)
+SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, math.inf)
+
+# name -> (help text, bucket upper bounds)
+HISTOGRAMS = {
+    'team_formation_phase_seconds': ('Duration of each team formation phase.', TIME_BUCKETS),
+    'team_formation_matrix_rows': ('Roles (rows) in the cost matrix.', SIZE_BUCKETS),
+    'team_formation_matrix_columns': ('Resources (columns) in the cost matrix.', SIZE_BUCKETS),
+    'team_formation_candidates': ('Candidate resources fetched per formation.', SIZE_BUCKETS),
+    'team_formation_unfilled_roles': ('Unfilled role positions per formation.', SIZE_BUCKETS),
+    'team_formation_admission_cost': ('Estimated cost (roles x candidates) of solves by admission decision.', SIZE_BUCKETS),
+    'team_formation_peak_memory_bytes': ('Peak traced memory per solve (COST_MATRIX_TRACE_MEMORY).', MEMORY_BUCKETS),
+    'db_operation_seconds': ('Duration of Files_Database CRUD operations.', TIME_BUCKETS),
+}
+
+_lock = threading.Lock()
+_values = {}  # (name, sorted label items) -> [bucket counts..., sum, count]
+_state = {'pid': None, 'path': None, 'dirty': False}
+
+# Series of exited workers, merged by the gunicorn master (see archive_worker)
+_ARCHIVE_NAME = 'metrics-archive.json'
+
+
+def _multiproc_dir():
+    """
+    Directory shared by all workers of the host, or None for single-process mode.
+    """
+    return os.getenv('PROMETHEUS_MULTIPROC_DIR') or None
+
+
+def _flush_interval():
+    return float(os.getenv('METRICS_FLUSH_INTERVAL_S', '5'))
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(_flush_interval())
+        try:
+            flush()
+        except OSError as e:
+            logger.warning(f"Could not write metrics file: {e}")
+
+
+def _check_pid():
+    # Values observed in a preloading master are inherited by forked workers;
+    # drop them so they are only reported by the process that observed them.
+    # Threads do not survive a fork either: each process starts its own flusher.
+    pid = os.getpid()
+    if _state['pid'] != pid:
+        _values.clear()
+        _state['pid'] = pid
+        _state['path'] = None
+        _state['dirty'] = False
+        if _multiproc_dir():
+            threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True).start()
+
+
+def observe(name, value, **labels):
+    """
+    Records a value in a histogram.
+
+    Args:
+        name (str): Histogram name, one of HISTOGRAMS.
+        value (float): Observed value.
+        **labels: Label values for the series.
+    """
+    buckets = HISTOGRAMS[name][1]
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _check_pid()
+        series = _values.get(key)
+        if series is None:
+            series = _values[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+        _state['dirty'] = True
+
+
+@contextmanager
+def timer(name, **labels):
+    """
+    Context manager observing the duration of its block in seconds.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def timed(name, **labels):
+    """
+    Decorator observing the duration of every call, labelled with the function name.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, operation=func.__name__, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def flush():
+    """
+    Writes this process's histograms to the multiprocess directory, if one is
+    configured. Runs every METRICS_FLUSH_INTERVAL_S seconds in each process that
+    observed something, before each scrape and at exit.
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    with _lock:
+        _check_pid()
+        if not _state['dirty']:
+            return
+        if _state['path'] is None:
+            # Include the start time so a recycled pid never overwrites a dead worker's file
+            _state['path'] = os.path.join(directory, f"metrics-{os.getpid()}-{time.time_ns()}.json")
+        payload = [[name, list(labels), series] for (name, labels), series in _values.items()]
+        _state['dirty'] = False
+        os.makedirs(directory, exist_ok=True)
+        _write_json(_state['path'], payload)
+
+
+atexit.register(flush)
+
+
+def _write_json(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable metrics file {path}: {e}")
+        return None
+
+
+def _merge(merged, payload):
+    for name, labels, series in payload:
+        if name not in HISTOGRAMS:
+            continue
+        key = (name, tuple(tuple(item) for item in labels))
+        total = merged.setdefault(key, [0] * len(series))
+        for i, value in enumerate(series):
+            total[i] += value
+
+
+def _read_archive(directory):
+    """
+    The archived series and the names of the worker files merged into them last.
+    """
+    archive = _read_json(os.path.join(directory, _ARCHIVE_NAME)) or {}
+    return archive.get('series', []), set(archive.get('merged', []))
+
+
+def archive_worker(pid):
+    """
+    Folds an exited worker's histograms into the archive file and removes its
+    own, so recycled workers (gunicorn max_requests) do not pile up files that
+    every scrape reads. Run from the gunicorn master's child_exit hook, the only
+    writer of the archive.
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    paths = glob.glob(os.path.join(directory, f'metrics-{pid}-*.json'))
+    if not paths:
+        return
+    series, _merged = _read_archive(directory)
+    merged = {}
+    _merge(merged, series)
+    for path in paths:
+        _merge(merged, _read_json(path) or [])
+    # The archive lists the files it now covers, so a scrape that still finds
+    # them before they are removed does not count them twice
+    _write_json(os.path.join(directory, _ARCHIVE_NAME), {
+        'series': [[name, list(labels), values] for (name, labels), values in merged.items()],
+        'merged': [os.path.basename(path) for path in paths],
+    })
+    for path in paths:
+        os.remove(path)
+
+
+def clear_multiproc_dir():
+    """
+    Removes every process's histograms, e.g. those of a previous server run. Run
+    from the gunicorn master before it forks workers.
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json*')):
+        os.remove(path)
+
+
+def _collect():
+    """
+    Merges the histograms of every process (or just this one) into a single view.
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        with _lock:
+            _check_pid()
+            return {key: list(series) for key, series in _values.items()}
+
+    flush()
+    # List the worker files before reading the archive: a file archived in between
+    # is then listed as merged there, or already gone
+    paths = glob.glob(os.path.join(directory, 'metrics-*.json'))
+    series, archived = _read_archive(directory)
+    merged = {}
+    _merge(merged, series)
+    for path in paths:
+        name = os.path.basename(path)
+        if name == _ARCHIVE_NAME or name in archived:
+            continue
+        _merge(merged, _read_json(path) or [])
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def render_prometheus():
+    """
+    Renders all histograms in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition body.
+    """
+    collected = _collect()
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (series_name, labels), series in sorted(collected.items()):
+            if series_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, series):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(float(bound))
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series[-1]}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,249 @@
+# app/services/parallel_auction.py
+
+import atexit
+import heapq
+import logging
+import math
+import multiprocessing
+import operator
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from flask import current_app, has_app_context
+
+from app.services.solvers import (
+    DUMMY, register_solver, auction_epsilons, solve_auction, _dummy_bid, _transposed
+)
+
+logger = logging.getLogger(__name__)
+
+FLOAT64_BYTES = 8
+
+# Process pool shared by every solve in this process (recreated after a fork)
+_pool = None
+_pool_pid = None
+_pool_workers = None
+
+# Worker side: the shared memory segment of the solve currently being bid on
+_attached = {}
+
+
+def _bid_rows(benefits, prices, columns, bidders, epsilon):
+    """
+    Computes the bid of every bidder against the same prices (Jacobi bidding).
+
+    Args:
+        benefits: Flat row-major benefits (sequence of floats).
+        prices (list): Current column prices.
+        columns (int): Number of columns.
+        bidders (list): Row indexes bidding this round.
+        epsilon (float): Bid increment.
+
+    Returns:
+        list: (row, column, bid price) tuples.
+    """
+    bids = []
+    for row in bidders:
+        values = list(map(operator.sub, benefits[row * columns:(row + 1) * columns], prices))
+        best_value = max(values)
+        best_j = values.index(best_value)
+        if columns > 1:
+            values[best_j] = -math.inf
+            second_value = max(values)
+        else:
+            second_value = best_value
+        bids.append((row, best_j, prices[best_j] + best_value - second_value + epsilon))
+    return bids
+
+
+def _release_attached():
+    for view in (_attached.pop('benefits', None), _attached.pop('prices', None)):
+        if view is not None:
+            view.release()
+    segment = _attached.pop('segment', None)
+    if segment is not None:
+        segment.close()
+    _attached.clear()
+
+
+def _attach(name, rows, columns):
+    """
+    Maps a solve's shared segment in a worker, keeping it mapped across rounds.
+    """
+    if _attached.get('name') != name:
+        _release_attached()
+        # Pool workers share the parent's resource tracker, which unlinks the segment with the parent
+        segment = SharedMemory(name=name)
+        view = segment.buf.cast('d')
+        _attached.update({
+            'name': name,
+            'segment': segment,
+            'benefits': view[:rows * columns],
+            'prices': view[rows * columns:],
+        })
+        view.release()
+    return _attached['benefits'], _attached['prices']
+
+
+def _bid_block(name, rows, columns, bidders, epsilon):
+    """
+    Worker entry point: bids for a block of rows against the prices the parent
+    published in the shared segment.
+    """
+    benefits, prices = _attach(name, rows, columns)
+    return _bid_rows(benefits, prices.tolist(), columns, bidders, epsilon)
+
+
+def _get_pool(workers):
+    global _pool, _pool_pid, _pool_workers
+    if _pool is None or _pool_pid != os.getpid() or _pool_workers != workers:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # forkserver: workers never inherit the web worker's threads, locks or DB connections
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
+        _pool_pid, _pool_workers = os.getpid(), workers
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _default_workers():
+    workers = current_app.config['AUCTION_WORKERS'] if has_app_context() else 0
+    return workers or os.cpu_count() or 1
+
+
+def _parallel_auction_phase(segment_name, benefits, price_view, n, m, prices, epsilon,
+                            pool, workers, parallel_threshold):
+    """
+    One Jacobi auction round at a fixed epsilon: all unassigned rows bid against
+    the same prices, each column goes to its highest bid, and outbid rows bid again.
+    Bids are computed in the worker pool when there is enough work to pay for the
+    round trip. Dummy rows (m > n) bid in the parent between rounds, as in the
+    sequential auction.
+
+    Returns:
+        tuple: (column assigned to each row, number of bidding rounds).
+    """
+    owner = [-1] * m
+    assigned = [-1] * n
+    unassigned = list(range(n))
+    free_dummies = m - n
+    heap = [(price, j) for j, price in enumerate(prices)]
+    heapq.heapify(heap)
+    rounds = 0
+
+    while unassigned or free_dummies:
+        # Dummy bids are cheap heap operations: place them all before the next round
+        # of real bids, so the rows they displace bid together
+        while free_dummies:
+            free_dummies -= 1
+            best_j = _dummy_bid(heap, prices, epsilon)
+            heapq.heappush(heap, (prices[best_j], best_j))
+            previous = owner[best_j]
+            owner[best_j] = DUMMY
+            if previous == DUMMY:
+                free_dummies += 1
+            elif previous >= 0:
+                assigned[previous] = -1
+                unassigned.append(previous)
+        if not unassigned:
+            break
+
+        rounds += 1
+        if workers > 1 and len(unassigned) * m >= parallel_threshold:
+            price_view[:] = array('d', prices)
+            blocks = [unassigned[start::workers] for start in range(workers)]
+            futures = [
+                pool.submit(_bid_block, segment_name, n, m, block, epsilon)
+                for block in blocks if block
+            ]
+            bids = [bid for future in futures for bid in future.result()]
+        else:
+            bids = _bid_rows(benefits, prices, m, unassigned, epsilon)
+
+        # Each column goes to its highest bidder
+        winners = {}
+        for row, column, price in bids:
+            if column not in winners or price > winners[column][1]:
+                winners[column] = (row, price)
+        unassigned = [row for row, column, _price in bids if winners[column][0] != row]
+        for column, (row, price) in winners.items():
+            prices[column] = price
+            heapq.heappush(heap, (price, column))
+            previous = owner[column]
+            owner[column] = row
+            assigned[row] = column
+            if previous == DUMMY:
+                free_dummies += 1
+            elif previous >= 0:
+                assigned[previous] = -1
+                unassigned.append(previous)
+    return assigned, rounds
+
+
+@register_solver('parallel_auction')
+def solve_parallel_auction(cost_matrix, scaling_factor=5.0, precision=1e-3, workers=None,
+                           parallel_threshold=200000, report=None, **options):
+    """
+    Auction with epsilon scaling whose bidding runs in worker processes.
+
+    The benefit matrix and the column prices live in one shared memory segment
+    (float64, row-major), so each round only sends row indexes to the workers and
+    gets bids back. Like the sequential auction, the result is within `precision`
+    of the optimal total cost, as a score (costs / SCORE_UNIT).
+
+    Args:
+        cost_matrix (list): Rows of costs.
+        scaling_factor (float): Epsilon reduction between phases.
+        precision (float): Tolerance on the total cost, as a score (see auction_epsilons).
+        workers (int, optional): Worker processes (default AUCTION_WORKERS, else the CPU count).
+        parallel_threshold (int): Minimum bidders x columns for a round to be sent to
+            the workers; smaller rounds are bid in this process.
+        report (dict, optional): Filled with the worker count and bidding rounds.
+
+    Returns:
+        list: (row, column) pairs.
+    """
+    n, m = len(cost_matrix), len(cost_matrix[0])
+    if n > m:
+        return _transposed(solve_parallel_auction, cost_matrix, scaling_factor=scaling_factor,
+                           precision=precision, workers=workers, parallel_threshold=parallel_threshold,
+                           report=report, **options)
+    workers = workers or _default_workers()
+    if workers <= 1 or n * m < parallel_threshold:
+        # Not worth starting processes for
+        return solve_auction(cost_matrix, scaling_factor=scaling_factor, precision=precision)
+
+    segment = SharedMemory(create=True, size=FLOAT64_BYTES * (n * m + m))
+    view = segment.buf.cast('d')
+    benefits, price_view = view[:n * m], view[n * m:]
+    try:
+        for i, row in enumerate(cost_matrix):
+            benefits[i * m:(i + 1) * m] = array('d', (-float(cost) for cost in row))
+        pool = _get_pool(workers)
+        prices = [0.0] * m
+        assigned = []
+        rounds = 0
+        for epsilon in auction_epsilons(max(benefits) - min(benefits), m, scaling_factor, precision):
+            assigned, phase_rounds = _parallel_auction_phase(
+                segment.name, benefits, price_view, n, m, prices, epsilon,
+                pool, workers, parallel_threshold
+            )
+            rounds += phase_rounds
+    finally:
+        benefits.release()
+        price_view.release()
+        view.release()
+        segment.close()
+        segment.unlink()
+
+    if report is not None:
+        report.update({'workers': workers, 'bidding_rounds': rounds})
+    logger.info(f"Parallel auction solved {n}x{m} with {workers} workers in {rounds} bidding rounds.")
+    return [(row, column) for row, column in enumerate(assigned)]
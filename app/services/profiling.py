@@ -0,0 +1,123 @@
+# app/services/profiling.py
+
+import contextvars
+import cProfile
+import functools
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+
+from flask import current_app, make_response, request
+
+logger = logging.getLogger(__name__)
+
+# Extra facts (e.g. matrix dimensions) attached to the profile of the current request
+_annotations = contextvars.ContextVar('profile_annotations', default=None)
+
+# cProfile cannot run two profilers at once on Python 3.12+, so profile one request at a time
+_profiler_lock = threading.Lock()
+
+
+def annotate(**values):
+    """
+    Attaches values to the profile of the current request; a no-op when not profiling.
+    """
+    annotations = _annotations.get()
+    if annotations is not None:
+        annotations.update(values)
+
+
+def _requested_on_demand():
+    secret = current_app.config.get('PROFILE_SECRET')
+    if not secret or request.args.get('profile') != '1':
+        return False
+    provided = request.headers.get('X-Profile-Secret', '')
+    return hmac.compare_digest(provided.encode(), secret.encode())
+
+
+def _top_functions(profiler, limit):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    top = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, total_calls, total_time, cumulative_time, _callers = stats.stats[func]
+        filename, line, name = func
+        top.append({
+            'function': f"{filename}:{line}({name})",
+            'calls': total_calls,
+            'total_s': round(total_time, 6),
+            'cumulative_s': round(cumulative_time, 6),
+        })
+    return top
+
+
+def _save(profiler, report):
+    directory = current_app.config['PROFILE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(
+        directory,
+        f"{report['endpoint']}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{random.randrange(1 << 16):04x}"
+    )
+    profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}.json", 'w') as f:
+        json.dump(report, f, indent=2)
+    return f"{base}.prof"
+
+
+def profiled(view):
+    """
+    Decorator profiling a view with cProfile when asked to.
+
+    A request is profiled on demand with ?profile=1 and an X-Profile-Secret header
+    matching Config.PROFILE_SECRET; the report (top functions by cumulative time
+    plus annotations such as matrix dimensions) is added to the JSON response.
+    Independently, a PROFILE_SAMPLE_RATE fraction of requests is profiled and
+    saved under PROFILE_DIR.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        on_demand = _requested_on_demand()
+        sampled = random.random() < current_app.config['PROFILE_SAMPLE_RATE']
+        if not (on_demand or sampled) or not _profiler_lock.acquire(blocking=False):
+            return view(*args, **kwargs)
+
+        annotations = {}
+        token = _annotations.set(annotations)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                rv = view(*args, **kwargs)
+            finally:
+                profiler.disable()
+        finally:
+            _annotations.reset(token)
+            _profiler_lock.release()
+
+        report = {
+            'endpoint': request.endpoint,
+            'path': request.full_path,
+            'wall_time_s': round(time.perf_counter() - started, 6),
+            'annotations': annotations,
+            'top_functions': _top_functions(profiler, current_app.config['PROFILE_TOP_N']),
+        }
+        try:
+            report['saved_to'] = _save(profiler, report)
+        except OSError as e:
+            logger.error(f"Could not save profile for {request.endpoint}: {e}")
+        logger.info(f"Profiled {request.endpoint} in {report['wall_time_s']}s: {report.get('saved_to')}")
+
+        response = make_response(rv)
+        if on_demand and response.is_json and isinstance(response.get_json(), dict):
+            body = response.get_json()
+            body['profile'] = report
+            response.set_data(json.dumps(body))
+        return response
+    return wrapper
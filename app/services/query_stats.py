@@ -0,0 +1,58 @@
+# app/services/query_stats.py
+
+import logging
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+def init_query_stats(app, db):
+    """
+    Hooks SQLAlchemy engine events to count statements and DB time per request.
+
+    Totals are returned in the X-DB-Queries and X-DB-Time-ms response headers,
+    and statements slower than SLOW_QUERY_THRESHOLD_MS are logged together with
+    their bound parameters and the endpoint that issued them.
+
+    Args:
+        app (Flask): The application.
+        db (SQLAlchemy): The Flask-SQLAlchemy extension bound to the app.
+    """
+    threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000.0
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+        endpoint = None
+        if has_request_context():
+            g.db_queries = g.get('db_queries', 0) + 1
+            g.db_time = g.get('db_time', 0.0) + elapsed
+            endpoint = request.endpoint
+        if elapsed > threshold:
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) from endpoint '{endpoint}': "
+                f"{statement} -- parameters: {parameters!r}"
+            )
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('query_start_time'):
+            conn.info['query_start_time'].pop()
+
+    @app.after_request
+    def add_query_stats_headers(response):
+        response.headers['X-DB-Queries'] = str(g.get('db_queries', 0))
+        response.headers['X-DB-Time-ms'] = f"{g.get('db_time', 0.0) * 1000:.2f}"
+        return response
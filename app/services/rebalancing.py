@@ -0,0 +1,346 @@
+# app/services/rebalancing.py
+
+from functools import partial
+import logging
+import time
+
+from flask import current_app
+
+from app.models import db
+from app.models import Resource, Project, Team
+from app.services.availability import refresh_availability
+from app.services.bench_snapshot import invalidate_bench_snapshot
+from app.services.cost_matrix import select_candidate_columns
+from app.services.scoring import get_scoring_kernel, INFEASIBLE_COST
+from app.services.solvers import solve_assignment
+from app.services.team_formation import expand_roles
+from app.services.utils import SCORE_UNIT
+
+logger = logging.getLogger(__name__)
+
+EMPTY_COST = INFEASIBLE_COST  # An unfilled role costs as much as an unqualified resource
+CYCLE_CANDIDATES = 5          # Slots tried per resource when looking for 3-cycles
+
+
+class RebalanceState:
+    """
+    Slots (one per role position of the rebalanced teams) and who holds them.
+
+    cost[slot][column] is the fixed-point cost of a candidate in a role (lower is
+    better); columns are the current team members followed by bench candidates.
+    """
+
+    def __init__(self, cost, slot_teams, holder):
+        self.cost = cost
+        self.slot_teams = slot_teams
+        self.holder = holder
+        self.slot_of = [-1] * (len(cost[0]) if cost else 0)
+        for slot, column in enumerate(holder):
+            if column >= 0:
+                self.slot_of[column] = slot
+        # Slots each column is qualified for, cheapest first
+        self.feasible_slots = [
+            sorted((slot for slot in range(len(cost)) if cost[slot][column] < INFEASIBLE_COST),
+                   key=lambda slot, column=column: cost[slot][column])
+            for column in range(len(self.slot_of))
+        ]
+        # Columns qualified for each slot, cheapest first
+        self.feasible_columns = [
+            sorted((column for column, value in enumerate(row) if value < INFEASIBLE_COST), key=row.__getitem__)
+            for row in cost
+        ]
+
+    def current(self, slot):
+        column = self.holder[slot]
+        return self.cost[slot][column] if column >= 0 else EMPTY_COST
+
+    def total(self):
+        return sum(self.current(slot) for slot in range(len(self.holder)))
+
+    def filled(self):
+        return sum(1 for slot in range(len(self.holder)) if self.current(slot) < INFEASIBLE_COST)
+
+    def apply(self, placements):
+        """
+        Applies a move given as (column, slot) placements; slot -1 sends the column
+        to the bench, and slots left by a moved column without a newcomer are emptied.
+        """
+        for column, _slot in placements:
+            previous = self.slot_of[column]
+            if previous >= 0 and self.holder[previous] == column:
+                self.holder[previous] = -1
+            self.slot_of[column] = -1
+        for column, slot in placements:
+            if slot >= 0:
+                displaced = self.holder[slot]
+                if displaced >= 0 and displaced != column:
+                    self.slot_of[displaced] = -1
+                self.holder[slot] = column
+                self.slot_of[column] = slot
+
+
+def _best_two_move(state, deadline):
+    """
+    Best improving replacement (a free candidate takes a slot), relocation (a
+    member moves to an empty slot) or swap (two members exchange slots). Moves
+    within a team change no TeamID but can free a role for someone else.
+    Returns (delta, placements) or None.
+    """
+    cost, holder, slot_of = state.cost, state.holder, state.slot_of
+    best = None
+    for slot in range(len(holder)):
+        if time.perf_counter() > deadline:
+            break
+        current = state.current(slot)
+        # Replacement: cheapest free candidate for this slot
+        for column in state.feasible_columns[slot]:
+            if slot_of[column] < 0:
+                delta = cost[slot][column] - current
+                if delta < 0 and (best is None or delta < best[0]):
+                    best = (delta, [(column, slot)] + ([(holder[slot], -1)] if holder[slot] >= 0 else []))
+                break
+        column = holder[slot]
+        if column < 0:
+            continue
+        for other in state.feasible_slots[column]:
+            if other == slot:
+                continue
+            other_column = holder[other]
+            if other_column < 0:
+                # Relocation to an empty slot
+                delta = cost[other][column] - current
+                placements = [(column, other)]
+            elif cost[slot][other_column] < INFEASIBLE_COST:
+                # Swap, when both are qualified for their new role
+                delta = cost[other][column] + cost[slot][other_column] - current - state.current(other)
+                placements = [(column, other), (other_column, slot)]
+            else:
+                continue
+            if delta < 0 and (best is None or delta < best[0]):
+                best = (delta, placements)
+    return best
+
+
+def _best_three_cycle(state, deadline):
+    """
+    Best improving 3-cycle: the holder of slot a takes slot b, b's takes c and c's takes a. Only the CYCLE_CANDIDATES
+    cheapest slots of each resource are tried. Returns (delta, placements) or None.
+    """
+    cost, holder = state.cost, state.holder
+    best = None
+    for a in range(len(holder)):
+        if time.perf_counter() > deadline:
+            break
+        first = holder[a]
+        if first < 0:
+            continue
+        for b in state.feasible_slots[first][:CYCLE_CANDIDATES]:
+            second = holder[b]
+            if b == a or second < 0:
+                continue
+            for c in state.feasible_slots[second][:CYCLE_CANDIDATES]:
+                third = holder[c]
+                if c in (a, b) or third < 0 or cost[a][third] >= INFEASIBLE_COST:
+                    continue
+                delta = (cost[b][first] + cost[c][second] + cost[a][third]
+                         - state.current(a) - state.current(b) - state.current(c))
+                if delta < 0 and (best is None or delta < best[0]):
+                    best = (delta, [(first, b), (second, c), (third, a)])
+    return best
+
+
+def local_search(state, time_budget_ms, max_moves):
+    """
+    Applies best-improving moves until none is left, the time budget runs out or
+    max_moves moves were made. 3-cycles are only searched when no 2-move improves.
+
+    Returns:
+        tuple: (moves made, reason for stopping).
+    """
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    moves = 0
+    while moves < max_moves:
+        if time.perf_counter() > deadline:
+            return moves, 'time_budget'
+        move = _best_two_move(state, deadline) or _best_three_cycle(state, deadline)
+        if move is None:
+            if time.perf_counter() > deadline:
+                return moves, 'time_budget'
+            return moves, 'converged'
+        state.apply(move[1])
+        moves += 1
+    return moves, 'max_moves'
+
+
+def _current_holders(cost, slot_teams, member_teams):
+    """
+    Reconstructs which member holds which slot of its own team (memberships are
+    stored per team, not per role) with an optimal assignment per team.
+    """
+    holder = [-1] * len(cost)
+    for team_id in set(slot_teams):
+        slots = [slot for slot, team in enumerate(slot_teams) if team == team_id]
+        columns = [column for column, team in enumerate(member_teams) if team == team_id]
+        if not slots or not columns:
+            continue
+        pairs = solve_assignment([[cost[slot][column] for column in columns] for slot in slots], 'lap')
+        for row, column in pairs:
+            holder[slots[row]] = columns[column]
+    return holder
+
+
+def rebalance_teams(org_id, start_date, time_budget_ms, max_moves, apply=False):
+    """
+    Improves the total score of an organization's teams by moving people between
+    teams and the bench.
+
+    Teams of projects starting on or after start_date are rebalanced together
+    with the bench: each role position is a slot held by one person, and a
+    bounded local search (bench replacements, relocations, 2-swaps and 3-cycles)
+    lowers the total cost. Resources are only placed in roles they qualify for
+    and are available for (AvailableDate on or before the project start).
+
+    Args:
+        org_id (str): The organization ID.
+        start_date (date): Teams of projects starting earlier are left alone.
+        time_budget_ms (float): Search time budget.
+        max_moves (int): Maximum number of moves (a swap or a cycle is one move).
+        apply (bool): Write the change set to the database.
+
+    Returns:
+        dict: Moves, the change set (only resources whose team changes), and the
+        score and filled roles before and after.
+    """
+    started = time.perf_counter()
+    config = current_app.config
+    teams = Team.query.join(Project, Team.ProjectID == Project.ProjectID).filter(
+        Team.OrgID == org_id, Project.ProjectStartDate >= start_date
+    ).order_by(Team.TeamID).all()
+    team_ids = [team.TeamID for team in teams]
+    members = Resource.query.filter(Resource.TeamID.in_(team_ids)).order_by(Resource.ResourceID).all() if team_ids else []
+    latest_start = max((team.project.ProjectStartDate for team in teams), default=start_date)
+    bench = Resource.query.filter(
+        Resource.OrgID == org_id, Resource.OnBench == True, Resource.TeamID == None,
+        (Resource.AvailableDate == None) | (Resource.AvailableDate <= latest_start)
+    ).order_by(Resource.ResourceID).all() if teams else []
+
+    kernel = get_scoring_kernel(org_id)
+    role_list, slot_teams = [], []
+    for team in teams:
+        for role in expand_roles([team.project]):
+            role_list.append(role)
+            slot_teams.append(team.TeamID)
+
+    # Bench columns worth considering, as in team formation. People not available by a
+    # project's start are masked before pruning, so they cannot take the slots of the
+    # roles' best candidates
+    prepare = partial(kernel.prepare, check_bench=False)
+
+    def prepare_bench(block):
+        return prepare(block), [resource.AvailableDate for resource in block]
+
+    def bench_row_costs(project, req, prepared_block):
+        prepared, available_dates = prepared_block
+        row = kernel.row_costs(project, req, prepared)
+        for column, available_date in enumerate(available_dates):
+            if available_date is not None and available_date > project.ProjectStartDate:
+                row[column] = INFEASIBLE_COST
+        return row
+
+    if bench and role_list:
+        columns, _compact, _k = select_candidate_columns(
+            role_list, bench, prepare_bench, bench_row_costs, INFEASIBLE_COST,
+            config['COST_MATRIX_MEMORY_BUDGET_MB'] * 1024 * 1024, config['COST_MATRIX_BLOCK_SIZE']
+        )
+        bench = [bench[column] for column in columns]
+    candidates = members + bench
+    member_teams = [resource.TeamID for resource in members] + [None] * len(bench)
+
+    cost = []
+    if candidates:
+        prepared = prepare(candidates)
+        for project, req in role_list:
+            row = kernel.row_costs(project, req, prepared)
+            team_id = slot_teams[len(cost)]
+            for column, resource in enumerate(candidates):
+                # People already on the team stay qualified for it whatever their AvailableDate
+                if member_teams[column] != team_id and resource.AvailableDate is not None \
+                        and resource.AvailableDate > project.ProjectStartDate:
+                    row[column] = INFEASIBLE_COST
+            cost.append(row)
+
+    holder = _current_holders(cost, slot_teams, member_teams) if cost else [-1] * len(role_list)
+    slotted = {column for column in holder if column >= 0}
+    state = RebalanceState(cost, slot_teams, list(holder))
+    before_total, before_filled = state.total(), state.filled()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    moves, stopped = local_search(state, max(time_budget_ms - elapsed_ms, 0), max_moves) if cost else (0, 'converged')
+
+    # Minimal change set: resources whose team differs from the one stored
+    changes = []
+    for column, resource in enumerate(candidates):
+        slot = state.slot_of[column]
+        if slot >= 0:
+            new_team = slot_teams[slot]
+        elif column in slotted:
+            new_team = None  # Replaced: back to the bench
+        else:
+            new_team = member_teams[column]  # Bench, or surplus members left where they are
+        if new_team != member_teams[column]:
+            changes.append({
+                'ResourceID': resource.ResourceID,
+                'Name': resource.Name,
+                'FromTeamID': member_teams[column],
+                'ToTeamID': new_team,
+            })
+
+    if apply and changes:
+        _apply_changes(org_id, candidates, changes)
+
+    def score(total, filled):
+        # Unfilled roles are left out of the score, as in the solver reports
+        return -(total - (len(role_list) - filled) * EMPTY_COST) / SCORE_UNIT
+
+    result = {
+        'OrgID': org_id,
+        'teams': len(teams),
+        'roles': len(role_list),
+        'candidates': len(candidates),
+        'moves': moves,
+        'stopped': stopped,
+        'changes': changes,
+        'applied': bool(apply and changes),
+        'before': {'score': score(before_total, before_filled), 'filled_roles': before_filled},
+        'after': {'score': score(state.total(), state.filled()), 'filled_roles': state.filled()},
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
+    logger.info(
+        f"Rebalanced {len(teams)} teams of org {org_id}: {moves} move(s), {len(changes)} change(s), "
+        f"score {result['before']['score']:.2f} -> {result['after']['score']:.2f} ({stopped})."
+    )
+    return result
+
+
+def _apply_changes(org_id, candidates, changes):
+    """
+    Writes a change set: moved resources change team, replaced ones go back to
+    the bench, and the affected teams' TotalResources are recounted.
+    """
+    by_id = {resource.ResourceID: resource for resource in candidates}
+    affected_teams = set()
+    try:
+        for change in changes:
+            resource = by_id[change['ResourceID']]
+            resource.TeamID = change['ToTeamID']
+            resource.OnBench = change['ToTeamID'] is None
+            affected_teams.update(team for team in (change['FromTeamID'], change['ToTeamID']) if team is not None)
+        db.session.flush()
+        for team in Team.query.filter(Team.TeamID.in_(affected_teams)).all():
+            team.TotalResources = Resource.query.filter_by(TeamID=team.TeamID).count()
+        refresh_availability(org_id, resource_ids=list(by_id))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error applying rebalancing changes: {e}")
+        raise e
+    invalidate_bench_snapshot(org_id)
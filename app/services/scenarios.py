@@ -0,0 +1,305 @@
+# app/services/scenarios.py
+
+import atexit
+from datetime import date, timedelta
+import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+
+from flask import Flask, current_app
+
+from app.models import Resource
+from app.services.scheduling import build_commitment_index, staff_in_order, team_windows, upcoming_projects
+from app.services.scoring import compile_scoring_kernel, get_scoring_kernel
+from app.services.skills import local_resolver, normalize_requirements, normalize_resource_skills, skill_vocabulary
+from app.services.solvers import resolve_solver_name
+
+logger = logging.getLogger(__name__)
+
+BASELINE = 'baseline'
+
+# Settings the workers' bare app needs to build cost matrices; AUCTION_WORKERS is
+# pinned to 1 so parallel_auction does not start a pool inside a pool worker
+WORKER_CONFIG_KEYS = ('COST_MATRIX_MEMORY_BUDGET_MB', 'COST_MATRIX_BLOCK_SIZE', 'COST_MATRIX_TRACE_MEMORY')
+
+RESOURCE_FIELDS = ('ResourceID', 'Name', 'Rate', 'Skills', 'SkillIDs', 'SkillLevels', 'PastJobTitles',
+                   'Domain', 'AvailableDate', 'OnBench', 'TeamID')
+PROJECT_FIELDS = ('ProjectID', 'ProjectName', 'OrgID', 'RequiredResources', 'NumberOfDays',
+                  'ProjectStartDate', 'Technology', 'Domain')
+
+# Process pool shared by every request of this process (recreated after a fork)
+_pool = None
+_pool_pid = None
+_pool_workers = None
+
+# Worker side: the bare app scenarios run in, per config, and the snapshot of the
+# request being run (see _simulate_shared)
+_worker_apps = {}
+_worker_snapshot = {'key': None, 'snapshot': None}
+
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a date in YYYY-MM-DD format.")
+
+
+def _ids(values, field):
+    if not isinstance(values, list) or not all(isinstance(value, int) for value in values):
+        raise ValueError(f"{field} must be a list of integer IDs.")
+    return set(values)
+
+
+def load_snapshot(org_id, start_date, horizon_days, solver=None):
+    """
+    Reads everything a scenario needs into plain, picklable data: the
+    organization's resources, the projects without a team starting within the
+    horizon, the current teams' commitment windows, the skill vocabulary, the
+    scoring weights and the solver. Read-only.
+    """
+    end_date = start_date + timedelta(days=horizon_days)
+    resources = Resource.query.filter_by(OrgID=org_id).order_by(Resource.ResourceID).all()
+    projects = upcoming_projects(org_id, start_date, end_date)
+    kernel = get_scoring_kernel(org_id)
+    return {
+        'org_id': org_id,
+        'from': start_date,
+        'to': end_date,
+        'resources': [{field: getattr(resource, field) for field in RESOURCE_FIELDS} for resource in resources],
+        'projects': [{field: getattr(project, field) for field in PROJECT_FIELDS} for project in projects],
+        'windows': team_windows(org_id),
+        'vocabulary': skill_vocabulary(),
+        'kernel': (kernel.key, kernel.weights),
+        'solver': resolve_solver_name(org_id, solver),
+        'config': {key: current_app.config[key] for key in WORKER_CONFIG_KEYS},
+    }
+
+
+def prepare_scenario(scenario, snapshot, resolve):
+    """
+    Validates a scenario and turns its hypothetical resources and projects into
+    the snapshot's shape. Skills are normalized against the snapshot's vocabulary
+    (resolve; see local_resolver) so they match existing ones without registering
+    anything. Hypothetical entries get negative IDs.
+
+    A scenario is an object with a 'name' and any of:
+        add_resources: resources as for POST /resources, with an optional 'Count' of identical hires;
+        remove_resources: ResourceIDs leaving;
+        add_projects: projects as for POST /projects (always staffed, whatever their start date);
+        remove_projects: ProjectIDs not going ahead.
+
+    Raises:
+        ValueError: If the scenario is malformed.
+    """
+    if not isinstance(scenario, dict) or not scenario.get('name'):
+        raise ValueError("Each scenario must be an object with a name.")
+    name = str(scenario['name'])
+    unknown = set(scenario) - {'name', 'add_resources', 'remove_resources', 'add_projects', 'remove_projects'}
+    if unknown:
+        raise ValueError(f"Scenario '{name}': unknown field(s) {', '.join(sorted(unknown))}.")
+
+    resources = []
+    for data in scenario.get('add_resources', []):
+        if not isinstance(data, dict) or not data.get('Name'):
+            raise ValueError(f"Scenario '{name}': each added resource needs a Name.")
+        count = data.get('Count', 1)
+        if not isinstance(count, int) or count < 1:
+            raise ValueError(f"Scenario '{name}': Count must be a positive integer.")
+        skills, skill_ids, skill_levels = normalize_resource_skills(data.get('Skills', {}), resolve)
+        available_date = data.get('AvailableDate')
+        available_date = _parse_date(available_date, 'AvailableDate') if available_date else None
+        for number in range(count):
+            resources.append({
+                'ResourceID': -(len(resources) + 1),
+                'Name': data['Name'] if count == 1 else f"{data['Name']} #{number + 1}",
+                'Rate': data.get('Rate', 0),
+                'Skills': skills,
+                'SkillIDs': skill_ids,
+                'SkillLevels': skill_levels,
+                'PastJobTitles': data.get('PastJobTitles', {}),
+                'Domain': data.get('Domain', []),
+                'AvailableDate': available_date,
+                'OnBench': True,
+                'TeamID': None,
+            })
+
+    projects = []
+    for data in scenario.get('add_projects', []):
+        if not isinstance(data, dict) or not data.get('ProjectName'):
+            raise ValueError(f"Scenario '{name}': each added project needs a ProjectName.")
+        if not isinstance(data.get('RequiredResources'), list):
+            raise ValueError(f"Scenario '{name}': RequiredResources of '{data['ProjectName']}' must be a list.")
+        days = data.get('NumberOfDays')
+        if not isinstance(days, int) or days < 1:
+            raise ValueError(f"Scenario '{name}': NumberOfDays of '{data['ProjectName']}' must be a positive integer.")
+        projects.append({
+            'ProjectID': -(len(projects) + 1),
+            'ProjectName': data['ProjectName'],
+            'OrgID': snapshot['org_id'],
+            'RequiredResources': normalize_requirements(data['RequiredResources'], resolve),
+            'NumberOfDays': days,
+            'ProjectStartDate': _parse_date(data.get('ProjectStartDate'), 'ProjectStartDate'),
+            'Technology': data.get('Technology', []),
+            'Domain': data.get('Domain', []),
+        })
+
+    return {
+        'name': name,
+        'add_resources': resources,
+        'remove_resources': _ids(scenario.get('remove_resources', []), 'remove_resources'),
+        'add_projects': projects,
+        'remove_projects': _ids(scenario.get('remove_projects', []), 'remove_projects'),
+    }
+
+
+def _worker_app(config):
+    key = tuple(sorted(config.items()))
+    app = _worker_apps.get(key)
+    if app is None:
+        # Just enough of an app for find_optimal_assignment; no database
+        app = Flask('scenarios')
+        app.config.update(config, AUCTION_WORKERS=1)
+        _worker_apps[key] = app
+    return app
+
+
+def simulate_scenario(snapshot, scenario):
+    """
+    Staffs the snapshot's projects with the scenario applied, in memory (see
+    app.services.scheduling.staff_in_order). Runs in a pool worker.
+
+    Returns:
+        dict: Fill rate and unfilled roles of the scenario, overall and per project.
+    """
+    removed = scenario['remove_resources']
+    resources = [
+        SimpleNamespace(**data)
+        for data in snapshot['resources'] + scenario['add_resources']
+        if data['ResourceID'] not in removed
+    ]
+    projects = [
+        SimpleNamespace(**data)
+        for data in snapshot['projects'] + scenario['add_projects']
+        if data['ProjectID'] not in scenario['remove_projects']
+    ]
+    projects.sort(key=lambda project: (project.ProjectStartDate, project.ProjectID))
+    windows = [window for window in snapshot['windows'] if window[0] not in removed]
+
+    key, weights = snapshot['kernel']
+    kernel = compile_scoring_kernel(key, **weights)
+    with _worker_app(snapshot['config']).app_context():
+        index = build_commitment_index(resources, windows)
+        plan, filled_roles, unfilled_total = staff_in_order(projects, resources, index, kernel, snapshot['solver'])
+
+    unfilled_roles = {}
+    for entry in plan:
+        for role, count in entry['UnfilledRoles'].items():
+            unfilled_roles[role] = unfilled_roles.get(role, 0) + count
+    roles = filled_roles + unfilled_total
+    return {
+        'name': scenario['name'],
+        'projects': len(plan),
+        'roles': roles,
+        'filled_roles': filled_roles,
+        'fill_rate': round(filled_roles / roles, 4) if roles else 1.0,
+        'unfilled_roles': unfilled_roles,
+        'plan': plan,
+    }
+
+
+def _simulate_shared(snapshot_path, key, scenario):
+    """
+    simulate_scenario in a pool worker, on the snapshot run_scenarios wrote to
+    snapshot_path: each worker reads it once per request instead of receiving a
+    copy with every scenario.
+    """
+    if _worker_snapshot['key'] != key:
+        with open(snapshot_path, 'rb') as f:
+            _worker_snapshot.update(key=key, snapshot=pickle.load(f))
+    return simulate_scenario(_worker_snapshot['snapshot'], scenario)
+
+
+def _get_pool(workers):
+    global _pool, _pool_pid, _pool_workers
+    if _pool is None or _pool_pid != os.getpid() or _pool_workers != workers:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # forkserver: workers never inherit the web worker's threads, locks or DB connections
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
+        _pool_pid, _pool_workers = os.getpid(), workers
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_scenarios(org_id, scenarios, start_date, horizon_days, solver=None):
+    """
+    Answers what-if questions ("what if we win these projects and hire these
+    people?") without touching the database.
+
+    One snapshot of the organization is read, then every scenario, plus an
+    unchanged baseline, is staffed from it in parallel in a process pool
+    (SCENARIO_WORKERS). The snapshot reaches the pool once, as a temporary
+    file each worker loads; only the scenarios are sent per task.
+
+    Args:
+        org_id (str): Organization to simulate.
+        scenarios (list): Scenario objects (see prepare_scenario).
+        start_date (date): First day of the horizon.
+        horizon_days (int): Existing projects starting later are left out.
+        solver (str, optional): Assignment solver backend (see app.services.solvers).
+
+    Returns:
+        dict: The baseline and each scenario's results, in request order.
+
+    Raises:
+        ValueError: If a scenario is malformed.
+    """
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("scenarios must be a non-empty list.")
+    max_scenarios = current_app.config['MAX_SCENARIOS']
+    if len(scenarios) > max_scenarios:
+        raise ValueError(f"At most {max_scenarios} scenarios can be run at once.")
+
+    snapshot = load_snapshot(org_id, start_date, horizon_days, solver)
+    resolve = local_resolver(snapshot['vocabulary'])
+    prepared = [prepare_scenario({'name': BASELINE}, snapshot, resolve)]
+    prepared += [prepare_scenario(scenario, snapshot, resolve) for scenario in scenarios]
+    names = [scenario['name'] for scenario in prepared]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Scenario names must be unique ('{BASELINE}' is reserved).")
+    logger.info(f"Running {len(scenarios)} scenario(s) on {len(snapshot['resources'])} resources and "
+                f"{len(snapshot['projects'])} project(s) for org {org_id}.")
+
+    workers = current_app.config['SCENARIO_WORKERS'] or os.cpu_count() or 1
+    if workers <= 1:
+        results = [simulate_scenario(snapshot, scenario) for scenario in prepared]
+    else:
+        fd, snapshot_path = tempfile.mkstemp(prefix='scenario-snapshot-', suffix='.pickle')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            simulate = partial(_simulate_shared, snapshot_path, uuid.uuid4().hex)
+            results = list(_get_pool(workers).map(simulate, prepared))
+        finally:
+            os.remove(snapshot_path)
+
+    return {
+        'OrgID': org_id,
+        'From': snapshot['from'].isoformat(),
+        'To': snapshot['to'].isoformat(),
+        'solver': snapshot['solver'],
+        'baseline': results[0],
+        'scenarios': results[1:],
+    }
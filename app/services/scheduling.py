@@ -0,0 +1,149 @@
+# app/services/scheduling.py
+
+from datetime import timedelta
+import logging
+
+from app.models import db
+from app.models import Resource, Project, Team
+from app.services.intervals import CommitmentIndex, FAR_PAST, FAR_FUTURE
+from app.services.scoring import get_scoring_kernel
+from app.services.team_formation import find_optimal_assignment
+
+logger = logging.getLogger(__name__)
+
+
+def project_window(project):
+    """
+    Days a project occupies its team, as a half-open [start, end) range of date ordinals.
+    """
+    start = project.ProjectStartDate.toordinal()
+    return start, start + max(project.NumberOfDays or 0, 1)
+
+
+def team_windows(org_id):
+    """
+    Lists (ResourceID, start, end) for every resource of the organization on a
+    team, the window of the team's project.
+    """
+    rows = db.session.query(
+        Resource.ResourceID, Project.ProjectStartDate, Project.NumberOfDays
+    ).join(Team, Resource.TeamID == Team.TeamID).join(Project, Team.ProjectID == Project.ProjectID).filter(
+        Resource.OrgID == org_id
+    ).all()
+    return [
+        (resource_id, start_date.toordinal(), start_date.toordinal() + max(days or 0, 1))
+        for resource_id, start_date, days in rows
+    ]
+
+
+def build_commitment_index(resources, windows):
+    """
+    Indexes what each resource is already committed to:
+        - the project of its current team (windows, see team_windows);
+        - everything before its AvailableDate (the first day it is free);
+        - everything, for a resource off the bench with neither a team nor an AvailableDate.
+    """
+    index = CommitmentIndex()
+    for resource_id, start, end in windows:
+        index.add(resource_id, start, end)
+    for resource in resources:
+        if resource.AvailableDate is not None:
+            index.add(resource.ResourceID, FAR_PAST, resource.AvailableDate.toordinal())
+        elif not resource.OnBench and resource.TeamID is None:
+            index.add(resource.ResourceID, FAR_PAST, FAR_FUTURE)
+    return index
+
+
+def upcoming_projects(org_id, start_date, end_date):
+    """
+    Projects of the organization without a team starting in [start_date, end_date), in start date order.
+    """
+    return Project.query.outerjoin(Team, Team.ProjectID == Project.ProjectID).filter(
+        Project.OrgID == org_id,
+        Team.TeamID == None,
+        Project.ProjectStartDate >= start_date,
+        Project.ProjectStartDate < end_date
+    ).order_by(Project.ProjectStartDate, Project.ProjectID).all()
+
+
+def staff_in_order(projects, resources, index, kernel, solver=None):
+    """
+    Staffs projects one after the other in the given order. For each one,
+    candidates are the resources free over the whole project window, checked
+    against the commitment index (O(log k) per candidate for k commitments); the
+    people it is given are then committed for its window, so they can staff any
+    later project that starts once it ends. Nothing is written to the database.
+
+    Returns:
+        tuple: (list of per-project plans, filled roles, unfilled roles).
+    """
+    plan = []
+    filled_roles = 0
+    unfilled_total = 0
+    for project in projects:
+        start, end = project_window(project)
+        candidates = [resource for resource in resources if index.is_free(resource.ResourceID, start, end)]
+        assignments, unfilled_roles = [], {}
+        if candidates:
+            # Availability was checked over the project window, whatever OnBench says today
+            assignments, unfilled_roles = find_optimal_assignment(
+                [project], candidates, kernel=kernel, solver=solver, check_bench=False
+            )
+        else:
+            for req in project.RequiredResources:
+                unfilled_roles[req['Role']] = unfilled_roles.get(req['Role'], 0) + req['Quantity']
+
+        for _project, _req, resource in assignments:
+            index.add(resource.ResourceID, start, end)
+        filled_roles += len(assignments)
+        unfilled_total += sum(unfilled_roles.values())
+        plan.append({
+            'ProjectID': project.ProjectID,
+            'ProjectName': project.ProjectName,
+            'StartDate': project.ProjectStartDate.isoformat(),
+            'EndDate': (project.ProjectStartDate + timedelta(days=end - start)).isoformat(),
+            'Candidates': len(candidates),
+            'Assignments': [
+                {'ResourceID': resource.ResourceID, 'Name': resource.Name, 'Role': req['Role']}
+                for _project, req, resource in assignments
+            ],
+            'UnfilledRoles': dict(unfilled_roles),
+        })
+        logger.info(f"Planned '{project.ProjectName}': {len(assignments)} role(s) filled from {len(candidates)} candidates.")
+    return plan, filled_roles, unfilled_total
+
+
+def plan_portfolio(org_id, start_date, horizon_days, solver=None):
+    """
+    Staffs every upcoming project of an organization over a time horizon.
+
+    Projects without a team that start within the horizon are staffed in start
+    date order against the resources' current commitments (see staff_in_order).
+
+    Args:
+        org_id (str): Organization to plan for.
+        start_date (date): First day of the horizon.
+        horizon_days (int): Length of the horizon; projects starting later are left out.
+        solver (str, optional): Assignment solver backend (see app.services.solvers).
+
+    Returns:
+        dict: The planned teams and unfilled roles per project, and a summary.
+    """
+    end_date = start_date + timedelta(days=horizon_days)
+    projects = upcoming_projects(org_id, start_date, end_date)
+    resources = Resource.query.filter_by(OrgID=org_id).order_by(Resource.ResourceID).all()
+    logger.info(f"Planning {len(projects)} project(s) over {horizon_days} days with {len(resources)} resources for org {org_id}.")
+
+    index = build_commitment_index(resources, team_windows(org_id))
+    plan, filled_roles, unfilled_total = staff_in_order(projects, resources, index, get_scoring_kernel(org_id), solver)
+    return {
+        'OrgID': org_id,
+        'From': start_date.isoformat(),
+        'To': end_date.isoformat(),
+        'projects': plan,
+        'summary': {
+            'projects': len(plan),
+            'filled_roles': filled_roles,
+            'unfilled_roles': unfilled_total,
+        },
+    }
@@ -0,0 +1,161 @@
+# app/services/scoring.py
+
+from collections import namedtuple
+from functools import lru_cache
+import logging
+
+from app.models import WeightProfile
+from app.services.utils import (
+    resource_score_features, role_skill_requirements, to_fixed, project_affinity_mask, DEFAULT_RATE, DEFAULT_WEIGHTS,
+    RATE_SCALE, EXPERIENCE_SCALE, SKILL_SCALE, SCORE_SCALE, WEIGHT_SCALE, SCORE_UNIT
+)
+
+logger = logging.getLogger(__name__)
+
+INFEASIBLE_COST = 1000000 * SCORE_UNIT  # High cost to discourage assignment
+
+# Prepared block of resources: their ScoreFeatures, eligibility (OnBench) flags,
+# weighted resource-level scores (everything that does not depend on the role),
+# domain/technology bitmasks and their affinity scores by project bitmask
+PreparedResources = namedtuple('PreparedResources', ['features', 'eligible', 'base_scores', 'affinity_masks', 'affinities'])
+
+
+def feature_vector(features):
+    """
+    Resource-level feature vector (rate, experience) in SCORE_SCALE units, so that
+    the dot product with integer weights in hundredths is a score in SCORE_UNIT.
+    """
+    return (
+        (DEFAULT_RATE * RATE_SCALE - features.rate_cents) * (SCORE_SCALE // RATE_SCALE),
+        features.experience * (SCORE_SCALE // EXPERIENCE_SCALE),
+    )
+
+
+def _score_features(resource, snapshot):
+    features = snapshot.score_features(resource) if snapshot is not None else None
+    return features if features is not None else resource_score_features(resource)
+
+
+class ScoringKernel:
+    """
+    Candidate scoring compiled from one set of weights.
+
+    Rate and experience do not depend on the role: prepare() builds their feature
+    matrix for a block of resources and applies the weight vector once per resource.
+    row_costs() then only adds the role's skill term, matching skill IDs and
+    levels (names were normalized when written), and the project's affinity term, one
+    AND and popcount of bitmasks per resource. Scores are exact in fixed point
+    (SCORE_UNIT stands for 1.0) and rank candidates as the former Decimal
+    computation (app/Test/utils.calculate_weight) did.
+    """
+
+    def __init__(self, key, rate, experience, skill_level, affinity=0):
+        self.key = key
+        self.weights = {'rate': rate, 'experience': experience, 'skill_level': skill_level, 'affinity': affinity}
+        self.resource_weights = (rate, experience)
+        self.skill_weight = skill_level * (SCORE_SCALE // SKILL_SCALE)
+        self.affinity_weight = affinity
+
+    def prepare(self, resources, check_bench=True, snapshot=None):
+        """
+        Prepares a block of resources for row_costs(). With check_bench unset, every
+        resource is eligible whatever its OnBench flag (availability is then the
+        caller's concern, e.g. over a future date range).
+
+        With a BenchSnapshot, the features of the resources it holds are read from
+        it (shared by every worker on the host) instead of being extracted from
+        the rows; the others are extracted as usual.
+        """
+        features = [_score_features(resource, snapshot) for resource in resources]
+        rate_weight, experience_weight = self.resource_weights
+        base_scores = [
+            rate_weight * rate + experience_weight * experience
+            for rate, experience in map(feature_vector, features)
+        ]
+        eligible = [bool(resource.OnBench) or not check_bench for resource in resources]
+        affinity_masks = [feature.affinity_mask for feature in features]
+        return PreparedResources(features, eligible, base_scores, affinity_masks, {})
+
+    def affinity_scores(self, project, prepared):
+        """
+        Weighted affinity of every prepared resource with the project (see utils.affinity_score).
+        Computed once per project mask for the block, since every role of a project shares it.
+        """
+        project_mask = project_affinity_mask(project)
+        scores = prepared.affinities.get(project_mask)
+        if scores is None:
+            count = project_mask.bit_count()
+            if not count or not self.affinity_weight:
+                scores = [0] * len(prepared.affinity_masks)
+            else:
+                weight, double_scale, denominator = self.affinity_weight, 2 * SCORE_SCALE, 2 * count
+                scores = [
+                    weight * ((double_scale * (mask & project_mask).bit_count() + count) // denominator)
+                    for mask in prepared.affinity_masks
+                ]
+            prepared.affinities[project_mask] = scores
+        return scores
+
+    def row_costs(self, project, req, prepared):
+        """
+        Costs of one role of a project for every prepared resource; INFEASIBLE_COST
+        for resources not eligible (on the bench) or lacking a required skill level.
+        """
+        required = role_skill_requirements(req)
+        if any(level == 0 for _skill, level in required):
+            # An unrecognized required level is never met
+            return [INFEASIBLE_COST] * len(prepared.base_scores)
+        count = len(required)
+
+        costs = []
+        skill_weight = self.skill_weight
+        affinities = self.affinity_scores(project, prepared)
+        for features, eligible, base, affinity in zip(prepared.features, prepared.eligible,
+                                                      prepared.base_scores, affinities):
+            if not eligible:
+                costs.append(INFEASIBLE_COST)
+                continue
+            levels = features.skill_levels
+            total = 0
+            for skill, level in required:
+                value = levels.get(skill, 1)  # Missing skills count as beginner
+                if value < level:
+                    costs.append(INFEASIBLE_COST)
+                    break
+                total += value
+            else:
+                # Exact average of the skill levels (see utils.SKILL_SCALE)
+                average = (2 * total * SKILL_SCALE + count) // (2 * count) if count else 0
+                costs.append(-(base + skill_weight * average + affinity))
+        return costs
+
+
+@lru_cache(maxsize=256)
+def compile_scoring_kernel(key, rate, experience, skill_level, affinity=0):
+    """
+    Compiles the scoring kernel for integer weights in hundredths. Cached per key
+    (and weights), so each profile version is compiled once per worker.
+    """
+    logger.info(f"Compiling scoring kernel {key} (weights {rate}/{experience}/{skill_level}/{affinity}).")
+    return ScoringKernel(key, rate, experience, skill_level, affinity)
+
+
+def default_scoring_kernel():
+    return compile_scoring_kernel(('default',), **DEFAULT_WEIGHTS)
+
+
+def get_scoring_kernel(org_id):
+    """
+    Returns the compiled kernel for the organization's weight profile, or the
+    default weights (rate 0.5, experience 1.0, skill level 1.0, affinity 1.0) if it has none.
+    """
+    profile = WeightProfile.query.filter_by(OrgID=org_id).first() if org_id else None
+    if profile is None:
+        return default_scoring_kernel()
+    return compile_scoring_kernel(
+        (profile.ProfileID, profile.Version),
+        to_fixed(profile.RateWeight, WEIGHT_SCALE),
+        to_fixed(profile.ExperienceWeight, WEIGHT_SCALE),
+        to_fixed(profile.SkillLevelWeight, WEIGHT_SCALE),
+        to_fixed(profile.AffinityWeight, WEIGHT_SCALE)
+    )
@@ -0,0 +1,53 @@
+# app/services/serving.py
+#
+# Worker lifecycle hooks for the gunicorn serving profile (gunicorn.conf.py).
+
+import logging
+import time
+
+from sqlalchemy import text
+
+from app import db
+from app.models import Organization
+from app.services.availability import get_availability_index
+from app.services.scoring import default_scoring_kernel, get_scoring_kernel
+
+logger = logging.getLogger(__name__)
+
+
+def after_fork(app):
+    """
+    Drops the database connections a worker inherited from a preloading master.
+
+    The pool is replaced without closing the inherited sockets (close=False):
+    they are still the master's, and closing them from a child would end its
+    sessions. The per-process caches already start over in a new pid.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def warm_up(app):
+    """
+    Prepares a new worker before it takes requests: opens a pooled connection,
+    compiles the default scoring kernel and, for up to WARMUP_ORGS organizations,
+    maps the bench snapshot, builds the availability index and compiles the
+    organization's kernel. A failure is logged, never fatal: the same work is
+    done lazily by the first requests.
+    """
+    limit = app.config['WARMUP_ORGS']
+    started = time.perf_counter()
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+            default_scoring_kernel()
+            org_ids = [org_id for (org_id,) in Organization.query.with_entities(Organization.OrgID)
+                       .order_by(Organization.OrgID).limit(limit)] if limit else []
+            for org_id in org_ids:
+                get_availability_index(org_id)
+                get_scoring_kernel(org_id)
+            logger.info(f"Worker warmed up for {len(org_ids)} org(s) in {(time.perf_counter() - started) * 1000:.0f}ms.")
+        except Exception as e:
+            logger.warning(f"Worker warmup failed: {e}")
+        finally:
+            db.session.remove()
@@ -0,0 +1,132 @@
+# app/services/skills.py
+
+import logging
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import db
+from app.models import Skill
+from app.services.utils import normalize_skill_name, SKILL_LEVELS
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_skills(names):
+    """
+    Returns the vocabulary entries of the given skill names, registering the
+    names seen for the first time (the spelling used first becomes canonical).
+
+    Args:
+        names (iterable): Skill names as written by clients.
+
+    Returns:
+        dict: Normalized name -> (SkillID, canonical name).
+    """
+    spellings = {}
+    for name in names:
+        spellings.setdefault(normalize_skill_name(name), ' '.join(str(name).split()))
+    if not spellings:
+        return {}
+
+    def lookup(keys):
+        rows = db.session.query(Skill.NormalizedName, Skill.SkillID, Skill.Name).filter(
+            Skill.NormalizedName.in_(keys)
+        ).all()
+        return {normalized: (skill_id, name) for normalized, skill_id, name in rows}
+
+    entries = lookup(list(spellings))
+    missing = [key for key in spellings if key not in entries]
+    if missing:
+        # Concurrent writers may register the same name: keep whichever row wins
+        db.session.execute(
+            insert(Skill).on_conflict_do_nothing(index_elements=['NormalizedName']),
+            [{'Name': spellings[key], 'NormalizedName': key} for key in missing]
+        )
+        entries.update(lookup(missing))
+        logger.info(f"Registered {len(missing)} new skill(s) in the vocabulary.")
+    return entries
+
+
+def _numeric_level(details):
+    level = details.get('level', 'beginner') if isinstance(details, dict) else details
+    return SKILL_LEVELS.get(str(level).strip().lower(), 0)
+
+
+def normalize_resource_skills(skills, resolve=resolve_skills):
+    """
+    Normalizes a resource's skills for storage: canonical names, lowercased
+    levels, and the parallel SkillIDs/SkillLevels arrays used for matching.
+    Spellings of the same skill are merged, keeping the highest level.
+
+    Args:
+        skills (dict): {skill name: {'level': ...}} as sent by clients.
+        resolve (callable): Name resolver (defaults to the skills table).
+
+    Returns:
+        tuple: (Skills dict, list of skill IDs, list of numeric levels).
+
+    Raises:
+        ValueError: If skills is not an object.
+    """
+    if not isinstance(skills, dict):
+        raise ValueError("Skills must be an object mapping skill names to levels")
+    entries = resolve(skills)
+    canonical, levels = {}, {}
+    for name, details in skills.items():
+        skill_id, canonical_name = entries[normalize_skill_name(name)]
+        level = _numeric_level(details)
+        if skill_id in levels and levels[skill_id] >= level:
+            continue
+        normalized = dict(details) if isinstance(details, dict) else {'level': details}
+        normalized['level'] = str(normalized.get('level', 'beginner')).strip().lower()
+        canonical[canonical_name] = normalized
+        levels[skill_id] = level
+    skill_ids = sorted(levels)
+    return canonical, skill_ids, [levels[skill_id] for skill_id in skill_ids]
+
+
+def normalize_requirements(required_resources, resolve=resolve_skills):
+    """
+    Normalizes the skills of every role of a project the same way, adding a
+    'SkillIDs' list of [skill ID, numeric level] pairs to each requirement.
+
+    Raises:
+        ValueError: If a requirement's Skills is not an object.
+    """
+    requirements = []
+    for req in required_resources or []:
+        skills = req.get('Skills', {})
+        if not isinstance(skills, dict):
+            raise ValueError(f"Skills of role '{req.get('Role')}' must be an object mapping skill names to levels")
+        canonical, skill_ids, levels = normalize_resource_skills(skills, resolve)
+        requirements.append(dict(req, Skills=canonical, SkillIDs=[list(pair) for pair in zip(skill_ids, levels)]))
+    return requirements
+
+
+def local_resolver(initial=None):
+    """
+    Returns a resolver backed by an in-memory vocabulary instead of the skills
+    table, for data that never reaches the database (benchmarks, imports, what-if
+    scenarios). initial seeds it with existing entries (normalized name ->
+    (SkillID, canonical name)); names it does not know get IDs after them.
+    """
+    vocabulary = dict(initial or {})
+    next_id = [max((skill_id for skill_id, _name in vocabulary.values()), default=0) + 1]
+
+    def resolve(names):
+        for name in names:
+            key = normalize_skill_name(name)
+            if key not in vocabulary:
+                vocabulary[key] = (next_id[0], ' '.join(str(name).split()))
+                next_id[0] += 1
+        return {normalize_skill_name(name): vocabulary[normalize_skill_name(name)] for name in names}
+    resolve.vocabulary = vocabulary
+    return resolve
+
+
+def skill_vocabulary():
+    """
+    Reads the whole skills table as normalized name -> (SkillID, canonical name).
+    """
+    rows = db.session.query(Skill.NormalizedName, Skill.SkillID, Skill.Name).all()
+    return {normalized: (skill_id, name) for normalized, skill_id, name in rows}
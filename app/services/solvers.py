@@ -0,0 +1,485 @@
+# app/services/solvers.py
+
+from collections import deque
+import heapq
+import json
+import logging
+import math
+import operator
+import time
+
+from flask import current_app
+from munkres import Munkres
+
+from app.services.utils import SCORE_UNIT
+from app.services.cost_matrix import DEFAULT_CELL_BYTES
+
+logger = logging.getLogger(__name__)
+
+# name -> solver(cost_matrix, **options) returning a list of (row, column) pairs.
+# Cost matrices are rectangular lists of rows, or CompactCostMatrix (read-only
+# rows); each row and column is used at most once, and rows are left out only
+# when there are fewer columns than rows.
+SOLVERS = {}
+
+# name -> (bytes per cell of the solver's working copy of its matrix, pads it to a
+# square), from which team formation sizes the matrix it hands over (see
+# app.services.cost_matrix.candidates_per_role)
+SOLVER_MEMORY = {}
+
+# Solvers taking a time_budget_ms option and finishing within it
+BUDGETED_SOLVERS = set()
+
+DUMMY = -2  # Owner marker for the dummy rows of the auction solver
+AUGMENT_SHARE = 0.8  # Share of the anytime solver's time left after its greedy start for exact augmentations
+
+def register_solver(name, cell_bytes=DEFAULT_CELL_BYTES, pads_square=False, budgeted=False):
+    """
+    Decorator registering an assignment solver under the given name, with the
+    memory it needs per cell of its matrix (see SOLVER_MEMORY) and whether it
+    honours a time_budget_ms (see BUDGETED_SOLVERS).
+    """
+    def decorator(func):
+        SOLVERS[name] = func
+        SOLVER_MEMORY[name] = (cell_bytes, pads_square)
+        if budgeted:
+            BUDGETED_SOLVERS.add(name)
+        return func
+    return decorator
+
+def get_solver(name):
+    """
+    Looks up a registered solver.
+
+    Raises:
+        ValueError: If no solver is registered under that name.
+    """
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver '{name}'. Available solvers: {', '.join(sorted(SOLVERS))}")
+
+def resolve_solver_name(org_id, requested=None):
+    """
+    Picks the solver for a request: the requested one, else the organization's
+    configured backend (ORG_SOLVERS), else DEFAULT_SOLVER.
+    """
+    if requested:
+        get_solver(requested)  # Validate early
+        return requested
+    org_solvers = current_app.config['ORG_SOLVERS']
+    if isinstance(org_solvers, str):
+        org_solvers = json.loads(org_solvers or '{}')
+    return org_solvers.get(org_id, current_app.config['DEFAULT_SOLVER'])
+
+def solve_assignment(cost_matrix, solver='munkres', **options):
+    """
+    Solves an assignment problem with the named backend.
+
+    Args:
+        cost_matrix (list): Rows of costs (lower is better).
+        solver (str): Registered solver name.
+        **options: Backend-specific options.
+
+    Returns:
+        list: (row, column) pairs.
+    """
+    if not cost_matrix or not cost_matrix[0]:
+        return []
+    return get_solver(solver)(cost_matrix, **options)
+
+def _transposed(solver, cost_matrix, **options):
+    # Solve the columns-as-rows problem and flip the pairs back
+    transposed = [list(column) for column in zip(*cost_matrix)]
+    return sorted((row, column) for column, row in solver(transposed, **options))
+
+@register_solver('munkres', cell_bytes=64, pads_square=True)  # Several padded n x n matrices of pointers
+def solve_munkres(cost_matrix, **options):
+    """
+    Reference Hungarian algorithm (munkres package). Pads the matrix to a square.
+    """
+    # munkres pads by extending rows in place: hand it lists
+    return Munkres().compute([list(row) for row in cost_matrix])
+
+def _augment_rows(cost_matrix, deadline=None):
+    """
+    Shortest augmenting path algorithm with dual potentials (n rows <= m columns),
+    adding one row at a time. After each row, the rows added so far are optimally
+    assigned among themselves, and the potentials stay dual feasible: u[i] + v[j] <= cost
+    and v[j] <= 0. If the deadline passes, the current row is abandoned with the
+    assignment unchanged.
+
+    Returns:
+        tuple: (match, u, v, rows done) with 1-based arrays; match[j] is the row
+        (1-based, 0 if free) holding column j.
+    """
+    n, m = len(cost_matrix), len(cost_matrix[0])
+    # 1-based arrays; column 0 is a virtual column used to start each augmentation
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    match = [0] * (m + 1)  # match[j] = row assigned to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_reduced = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                match[0] = 0
+                return match, u, v, i - 1
+            used[j0] = True
+            i0 = match[j0]
+            row = cost_matrix[i0 - 1]
+            delta = math.inf
+            j1 = 0
+            u_i0 = u[i0]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = row[j - 1] - u_i0 - v[j]
+                    if reduced < min_reduced[j]:
+                        min_reduced[j] = reduced
+                        way[j] = j0
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    match[0] = 0
+    return match, u, v, n
+
+@register_solver('lap', cell_bytes=0)  # Reads the matrix it is given
+def solve_lap(cost_matrix, **options):
+    """
+    Exact shortest augmenting path algorithm with dual potentials (O(n^2 m) for
+    n rows <= m columns). Works on the rectangular matrix without padding.
+    """
+    n, m = len(cost_matrix), len(cost_matrix[0])
+    if n > m:
+        return _transposed(solve_lap, cost_matrix, **options)
+    match, _u, _v, _done = _augment_rows(cost_matrix)
+    return sorted((match[j] - 1, j - 1) for j in range(1, m + 1) if match[j])
+
+@register_solver('greedy', cell_bytes=120)  # A (cost, row, column) tuple per cell, sorted
+def solve_greedy(cost_matrix, **options):
+    """
+    Greedy heuristic: repeatedly takes the cheapest remaining (row, column) pair.
+    Fast, but with no optimality guarantee.
+    """
+    cells = sorted(
+        (cost, row, column)
+        for row, costs in enumerate(cost_matrix)
+        for column, cost in enumerate(costs)
+    )
+    used_rows, used_columns = set(), set()
+    pairs = []
+    limit = min(len(cost_matrix), len(cost_matrix[0]))
+    for cost, row, column in cells:
+        if row in used_rows or column in used_columns:
+            continue
+        pairs.append((row, column))
+        used_rows.add(row)
+        used_columns.add(column)
+        if len(pairs) == limit:
+            break
+    return sorted(pairs)
+
+def _lowest_prices(heap, prices):
+    """
+    Pops stale entries and returns the (price, column) of the cheapest column
+    without removing it from the heap.
+    """
+    while heap[0][0] != prices[heap[0][1]]:
+        heapq.heappop(heap)
+    return heap[0]
+
+def _dummy_bid(heap, prices, epsilon):
+    """
+    A dummy row values every column at zero, so it bids for the cheapest one.
+    Raises that column's price and returns it; the caller pushes the new price.
+    """
+    _lowest_prices(heap, prices)
+    lowest_price, best_j = heapq.heappop(heap)
+    second_price = _lowest_prices(heap, prices)[0] if heap else lowest_price
+    prices[best_j] = second_price + epsilon
+    return best_j
+
+def _auction_phase(benefits, prices, epsilon):
+    """
+    One forward auction round (Gauss-Seidel bidding) at a fixed epsilon.
+
+    With fewer rows than columns the problem is made square with zero-benefit
+    dummy rows. Dummies are interchangeable, so they are tracked as a count and
+    always bid for the cheapest column through a price heap instead of scanning.
+    Prices are updated in place; returns the column assigned to each real row.
+    """
+    n, m = len(benefits), len(prices)
+    owner = [-1] * m  # Real row index, DUMMY, or -1
+    assigned = [-1] * n
+    unassigned = deque(range(n))
+    free_dummies = m - n
+    heap = [(price, j) for j, price in enumerate(prices)]
+    heapq.heapify(heap)
+
+    while unassigned or free_dummies:
+        if unassigned:
+            bidder = unassigned.popleft()
+            row = benefits[bidder]
+            best_j, best_value, second_value = -1, -math.inf, -math.inf
+            for j in range(m):
+                value = row[j] - prices[j]
+                if value > best_value:
+                    second_value = best_value
+                    best_value, best_j = value, j
+                elif value > second_value:
+                    second_value = value
+            if second_value == -math.inf:
+                second_value = best_value
+            prices[best_j] += best_value - second_value + epsilon
+        else:
+            bidder = DUMMY
+            free_dummies -= 1
+            best_j = _dummy_bid(heap, prices, epsilon)
+        heapq.heappush(heap, (prices[best_j], best_j))
+
+        previous = owner[best_j]
+        owner[best_j] = bidder
+        if bidder != DUMMY:
+            assigned[bidder] = best_j
+        if previous == DUMMY:
+            free_dummies += 1
+        elif previous >= 0:
+            assigned[previous] = -1
+            unassigned.append(previous)
+    return assigned
+
+def auction_epsilons(spread, columns, scaling_factor, precision):
+    """
+    Epsilon schedule for epsilon scaling: from a quarter of the benefit range
+    (spread) down to precision / (columns + 1), so the result is within precision of optimal.
+
+    precision is a score (a weight of 1.0 is 1) and costs are in SCORE_UNIT fixed
+    point, so the final epsilon is scaled to match: a raw precision would take
+    epsilon below the float resolution of costs near INFEASIBLE_COST, and the
+    bidding would never settle.
+    """
+    final = precision * SCORE_UNIT / (columns + 1)
+    epsilon = max(spread / 4.0, final)
+    schedule = []
+    while epsilon > final:
+        schedule.append(epsilon)
+        epsilon /= scaling_factor
+    schedule.append(final)
+    return schedule
+
+@register_solver('auction')
+def solve_auction(cost_matrix, scaling_factor=5.0, precision=1e-3, **options):
+    """
+    Bertsekas forward auction with epsilon scaling.
+
+    The final assignment is within `precision` of the optimal total cost, as a
+    score (costs / SCORE_UNIT).
+    """
+    n, m = len(cost_matrix), len(cost_matrix[0])
+    if n > m:
+        return _transposed(solve_auction, cost_matrix, scaling_factor=scaling_factor,
+                           precision=precision, **options)
+    benefits = [[-float(cost) for cost in row] for row in cost_matrix]
+    prices = [0.0] * m
+    assigned = []
+    spread = max(map(max, benefits)) - min(map(min, benefits))
+    for epsilon in auction_epsilons(spread, m, scaling_factor, precision):
+        assigned = _auction_phase(benefits, prices, epsilon)
+    return [(row, column) for row, column in enumerate(assigned)]
+
+def _greedy_fill(costs, rows, taken, candidates=8):
+    """
+    Greedily assigns rows to columns not yet taken: cheapest (row, column) pair
+    first among each row's few cheapest free columns, then any row left over
+    takes its cheapest remaining column. Marks the chosen columns in `taken`.
+
+    Returns:
+        list: (row, column) pairs.
+    """
+    free = [column for column, used in enumerate(taken) if not used]
+    cells = sorted(
+        (costs[row][column], row, column)
+        for row in rows
+        for column in heapq.nsmallest(candidates, free, key=costs[row].__getitem__)
+    )
+    pairs = []
+    assigned = set()
+    for _cost, row, column in cells:
+        if row not in assigned and not taken[column]:
+            taken[column] = True
+            assigned.add(row)
+            pairs.append((row, column))
+    for row in rows:
+        if row not in assigned:
+            column = min((column for column in free if not taken[column]), key=costs[row].__getitem__)
+            taken[column] = True
+            pairs.append((row, column))
+    return pairs
+
+def _improve_assignment(costs, pairs, m, deadline):
+    """
+    Local search on an assignment until no move lowers its cost or the deadline
+    passes. Moves, for each pair of rows a and b: a takes a cheaper free column;
+    a and b swap columns; or a takes b's column and b the cheapest column still
+    free (the two-step chain a greedy assignment misses).
+
+    Returns:
+        tuple: (improved (row, column) pairs, number of moves made).
+    """
+    column_of = dict(pairs)
+    rows = list(column_of)
+    taken = [False] * m
+    for column in column_of.values():
+        taken[column] = True
+    cheapest_free = {}  # row -> cheapest free column, until the free columns change
+
+    def free_column(row):
+        if row not in cheapest_free:
+            row_costs = costs[row]
+            cheapest_free[row] = min((column for column in range(m) if not taken[column]),
+                                     key=row_costs.__getitem__, default=None)
+        return cheapest_free[row]
+
+    def reassign(row, column):
+        taken[column_of[row]], taken[column] = False, True
+        column_of[row] = column
+        cheapest_free.clear()
+
+    moves = 0
+    improved = True
+    while improved:
+        improved = False
+        for row in rows:
+            row_costs = costs[row]
+            free = free_column(row)
+            if free is not None and row_costs[free] < row_costs[column_of[row]]:
+                reassign(row, free)
+                moves += 1
+                improved = True
+            for other in rows:
+                if time.perf_counter() >= deadline:
+                    return list(column_of.items()), moves
+                current, other_column = column_of[row], column_of[other]
+                if other == row:
+                    continue
+                other_costs = costs[other]
+                base = row_costs[current] + other_costs[other_column]
+                if row_costs[other_column] + other_costs[current] < base:
+                    column_of[row], column_of[other] = other_column, current
+                    moves += 1
+                    improved = True
+                    continue
+                free = free_column(other)
+                if free is not None and row_costs[other_column] + other_costs[free] < base:
+                    reassign(other, free)
+                    reassign(row, other_column)
+                    moves += 1
+                    improved = True
+    return list(column_of.items()), moves
+
+def assignment_lower_bound(cost_matrix, u=None, v=None):
+    """
+    Lower bound on the cost of any assignment covering every row (rows <= columns),
+    from the dual of the assignment LP: sum(u) + sum(v) with u[i] + v[j] <= cost
+    and v[j] <= 0. Missing potentials are taken as zero for v, and as the best
+    feasible value for u.
+    """
+    if v is None:
+        v = [0] * len(cost_matrix[0])
+    bound = sum(v)
+    for i, row in enumerate(cost_matrix):
+        best = min(map(operator.sub, row, v))
+        bound += best if u is None or u[i] is None else min(u[i], best)
+    return bound
+
+@register_solver('anytime', budgeted=True)
+def solve_anytime(cost_matrix, time_budget_ms=1000, report=None, **options):
+    """
+    Time-budgeted solver for problems too large to solve exactly within a deadline.
+
+    A greedy assignment is built first, so there is always a feasible answer.
+    AUGMENT_SHARE of the time left then goes to exact shortest augmenting path
+    steps, one row at a time; finishing every row gives the optimal assignment.
+    Otherwise the rows not reached are filled greedily, and the better of that
+    and the greedy start is improved with move and swap steps (see
+    _improve_assignment) until the deadline. The deadline can be overrun by a
+    few linear passes over the matrix (the greedy start, the fill-in and the
+    lower bound).
+
+    Args:
+        cost_matrix (list): Rows of costs.
+        time_budget_ms (float): Time allowed for the solve.
+        report (dict, optional): Filled with the objective, a lower bound on the
+            optimal objective (from the dual potentials), the absolute and relative
+            gap between the two, how many rows were solved exactly and how many
+            improvement moves were made.
+
+    Returns:
+        list: (row, column) pairs.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000.0
+    n, m = len(cost_matrix), len(cost_matrix[0])
+    if n > m:
+        return _transposed(solve_anytime, cost_matrix, time_budget_ms=time_budget_ms, report=report, **options)
+
+    costs = [[float(cost) for cost in row] for row in cost_matrix]
+    best = _greedy_fill(costs, range(n), [False] * m)
+    best_objective = sum(costs[row][column] for row, column in best)
+    source = 'greedy'
+
+    now = time.perf_counter()
+    match, u, v, done = _augment_rows(costs, now + AUGMENT_SHARE * max(deadline - now, 0.0))
+    if done:
+        pairs = [(match[j] - 1, j - 1) for j in range(1, m + 1) if match[j]]
+        if done < n:
+            # Fill the rows the augmentations did not reach with the cheapest free columns
+            pairs += _greedy_fill(costs, range(done, n), [bool(owner) for owner in match[1:]])
+        objective = sum(costs[row][column] for row, column in pairs)
+        if objective <= best_objective:
+            best, best_objective, source = pairs, objective, 'augmenting_paths'
+    moves = 0
+    if done < n:
+        best, moves = _improve_assignment(costs, best, m, deadline)
+        best_objective = sum(costs[row][column] for row, column in best)
+
+    if report is not None:
+        potentials = [u[i] if i <= done else None for i in range(1, n + 1)]
+        lower_bound = max(
+            assignment_lower_bound(costs, potentials, v[1:]),
+            assignment_lower_bound(costs)
+        )
+        gap = max(best_objective - lower_bound, 0.0)
+        report.update({
+            'objective': best_objective,
+            'lower_bound': lower_bound,
+            'gap': gap,
+            'relative_gap': gap / max(abs(best_objective), 1e-9),
+            'optimal': done == n,
+            'rows_solved': done,
+            'rows': n,
+            'improvement_moves': moves,
+            'source': source,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        })
+    return sorted(best)
+
+# Registers the 'parallel_auction' backend (imported last: it builds on the helpers above)
+from app.services import parallel_auction  # noqa: E402,F401
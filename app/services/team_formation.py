@@ -1,15 +1,24 @@
 # app/services/team_formation.py
 
 from collections import defaultdict
-from decimal import Decimal
+from functools import partial
 import logging
-from munkres import Munkres
+import time
+import tracemalloc
+from flask import current_app
 
 from app.models import db
 from app.models import Resource, Project, Team
 
 # Import utility functions (adjust the import path if necessary)
-from app.services.utils import level_to_numeric, get_resource_skills_with_levels, calculate_weight
+from app.services.utils import SCORE_UNIT
+from app.services.scoring import get_scoring_kernel, INFEASIBLE_COST
+from app.services.bench_snapshot import get_bench_snapshot, invalidate_bench_snapshot
+from app.services.availability import refresh_availability
+from app.services import metrics
+from app.services.profiling import annotate
+from app.services.cost_matrix import select_candidate_columns
+from app.services.solvers import BUDGETED_SOLVERS, SOLVER_MEMORY, resolve_solver_name, solve_assignment
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +28,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MIN_SOLVE_BUDGET_MS = 10  # The anytime solver always gets at least this long to improve the greedy start
+
 def is_level_sufficient(resource_level, required_level):
     """
     Determines if the resource's skill level meets or exceeds the required level.
@@ -32,83 +43,141 @@ def is_level_sufficient(resource_level, required_level):
         # If either level is not recognized, treat as insufficient
         return False
 
-def build_cost_matrix(projects, resources, weights):
+def expand_roles(projects):
     """
-    Builds a cost matrix for the Hungarian algorithm.
-    Rows represent project roles, and columns represent resources.
+    Lists one (project, requirement) entry per position to fill.
     """
-    cost_matrix = []
     role_list = []
-    resource_list = resources  # Use the passed resources list directly
-
     for project in projects:
         for req in project.RequiredResources:
-            role = req['Role']
-            skills = req['Skills']
-            quantity = req['Quantity']
-            for _ in range(quantity):
+            for _ in range(req['Quantity']):
                 role_list.append((project, req))
+    return role_list
 
-    for role in role_list:
-        row = []
-        project, req = role
-        required_skills = req['Skills']
-        for resource in resource_list:
-            # Skip resources already assigned to a team
-            if not resource.OnBench:
-                cost = Decimal('1000000')  # High cost to discourage assignment
-            else:
-                resource_skills = get_resource_skills_with_levels(resource)
-                # Check if resource has all required skills with sufficient levels
-                has_all_skills = all(
-                    is_level_sufficient(
-                        resource_skills.get(skill.lower(), 'beginner'),
-                        details['level'].lower()
-                    )
-                    for skill, details in required_skills.items()
-                )
-                # We can remove the availability check here since resources are already filtered
-                if has_all_skills:
-                    # Calculate weight based on desired parameters
-                    weight = calculate_weight(resource, req, project)
-                    # Since Munkres finds minimum cost, invert the weight
-                    cost = -weight
-                else:
-                    # Assign a large positive cost to discourage assignment
-                    cost = Decimal('1000000')
-            row.append(cost)
-        cost_matrix.append(row)
-
+def build_pruned_cost_matrix(projects, resources, kernel, memory_budget, block_size, check_bench=True,
+                             solver=None, snapshot=None):
+    """
+    Builds the cost matrix restricted to the resources that can matter to the solver,
+    as a CompactCostMatrix. Candidates are selected within the memory budget, sized
+    for the solver's working memory (see select_candidate_columns), and scored with
+    the features of the bench snapshot if one is given (see ScoringKernel.prepare).
+    """
+    role_list = expand_roles(projects)
+    prepare = partial(kernel.prepare, check_bench=check_bench, snapshot=snapshot)
+    cell_bytes, pads_square = SOLVER_MEMORY.get(solver, SOLVER_MEMORY['munkres'])
+    columns, cost_matrix, _k = select_candidate_columns(
+        role_list, resources, prepare, kernel.row_costs,
+        INFEASIBLE_COST, memory_budget, block_size, cell_bytes=cell_bytes, pads_square=pads_square
+    )
+    resource_list = [resources[column] for column in columns]
     return cost_matrix, role_list, resource_list
 
-def find_optimal_assignment(projects, resources, weights):
+def find_optimal_assignment(projects, resources, kernel=None, solver=None, time_budget_ms=None, report=None,
+                            check_bench=True, solve=None, snapshot=None):
     """
-    Uses the Hungarian algorithm to find the optimal assignment.
+    Finds the optimal assignment of resources to project roles.
+    Candidates are scored with the organization's weight profile unless a compiled
+    kernel is given (see app.services.scoring). The solver backend defaults to the
+    organization's configured one (see app.services.solvers).
+
+    With a time_budget_ms the 'anytime' solver is used (or the named solver, which
+    must be one of BUDGETED_SOLVERS) and given whatever is left of the budget once
+    the cost matrix is built; the best assignment found, its lower bound and the
+    optimality gap are written to report.
+
+    check_bench=False scores resources regardless of OnBench, for callers that
+    already checked availability (see app.services.scheduling).
+
+    solve replaces solve_assignment, e.g. to run the solve in the solver pool
+    (see app.services.admission.admitted).
+
+    snapshot is the organization's BenchSnapshot, to score bench resources from
+    its published features; leave it unset for resources that may differ from
+    their rows (e.g. what-if scenarios).
+
+    Raises:
+        ValueError: If a time_budget_ms is given with a solver that cannot honour it.
     """
-    cost_matrix, role_list, resource_list = build_cost_matrix(projects, resources, weights)
-    m = Munkres()
+    config = current_app.config
+    started = time.perf_counter()
+    if time_budget_ms is not None:
+        if not solver:
+            solver = 'anytime'
+        elif solver not in BUDGETED_SOLVERS:
+            raise ValueError(f"Solver '{solver}' does not take a time budget; use {', '.join(sorted(BUDGETED_SOLVERS))}")
+    org_id = projects[0].OrgID if projects else None
+    solver = resolve_solver_name(org_id, solver)
+    kernel = kernel or get_scoring_kernel(org_id)
+    report = {} if report is None else report
+    report['solver'] = solver
+    # tracemalloc is process-wide; only trace when nobody else is
+    trace_memory = config['COST_MATRIX_TRACE_MEMORY'] and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+    role_list = []
     try:
-        indexes = m.compute(cost_matrix)
-    except Exception as e:
-        logger.error(f"Error in Munkres algorithm: {e}")
-        raise e
+        with metrics.timer('team_formation_phase_seconds', phase='build_cost_matrix'):
+            cost_matrix, role_list, resource_list = build_pruned_cost_matrix(
+                projects, resources, kernel,
+                memory_budget=config['COST_MATRIX_MEMORY_BUDGET_MB'] * 1024 * 1024,
+                block_size=config['COST_MATRIX_BLOCK_SIZE'],
+                check_bench=check_bench,
+                solver=solver,
+                snapshot=snapshot
+            )
+        metrics.observe('team_formation_matrix_rows', len(role_list))
+        metrics.observe('team_formation_matrix_columns', len(resources))
+        annotate(matrix_rows=len(role_list), matrix_columns=len(resources), solver_columns=len(resource_list),
+                 scoring_kernel=str(kernel.key))
+        indexes = []
+        if resource_list:
+            options = {'report': report}
+            if time_budget_ms is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                options['time_budget_ms'] = max(time_budget_ms - elapsed_ms, MIN_SOLVE_BUDGET_MS)
+            try:
+                with metrics.timer('team_formation_phase_seconds', phase='solve', solver=solver):
+                    indexes = (solve or solve_assignment)(cost_matrix, solver, **options)
+            except Exception as e:
+                logger.error(f"Error in {solver} solver: {e}")
+                raise e
+            # Solvers work on fixed-point costs; report in weight units
+            for key in ('objective', 'lower_bound', 'gap'):
+                if key in report:
+                    report[key] /= SCORE_UNIT
+    finally:
+        if trace_memory:
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.observe('team_formation_peak_memory_bytes', peak)
+            annotate(peak_memory_bytes=peak)
+            logger.info(f"Peak traced memory for {len(role_list)}x{len(resources)} solve: {peak} bytes.")
+
     assignments = []
     unfilled_roles = defaultdict(int)
 
+    assigned_rows = set()
     for row, column in indexes:
-        if cost_matrix[row][column] < Decimal('1000000'):
+        if cost_matrix[row][column] < INFEASIBLE_COST:
             project, req = role_list[row]
             resource = resource_list[column]
             assignments.append((project, req, resource))
-        else:
-            project, req = role_list[row]
+            assigned_rows.add(row)
+
+    # Roles left without a qualified resource
+    for row, (project, req) in enumerate(role_list):
+        if row not in assigned_rows:
             unfilled_roles[req['Role']] += 1
 
     return assignments, unfilled_roles
 
-def match_resources_to_projects(project_id, resources):
+def match_resources_to_projects(project_id, resources, solver=None, time_budget_ms=None, solve=None, snapshot=None):
     """
-    Assigns resources to a specific project using the Hungarian algorithm.
+    Assigns resources to a specific project using the configured assignment solver.
+    time_budget_ms bounds the solve and solve runs it (see find_optimal_assignment).
+    snapshot is the organization's BenchSnapshot to score from, fetched when not
+    given; callers staffing many projects pass one in rather than have each team's
+    commit make the next call rebuild it.
     """
     project_assignments = defaultdict(list)
     unfilled_roles_overall = defaultdict(int)
@@ -126,16 +195,14 @@ def match_resources_to_projects(project_id, resources):
             logger.warning(f"No available resources for project '{project.ProjectName}'.")
             return {}, {'message': 'No available resources for this project.'}
 
-        # Define weights for parameters (can be adjusted)
-        weights = {
-            'rate': Decimal('1.0'),
-            'experience': Decimal('1.0'),
-            'skill_level': Decimal('1.0')
-            # Add more parameters and weights as needed
-        }
-
         # Find optimal assignments for this project
-        assignments, unfilled_roles = find_optimal_assignment([project], resources, weights)
+        metrics.observe('team_formation_candidates', len(resources))
+        solver_report = {}
+        # Bench resources: score them from the snapshot every worker maps
+        assignments, unfilled_roles = find_optimal_assignment(
+            [project], resources, solver=solver, time_budget_ms=time_budget_ms, report=solver_report, solve=solve,
+            snapshot=snapshot or get_bench_snapshot(project.OrgID)
+        )
 
         # Process assignments
         assigned_resource_ids = set()
@@ -153,8 +220,10 @@ def match_resources_to_projects(project_id, resources):
         for role, count in unfilled_roles.items():
             unfilled_roles_overall[role] += count
             logger.warning(f"Unfilled role '{role}': {count} position(s).")
+        metrics.observe('team_formation_unfilled_roles', sum(unfilled_roles.values()))
         
         # Update the database with team assignments
+        commit_started = time.perf_counter()
         assigned_resources = project_assignments.get(project.ProjectName, [])
         total_resources = len(assigned_resources)
         existing_team = Team.query.filter_by(ProjectID=project.ProjectID).first()
@@ -183,8 +252,14 @@ def match_resources_to_projects(project_id, resources):
             logger.info(f"Created team for project '{project.ProjectName}' with {total_resources} resources.")
             team = new_team
 
+        # Team members are busy until the end of the project
+        db.session.flush()
+        refresh_availability(project.OrgID, team_id=team.TeamID)
+
         # Commit all changes to the database
         db.session.commit()
+        metrics.observe('team_formation_phase_seconds', time.perf_counter() - commit_started, phase='commit')
+        invalidate_bench_snapshot(project.OrgID)
         logger.info("All team assignments have been committed to the database.")
 
         # Prepare data to return
@@ -195,7 +270,8 @@ def match_resources_to_projects(project_id, resources):
             'OrgID': project.OrgID,
             'project': project.serialize(),
             'organization': project.organization.serialize(),
-            'resources': [res.serialize() for res in assigned_resources]
+            'resources': [res.serialize() for res in assigned_resources],
+            'solver': solver_report
         }
 
     except Exception as e:
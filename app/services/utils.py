@@ -1,7 +1,10 @@
 # src/utils.py
 
-from decimal import Decimal
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from math import lcm
 import logging
+import threading
 
 # Configure logging for the utils module
 logging.basicConfig(
@@ -11,6 +14,162 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scores are computed in integer fixed point. Each input gets a scale that keeps it exact:
+RATE_SCALE = 100          # Rates in cents (exact for two decimals, as stored in Resource.Rate)
+EXPERIENCE_SCALE = 1000   # Years of experience in thousandths
+SKILL_SCALE = 2520        # lcm(1..10): averages of up to 10 skill levels are exact
+WEIGHT_SCALE = 100        # Parameter weights in hundredths (0.5 -> 50)
+SCORE_SCALE = lcm(RATE_SCALE, EXPERIENCE_SCALE, SKILL_SCALE)
+SCORE_UNIT = WEIGHT_SCALE * SCORE_SCALE  # Integer score equal to a weight of 1.0
+
+SKILL_LEVELS = {
+    'beginner': 1,
+    'intermediate': 2,
+    'expert': 3
+}
+
+DEFAULT_RATE = 100  # Rate assumed when a resource's rate is invalid
+DEFAULT_WEIGHTS = {
+    'rate': 50,
+    'experience': 100,
+    'skill_level': 100,
+    'affinity': 100
+}
+
+# Per-resource scoring inputs (see app.services.scoring), computed once per resource rather than per role
+ScoreFeatures = namedtuple('ScoreFeatures', ['rate_cents', 'experience', 'skills', 'skill_levels', 'affinity_mask'])
+
+# Domains and technologies interned to bit positions, shared by every mask built in this process
+_affinity_bits = {}
+_affinity_lock = threading.Lock()
+
+def to_fixed(value, scale):
+    """
+    Converts a number to an integer count of 1/scale units (rounding half to even).
+
+    Args:
+        value: int, float, str or Decimal. Floats are read through str() so 55.1 means 55.10.
+        scale (int): Units per 1.0.
+
+    Returns:
+        int: The scaled value.
+
+    Raises:
+        ValueError: If the value is not a number.
+    """
+    try:
+        scaled = Decimal(str(value)) * scale
+        return int(scaled.to_integral_value(rounding=ROUND_HALF_EVEN))
+    except (InvalidOperation, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid number {value!r}") from e
+
+def rate_to_cents(resource):
+    """
+    Reads a resource's rate in cents, clamped at zero; invalid rates count as DEFAULT_RATE.
+    """
+    try:
+        rate_cents = to_fixed(resource.Rate, RATE_SCALE)
+    except ValueError as e:
+        logger.error(f"Invalid rate for resource {resource.Name}: {e}")
+        rate_cents = DEFAULT_RATE * RATE_SCALE
+    return max(rate_cents, 0)
+
+def total_experience(resource):
+    """
+    Sums the years of all past job titles, in 1/EXPERIENCE_SCALE years.
+    """
+    total = 0
+    try:
+        for title, details in resource.PastJobTitles.items():
+            total += to_fixed(details.get('years', 0), EXPERIENCE_SCALE)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Error parsing past job titles for resource {resource.Name}: {e}")
+    return total
+
+def affinity_bit(kind, name):
+    """
+    Returns the bit standing for a domain or technology name (case-insensitive).
+    """
+    key = (kind, name.strip().lower())
+    bit = _affinity_bits.get(key)
+    if bit is None:
+        with _affinity_lock:
+            bit = _affinity_bits.setdefault(key, 1 << len(_affinity_bits))
+    return bit
+
+def affinity_mask(domains=(), technologies=()):
+    """
+    Builds the bitmask of a set of domains and technologies.
+    """
+    mask = 0
+    for domain in domains or ():
+        mask |= affinity_bit('domain', domain)
+    for technology in technologies or ():
+        mask |= affinity_bit('technology', technology)
+    return mask
+
+def project_affinity_mask(project):
+    """
+    Bitmask of the project's domains and technologies.
+    """
+    return affinity_mask(project.Domain, project.Technology)
+
+def affinity_score(resource_mask, project_mask):
+    """
+    Share of the project's domains and technologies the resource covers, in
+    1/SCORE_SCALE units (rounded half up; exact when the project has up to 10).
+    """
+    count = project_mask.bit_count()
+    if not count:
+        return 0
+    return (2 * (resource_mask & project_mask).bit_count() * SCORE_SCALE + count) // (2 * count)
+
+def normalize_skill_name(name):
+    """
+    Key under which spellings of a skill name are the same skill ("Node.js", " node.JS").
+    """
+    return ' '.join(str(name).split()).lower()
+
+def role_skill_requirements(req):
+    """
+    Lists the (skill key, numeric level) pairs a role requires. Keys are skill IDs
+    for requirements normalized at write time (see app.services.skills), else
+    normalized names; unrecognized levels are 0.
+    """
+    if req.get('SkillIDs') is not None:
+        return [(skill_id, level) for skill_id, level in req['SkillIDs']]
+    return [
+        (normalize_skill_name(skill), SKILL_LEVELS.get(str(details.get('level', '')).strip().lower(), 0))
+        for skill, details in req.get('Skills', {}).items()
+    ]
+
+def resource_skill_levels(resource):
+    """
+    Maps the resource's skill keys (IDs, or normalized names for resources written
+    without them) to numeric levels.
+    """
+    skill_ids = getattr(resource, 'SkillIDs', None)
+    if skill_ids is not None:
+        return dict(zip(skill_ids, resource.SkillLevels or ()))
+    return {
+        normalize_skill_name(name): level_to_numeric(level)
+        for name, level in get_resource_skills_with_levels(resource).items()
+    }
+
+def resource_score_features(resource):
+    """
+    Extracts the scoring inputs of a resource once, for reuse across roles.
+
+    Returns:
+        ScoreFeatures: Rate in cents, experience in thousandths of a year, skill
+        names, the numeric skill levels by skill key (see resource_skill_levels),
+        and the bitmask of its domains and technologies (its skills).
+    """
+    skills = list(resource.Skills) if isinstance(resource.Skills, dict) else []
+    skill_levels = resource_skill_levels(resource)
+    mask = affinity_mask(resource.Domain, skills)
+    return ScoreFeatures(rate_to_cents(resource), total_experience(resource), skills, skill_levels, mask)
+
 def level_to_numeric(level):
     """
     Converts skill level from string to numeric value for comparison.
@@ -19,15 +178,10 @@ def level_to_numeric(level):
         level (str): Skill level as a string ('beginner', 'intermediate', 'expert').
 
     Returns:
-        Decimal: Numeric representation of the skill level.
+        int: Numeric representation of the skill level.
     """
-    levels = {
-        'beginner': Decimal('1'),
-        'intermediate': Decimal('2'),
-        'expert': Decimal('3')
-    }
-    numeric_level = levels.get(level.lower(), Decimal('0'))  # Returns 0 if level is unrecognized
-    if numeric_level == Decimal('0'):
+    numeric_level = SKILL_LEVELS.get(level.lower(), 0)  # Returns 0 if level is unrecognized
+    if numeric_level == 0:
         logger.warning(f"Unrecognized skill level '{level}'. Defaulting to 0.")
     return numeric_level
 
@@ -49,70 +203,3 @@ def get_resource_skills_with_levels(resource):
     except AttributeError as e:
         logger.error(f"Error parsing skills for resource {resource.Name}: {e}")
     return skills_with_levels
-
-def calculate_weight(resource, req, project):
-    """
-    Calculates a weight for a resource based on various parameters.
-
-    Args:
-        resource (Resource): The resource being evaluated.
-        req (dict): The role requirement.
-        project (Project): The project to which the role belongs.
-
-    Returns:
-        Decimal: The calculated weight.
-    """
-    weight = Decimal('0.0')
-    weights_config = {
-        'rate': Decimal('0.5'),
-        'experience': Decimal('1.0'),
-        'skill_level': Decimal('1.0')
-    }
-
-    # Rate: Lower rate is better
-    try:
-        rate = Decimal(resource.Rate)
-    except (ValueError, TypeError) as e:
-        logger.error(f"Invalid rate for resource {resource.Name}: {e}")
-        rate = Decimal('100')  # Assign a default high rate if invalid
-
-    # Normalize rate to ensure it's not negative
-    rate = max(rate, Decimal('0'))
-
-    # Calculate rate weight: higher rate decreases the weight
-    weight += weights_config['rate'] * (Decimal('100') - rate)
-
-    # Experience: Sum of years in all past job titles
-    total_experience = Decimal('0.0')
-    try:
-        for title, details in resource.PastJobTitles.items():
-            years = details.get('years', 0)
-            total_experience += Decimal(str(years))
-    except (ValueError, TypeError, AttributeError) as e:
-        logger.error(f"Error parsing past job titles for resource {resource.Name}: {e}")
-
-    weight += weights_config['experience'] * total_experience
-
-    # Skill Level: Average of resource's skill levels for required skills
-    required_skills = req.get('Skills', {})
-    skill_levels = []
-    resource_skills = get_resource_skills_with_levels(resource)
-
-    for skill_name, details in required_skills.items():
-        required_level = details.get('level', 'beginner').strip().lower()
-        resource_level = resource_skills.get(skill_name.strip().lower(), 'beginner')
-        skill_numeric = level_to_numeric(resource_level)
-        skill_levels.append(skill_numeric)
-
-    if skill_levels:
-        avg_skill_level = sum(skill_levels) / Decimal(len(skill_levels))
-    else:
-        avg_skill_level = Decimal('0')
-
-    weight += weights_config['skill_level'] * avg_skill_level
-
-    logger.debug(
-        f"Calculated weight for resource {resource.Name} for role '{req['Role']}' in project '{project.ProjectName}': {weight}"
-    )
-
-    return weight
\ No newline at end of file
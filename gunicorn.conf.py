@@ -0,0 +1,63 @@
+# gunicorn.conf.py
+#
+# Serving profile: `gunicorn -c gunicorn.conf.py main:app`. Every setting can be
+# overridden from the environment; the defaults were chosen with app/Test/load_test.py
+# (p50/p99 under mixed CRUD and team formation traffic).
+
+import multiprocessing
+import os
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Team formation is CPU-bound and holds the GIL, so one worker per core; threads keep a
+# worker answering CRUD requests (which mostly wait on Postgres) while one of them solves.
+# More threads pay off as the database gets farther away, but next to it they only add
+# GIL contention to the formation tail: raise GUNICORN_THREADS for a remote database.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Import the app once in the master and fork it: workers share its pages and start fast
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Recycle workers now and then (jittered so they don't restart together) to bound the
+# growth of per-worker caches: compiled kernels, availability mirrors, mapped snapshots.
+# Not too often: a threaded worker drops the connections it has accepted but not served
+# when it exits, and its replacement warms up again
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '500'))
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))  # Large formations and rebalances
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+accesslog = os.getenv('GUNICORN_ACCESS_LOG')  # e.g. '-' for stdout; off by default
+
+
+def post_fork(server, worker):
+    # A preloaded app may have opened connections in the master; they must not be shared
+    if server.cfg.preload_app:
+        from app.services.serving import after_fork
+        after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    from app.services.serving import warm_up
+    warm_up(worker.wsgi)
+
+
+def on_starting(server):
+    # Histograms of a previous run would otherwise be merged into this one's
+    from app.services import metrics
+    metrics.clear_multiproc_dir()
+
+
+def child_exit(server, worker):
+    from app.services import metrics
+    metrics.archive_worker(worker.pid)
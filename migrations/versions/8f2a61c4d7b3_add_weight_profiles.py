@@ -0,0 +1,36 @@
+"""add weight profiles
+
+Revision ID: 8f2a61c4d7b3
+Revises: 3dc958093cec
+Create Date: 2026-10-19 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2a61c4d7b3'
+down_revision = '3dc958093cec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'weight_profiles',
+        sa.Column('ProfileID', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('OrgID', sa.String(), nullable=False),
+        sa.Column('RateWeight', sa.Numeric(6, 2), nullable=False),
+        sa.Column('ExperienceWeight', sa.Numeric(6, 2), nullable=False),
+        sa.Column('SkillLevelWeight', sa.Numeric(6, 2), nullable=False),
+        sa.Column('Version', sa.Integer(), nullable=False),
+        sa.Column('UpdatedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['OrgID'], ['organizations.OrgID'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ProfileID'),
+        sa.UniqueConstraint('OrgID')
+    )
+
+
+def downgrade():
+    op.drop_table('weight_profiles')
@@ -0,0 +1,39 @@
+"""add resource availability ranges
+
+Revision ID: b7e4c2a9d1f0
+Revises: 8f2a61c4d7b3
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4c2a9d1f0'
+down_revision = '8f2a61c4d7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('resources', sa.Column('Availability', postgresql.DATERANGE(), nullable=True))
+    op.create_index('ix_resources_availability', 'resources', ['Availability'], unique=False, postgresql_using='gist')
+    # Backfill, as app.services.availability.refresh_availability does
+    op.execute("""
+        UPDATE resources AS r SET "Availability" = CASE
+            WHEN r."TeamID" IS NULL AND r."AvailableDate" IS NULL AND r."OnBench" IS NOT TRUE
+                THEN 'empty'::daterange
+            ELSE daterange(GREATEST(r."AvailableDate", (
+                SELECT p."ProjectStartDate" + p."NumberOfDays"
+                FROM teams AS t JOIN projects AS p ON p."ProjectID" = t."ProjectID"
+                WHERE t."TeamID" = r."TeamID"
+            )), NULL)
+        END
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_resources_availability', table_name='resources', postgresql_using='gist')
+    op.drop_column('resources', 'Availability')
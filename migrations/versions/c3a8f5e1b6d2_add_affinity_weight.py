@@ -0,0 +1,24 @@
+"""add affinity weight to weight profiles
+
+Revision ID: c3a8f5e1b6d2
+Revises: b7e4c2a9d1f0
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a8f5e1b6d2'
+down_revision = 'b7e4c2a9d1f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('weight_profiles', sa.Column('AffinityWeight', sa.Numeric(6, 2), server_default='1.00', nullable=False))
+
+
+def downgrade():
+    op.drop_column('weight_profiles', 'AffinityWeight')
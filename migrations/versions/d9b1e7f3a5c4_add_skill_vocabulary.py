@@ -0,0 +1,103 @@
+"""add skill vocabulary
+
+Revision ID: d9b1e7f3a5c4
+Revises: c3a8f5e1b6d2
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b1e7f3a5c4'
+down_revision = 'c3a8f5e1b6d2'
+branch_labels = None
+depends_on = None
+
+SKILL_LEVELS = {'beginner': 1, 'intermediate': 2, 'expert': 3}
+
+
+def _normalize(name):
+    return ' '.join(str(name).split()).lower()
+
+
+def _normalize_skills(skills, vocabulary):
+    """
+    Same normalization as app.services.skills.normalize_resource_skills, against
+    an in-memory vocabulary (normalized name -> (SkillID, canonical name)).
+    """
+    canonical, levels = {}, {}
+    for name, details in (skills or {}).items():
+        key = _normalize(name)
+        if key not in vocabulary:
+            vocabulary[key] = (len(vocabulary) + 1, ' '.join(str(name).split()))
+        skill_id, canonical_name = vocabulary[key]
+        details = dict(details) if isinstance(details, dict) else {'level': details}
+        details['level'] = str(details.get('level', 'beginner')).strip().lower()
+        level = SKILL_LEVELS.get(details['level'], 0)
+        if skill_id in levels and levels[skill_id] >= level:
+            continue
+        canonical[canonical_name] = details
+        levels[skill_id] = level
+    skill_ids = sorted(levels)
+    return canonical, skill_ids, [levels[skill_id] for skill_id in skill_ids]
+
+
+def upgrade():
+    op.create_table(
+        'skills',
+        sa.Column('SkillID', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('Name', sa.String(length=100), nullable=False),
+        sa.Column('NormalizedName', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('SkillID'),
+        sa.UniqueConstraint('NormalizedName')
+    )
+    op.add_column('resources', sa.Column('SkillIDs', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.add_column('resources', sa.Column('SkillLevels', postgresql.ARRAY(sa.SmallInteger()), nullable=True))
+
+    # Backfill: normalize existing skills and requirements
+    bind = op.get_bind()
+    vocabulary = {}
+    resources = bind.execute(sa.text('SELECT "ResourceID", "Skills" FROM resources')).all()
+    for resource_id, skills in resources:
+        if not isinstance(skills, dict):
+            continue
+        canonical, skill_ids, levels = _normalize_skills(skills, vocabulary)
+        bind.execute(
+            sa.text('UPDATE resources SET "Skills" = CAST(:skills AS JSONB), "SkillIDs" = :ids, '
+                    '"SkillLevels" = :levels WHERE "ResourceID" = :id'),
+            {'skills': json.dumps(canonical), 'ids': skill_ids, 'levels': levels, 'id': resource_id}
+        )
+    projects = bind.execute(sa.text('SELECT "ProjectID", "RequiredResources" FROM projects')).all()
+    for project_id, required_resources in projects:
+        requirements = []
+        for req in required_resources or []:
+            canonical, skill_ids, levels = _normalize_skills(req.get('Skills'), vocabulary)
+            requirements.append(dict(req, Skills=canonical, SkillIDs=[list(pair) for pair in zip(skill_ids, levels)]))
+        bind.execute(
+            sa.text('UPDATE projects SET "RequiredResources" = CAST(:requirements AS JSONB) WHERE "ProjectID" = :id'),
+            {'requirements': json.dumps(requirements), 'id': project_id}
+        )
+    if vocabulary:
+        bind.execute(
+            sa.text('INSERT INTO skills ("SkillID", "Name", "NormalizedName") VALUES (:id, :name, :normalized)'),
+            [{'id': skill_id, 'name': name, 'normalized': key} for key, (skill_id, name) in vocabulary.items()]
+        )
+    op.execute("SELECT setval(pg_get_serial_sequence('skills', 'SkillID'), "
+               "COALESCE((SELECT MAX(\"SkillID\") FROM skills), 0) + 1, false)")
+
+
+def downgrade():
+    op.execute('''
+        UPDATE projects SET "RequiredResources" = (
+            SELECT COALESCE(jsonb_agg(req - 'SkillIDs'), '[]'::jsonb)
+            FROM jsonb_array_elements("RequiredResources") AS req
+        )
+    ''')
+    op.drop_column('resources', 'SkillLevels')
+    op.drop_column('resources', 'SkillIDs')
+    op.drop_table('skills')
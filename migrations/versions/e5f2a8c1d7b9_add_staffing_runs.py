@@ -0,0 +1,47 @@
+"""add staffing runs
+
+Revision ID: e5f2a8c1d7b9
+Revises: d9b1e7f3a5c4
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f2a8c1d7b9'
+down_revision = 'd9b1e7f3a5c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'staffing_runs',
+        sa.Column('RunID', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('OrgID', sa.String(), nullable=False),
+        sa.Column('Status', sa.String(length=20), nullable=False),
+        sa.Column('Solver', sa.String(length=50), nullable=True),
+        sa.Column('LastProjectStartDate', sa.Date(), nullable=True),
+        sa.Column('LastProjectID', sa.Integer(), nullable=True),
+        sa.Column('ProjectsProcessed', sa.Integer(), nullable=False),
+        sa.Column('TeamsCreated', sa.Integer(), nullable=False),
+        sa.Column('ProjectsSkipped', sa.Integer(), nullable=False),
+        sa.Column('ProjectsFailed', sa.Integer(), nullable=False),
+        sa.Column('FilledRoles', sa.Integer(), nullable=False),
+        sa.Column('UnfilledRoles', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('StartedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('UpdatedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('FinishedAt', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['OrgID'], ['organizations.OrgID'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('RunID')
+    )
+    op.create_index('ix_staffing_runs_running', 'staffing_runs', ['OrgID'], unique=True,
+                    postgresql_where=sa.text("\"Status\" = 'running'"))
+
+
+def downgrade():
+    op.drop_index('ix_staffing_runs_running', table_name='staffing_runs')
+    op.drop_table('staffing_runs')
@@ -0,0 +1,59 @@
+"""add change feed
+
+Revision ID: f1c7a3e9b2d5
+Revises: e5f2a8c1d7b9
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a3e9b2d5'
+down_revision = 'e5f2a8c1d7b9'
+branch_labels = None
+depends_on = None
+
+# app.models.change.CHANGE_FEED_LOCK_KEY
+CHANGE_FEED_LOCK_KEY = 7265840121
+
+TABLES = ('resources', 'projects', 'teams')
+
+
+def upgrade():
+    op.execute('CREATE SEQUENCE change_seq')
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION next_change_seq() RETURNS bigint LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock_shared({CHANGE_FEED_LOCK_KEY});
+            RETURN nextval('change_seq');
+        END
+        $$
+    """)
+    for table in TABLES:
+        # The volatile default numbers the existing rows as the table is rewritten
+        op.add_column(table, sa.Column('ChangeSeq', sa.BigInteger(), server_default=sa.text('next_change_seq()'),
+                                       nullable=False))
+        op.create_index(f'ix_{table}_org_change_seq', table, ['OrgID', 'ChangeSeq'])
+    op.create_table(
+        'tombstones',
+        sa.Column('ChangeSeq', sa.BigInteger(), server_default=sa.text('next_change_seq()'), nullable=False),
+        sa.Column('EntityType', sa.String(length=20), nullable=False),
+        sa.Column('EntityID', sa.Integer(), nullable=False),
+        sa.Column('OrgID', sa.String(), nullable=False),
+        sa.Column('DeletedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['OrgID'], ['organizations.OrgID'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ChangeSeq')
+    )
+    op.create_index('ix_tombstones_org_change_seq', 'tombstones', ['OrgID', 'ChangeSeq'])
+
+
+def downgrade():
+    op.drop_index('ix_tombstones_org_change_seq', table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_org_change_seq', table_name=table)
+        op.drop_column(table, 'ChangeSeq')
+    op.execute('DROP FUNCTION next_change_seq()')
+    op.execute('DROP SEQUENCE change_seq')